@@ -0,0 +1,45 @@
+# Importing the required libraries:
+import os
+import sys
+import json
+import argparse
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from utils.report_utils import render_reports
+
+def main(argv: list = None):
+    """
+    Function to render shot map and zone map reports from the command line
+
+        Parameters:
+            argv (list): Command line arguments, sys.argv if None
+
+        Returns:
+            results (pd.DataFrame): One row per spec, see render_reports
+    """
+    parser = argparse.ArgumentParser(
+        description='Render shot map and zone map reports from a JSON list of specs'
+    )
+    parser.add_argument(
+        'specs',
+        help="JSON file holding a list of report specs, with 'shots' as a file path"
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=None,
+        help='Worker processes, the number of CPUs by default and 0 to render in this process'
+    )
+    args = parser.parse_args(argv)
+
+    with open(args.specs) as f:
+        specs = json.load(f)
+
+    results = render_reports(specs, workers=args.workers)
+
+    print(results.drop(columns=['traceback'], errors='ignore').to_string())
+
+    return results
+
+if __name__ == '__main__':
+    main()
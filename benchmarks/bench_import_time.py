@@ -0,0 +1,176 @@
+# Importing the required packages:
+import os
+import re
+import sys
+import json
+import argparse
+import subprocess
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+# Modules timed by default, none of them should pull in a heavy package when
+# it is imported:
+MODULES = [
+    'utils.coordinate_utils',
+    'utils.shot_utils',
+    'utils.helper_utils',
+    'utils.understat_scraper_utils',
+    'utils.shot_store_utils',
+    'utils.shot_stream_utils',
+    'utils.rolling_utils',
+    'utils.spatial_index_utils',
+    'utils.xg_model_utils',
+    'utils.xg_surface_utils',
+    'utils.trendline_utils',
+    'utils.report_utils',
+    'utils.export_utils',
+]
+
+# Packages only the functions that need them may import:
+HEAVY_PACKAGES = ['matplotlib', 'mplsoccer', 'sklearn', 'scipy', 'bs4', 'joblib']
+
+# Module imported by everything, timed as the floor of the others:
+REFERENCE = 'pandas'
+
+_line = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)$')
+
+def import_time(module: str)-> dict:
+    """
+    Function to import a module in a fresh interpreter with -X importtime
+
+        Parameters:
+            module (str): Name of the module
+
+        Returns:
+            result (dict): Cumulative import time of the module in ms, the
+            heavy packages it imported, and the slowest packages it imported
+            directly
+    """
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+    )
+
+    if proc.returncode != 0:
+        raise RuntimeError(f'Importing {module} failed:\n{proc.stderr}')
+
+    imported = []
+
+    for line in proc.stderr.splitlines():
+        match = _line.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            imported.append((name, len(indent) // 2, int(self_us), int(cumulative_us)))
+
+    # The module itself is the last, outermost entry:
+    total_us = next(c for name, level, _, c in reversed(imported) if name == module)
+    packages = {name.split('.')[0] for name, _, _, _ in imported}
+
+    # Packages imported straight from the module, the first level below it:
+    direct = sorted(
+        [(name, c) for name, level, _, c in imported if level == 1],
+        key=lambda item: item[1],
+        reverse=True
+    )
+
+    return {
+        'module': module,
+        'ms': total_us / 1000,
+        'heavy': [package for package in HEAVY_PACKAGES if package in packages],
+        'slowest': [{'name': name, 'ms': c / 1000} for name, c in direct[:5]],
+    }
+
+def run_benchmark(
+    modules: list = None,
+    repeats: int = 5
+)-> list:
+    """
+    Function to time the import of every module, keeping the best run
+
+        Parameters:
+            modules (list): Names of the modules, MODULES if None
+            repeats (int): Number of fresh interpreters per module
+
+        Returns:
+            results (list): Result of import_time for every module, the
+            reference module first
+    """
+    results = []
+
+    for module in [REFERENCE] + list(modules or MODULES):
+        runs = [import_time(module) for _ in range(repeats)]
+        results.append(min(runs, key=lambda run: run['ms']))
+
+    return results
+
+def check(
+    results: list,
+    budget_ms: float = None
+)-> list:
+    """
+    Function to list the modules that import a heavy package or go over the
+    time budget
+
+        Parameters:
+            results (list): Output of run_benchmark
+            budget_ms (float): Most time a module may take on top of the
+            reference module, no budget if None
+
+        Returns:
+            failures (list): One message per failing module
+    """
+    floor = next(r['ms'] for r in results if r['module'] == REFERENCE)
+    failures = []
+
+    for result in results:
+        if result['module'] == REFERENCE:
+            continue
+
+        if result['heavy']:
+            failures.append(f"{result['module']} imports {', '.join(result['heavy'])}")
+
+        if budget_ms is not None and result['ms'] - floor > budget_ms:
+            failures.append(
+                f"{result['module']} takes {result['ms'] - floor:.0f}ms"
+                f" over {REFERENCE}, the budget is {budget_ms:.0f}ms"
+            )
+
+    return failures
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Benchmark the import time of the utils modules with -X importtime'
+    )
+    parser.add_argument('--modules', nargs='+', default=None)
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument(
+        '--budget-ms', type=float, default=None,
+        help=f'Most time a module may add on top of importing {REFERENCE}'
+    )
+    parser.add_argument(
+        '--check', action='store_true',
+        help='Exit with an error if a module imports a heavy package or goes over the budget'
+    )
+    parser.add_argument('--output', default=None, help='Write the results as JSON')
+    args = parser.parse_args()
+
+    results = run_benchmark(args.modules, args.repeats)
+
+    for res in results:
+        slowest = ', '.join(f"{s['name']} {s['ms']:.0f}ms" for s in res['slowest'][:3])
+        heavy = f" | HEAVY: {', '.join(res['heavy'])}" if res['heavy'] else ''
+        print(f"{res['module']:>30} | {res['ms']:>7.1f}ms | {slowest}{heavy}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    if args.check:
+        failures = check(results, args.budget_ms)
+
+        for failure in failures:
+            print(f'FAIL: {failure}')
+
+        sys.exit(1 if failures else 0)
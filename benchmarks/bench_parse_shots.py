@@ -0,0 +1,105 @@
+# Importing the required packages:
+import os
+import sys
+import glob
+import time
+import argparse
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from utils.understat_scraper_utils import (
+    parse_shots,
+    extract_dataset,
+    _parse_shots_bs4
+)
+from understat_fixtures import make_shots, make_player_page
+
+def load_pages(page_dir: str = None, sizes: list = None)-> dict:
+    """
+    Function to load saved understat pages, or build synthetic ones if no 
+    folder is given
+
+        Parameters:
+            page_dir (str): Folder holding saved player pages
+            sizes (list): Number of shots on each synthetic page
+
+        Returns:
+            pages (dict): Raw page content keyed by page name
+    """
+    if page_dir is not None:
+        pages = {}
+
+        for path in sorted(glob.glob(os.path.join(page_dir, '*'))):
+            with open(path, 'rb') as f:
+                pages[os.path.basename(path)] = f.read()
+
+        return pages
+
+    return {
+        f'synthetic_{size}': make_player_page(
+            make_shots(size)
+        ).encode('utf8')
+        for size in sizes
+    }
+
+def run_benchmark(content: bytes, repeats: int = 5)-> dict:
+    """
+    Function to time the BeautifulSoup and the fast parsing of one page, for
+    the JSON extraction alone and for the full DataFrame
+
+        Parameters:
+            content (bytes): Raw page content
+            repeats (int): Number of timed runs, the best one is kept
+
+        Returns:
+            result (dict): Best timings of both parsers and the speedups
+    """
+    stages = {
+        'extract_bs4': lambda: _parse_shots_bs4(content),
+        'extract_fast': lambda: extract_dataset(content, 'shotsData'),
+        'parse_bs4': lambda: parse_shots(content, parser='bs4'),
+        'parse_fast': lambda: parse_shots(content, parser='fast'),
+    }
+    times = {stage: [] for stage in stages}
+
+    for _ in range(repeats):
+        for stage, func in stages.items():
+            start = time.perf_counter()
+            func()
+            times[stage].append(time.perf_counter() - start)
+
+    # Both parsers must read the same shots:
+    df = parse_shots(content, parser='fast')
+    assert df.equals(parse_shots(content, parser='bs4'))
+
+    best = {stage: min(t) for stage, t in times.items()}
+
+    return {
+        'n_shots': len(df),
+        'kb': len(content) / 1024,
+        **best,
+        'extract_speedup': best['extract_bs4'] / best['extract_fast'],
+        'parse_speedup': best['parse_bs4'] / best['parse_fast'],
+    }
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Benchmark BeautifulSoup vs fast understat page parsing'
+    )
+    parser.add_argument('--pages', default=None, help='Folder of saved pages')
+    parser.add_argument(
+        '--sizes', type=int, nargs='+', default=[100, 1_000, 5_000]
+    )
+    parser.add_argument('--repeats', type=int, default=5)
+    args = parser.parse_args()
+
+    for name, content in load_pages(args.pages, args.sizes).items():
+        res = run_benchmark(content, args.repeats)
+        print(
+            f"{name:>20} | {res['n_shots']:>6} shots | {res['kb']:>6.0f} KB"
+            f" | extract bs4 {res['extract_bs4']:.4f}s"
+            f" fast {res['extract_fast']:.4f}s"
+            f" ({res['extract_speedup']:.1f}x)"
+            f" | DataFrame bs4 {res['parse_bs4']:.4f}s"
+            f" fast {res['parse_fast']:.4f}s"
+            f" ({res['parse_speedup']:.1f}x)"
+        )
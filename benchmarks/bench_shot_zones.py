@@ -0,0 +1,84 @@
+# Importing the required packages:
+import os
+import sys
+import time
+import argparse
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from utils.shot_utils import assign_shot_zones, assign_shot_zones_batch
+
+def synthetic_shots(
+    n_shots: int,
+    seed: int = 14
+)-> tuple:
+    """
+    Function to generate random shot coordinates on the Statsbomb half pitch,
+    including shots on the zone boundaries and outside every zone
+
+        Parameters:
+            n_shots (int): Number of shots to generate
+            seed (int): Seed for the random generator
+
+        Returns:
+            x (np.ndarray): x coordinates of the shots
+            y (np.ndarray): y coordinates of the shots
+    """
+    rng = np.random.default_rng(seed)
+
+    x = rng.uniform(0, 80, n_shots).round(1)
+    y = rng.uniform(40, 120, n_shots).round(1)
+
+    return x, y
+
+def run_benchmark(n_shots: int, repeats: int = 3)-> dict:
+    """
+    Function to time the scalar and the batch shot zone assignment
+
+        Parameters:
+            n_shots (int): Number of shots to assign
+            repeats (int): Number of timed runs, the best one is kept
+
+        Returns:
+            result (dict): Best timings of both versions and the speedup
+    """
+    x, y = synthetic_shots(n_shots)
+
+    scalar_times = []
+    batch_times = []
+
+    for _ in range(repeats):
+        start = time.perf_counter()
+        scalar = [assign_shot_zones(i, j) for i, j in zip(x, y)]
+        scalar_times.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        batch = assign_shot_zones_batch(x, y)
+        batch_times.append(time.perf_counter() - start)
+
+    # Both versions must give exactly the same zones:
+    assert list(batch) == scalar
+
+    return {
+        'n_shots': n_shots,
+        'scalar_s': min(scalar_times),
+        'batch_s': min(batch_times),
+        'speedup': min(scalar_times) / min(batch_times),
+    }
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Benchmark scalar vs batch shot zone assignment'
+    )
+    parser.add_argument(
+        '--sizes', type=int, nargs='+', default=[1_000, 10_000, 100_000]
+    )
+    parser.add_argument('--repeats', type=int, default=3)
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        res = run_benchmark(size, args.repeats)
+        print(
+            f"{res['n_shots']:>9} shots | scalar {res['scalar_s']:.4f}s"
+            f" | batch {res['batch_s']:.4f}s | {res['speedup']:.0f}x"
+        )
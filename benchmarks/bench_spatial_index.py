@@ -0,0 +1,150 @@
+# Importing the required packages:
+import os
+import sys
+import time
+import argparse
+import numpy as np
+from matplotlib.path import Path
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from utils.spatial_index_utils import ShotIndex, PENALTY_SPOT, regions
+
+# Custom polygon used for the polygon queries, the left half space:
+POLYGON = [(18.0, 102.0), (30.0, 102.0), (40.0, 90.0), (18.0, 85.8)]
+
+def synthetic_shots(
+    n_shots: int,
+    seed: int = 14
+)-> tuple:
+    """
+    Function to generate random shot coordinates on the vertical Statsbomb
+    pitch, most of them in the attacking half
+
+        Parameters:
+            n_shots (int): Number of shots to generate
+            seed (int): Seed for the random generator
+
+        Returns:
+            x (np.ndarray): x coordinates of the shots
+            y (np.ndarray): y coordinates of the shots
+    """
+    rng = np.random.default_rng(seed)
+
+    x = rng.normal(40, 14, n_shots).clip(0, 80).round(1)
+    y = (120 - rng.gamma(2.0, 7.0, n_shots)).clip(30, 120).round(1)
+
+    return x, y
+
+def queries(
+    x: np.ndarray,
+    y: np.ndarray,
+    index: ShotIndex
+)-> dict:
+    """
+    Function to build every benchmark query, answered once with a full
+    boolean scan and once with the spatial index
+
+        Parameters:
+            x (np.ndarray): x coordinates of the shots
+            y (np.ndarray): y coordinates of the shots
+            index (ShotIndex): Index of the shots
+
+        Returns:
+            queries (dict): Scan and index function of every query
+    """
+    def scan_rect(name):
+        x0, x1, y0, y1 = regions()[name]
+        return np.flatnonzero((x >= x0) & (x <= x1) & (y >= y0) & (y <= y1))
+
+    def scan_radius():
+        cx, cy = PENALTY_SPOT
+        return np.flatnonzero((x - cx) ** 2 + (y - cy) ** 2 <= 12.0 ** 2)
+
+    def scan_polygon():
+        points = np.column_stack([x, y])
+        inside = Path(POLYGON).contains_points(points, radius=1e-9)
+        inside |= Path(POLYGON[::-1]).contains_points(points, radius=1e-9)
+        return np.flatnonzero(inside)
+
+    found = {
+        name: (
+            lambda name=name: scan_rect(name),
+            lambda name=name, **kw: index.region(name, **kw)
+        )
+        for name in ['zone_1', 'zone_12', 'six_yard_box', 'penalty_area']
+    }
+    found['radius_12'] = (scan_radius, lambda **kw: index.radius(*PENALTY_SPOT, 12.0, **kw))
+    found['polygon'] = (scan_polygon, lambda **kw: index.polygon(POLYGON, **kw))
+
+    return found
+
+def _best_time(func, repeats: int)-> tuple:
+    times = []
+
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = func()
+        times.append(time.perf_counter() - start)
+
+    return min(times), result
+
+def run_benchmark(n_shots: int, repeats: int = 3)-> dict:
+    """
+    Function to time the spatial index against full scans
+
+        Parameters:
+            n_shots (int): Number of shots to index
+            repeats (int): Number of timed runs, the best one is kept
+
+        Returns:
+            result (dict): Build time, and the number of shots found and best
+            timings of every query
+    """
+    x, y = synthetic_shots(n_shots)
+
+    start = time.perf_counter()
+    index = ShotIndex(x, y)
+    build_s = time.perf_counter() - start
+
+    result = {'n_shots': n_shots, 'build_s': build_s, 'queries': {}}
+
+    for name, (scan, lookup) in queries(x, y, index).items():
+        scan_s, expected = _best_time(scan, repeats)
+        index_s, found = _best_time(lookup, repeats)
+        sorted_s, found_sorted = _best_time(lambda: lookup(sort=True), repeats)
+
+        # Both ways must find exactly the same shots:
+        assert np.array_equal(expected, found_sorted), name
+        assert np.array_equal(expected, np.sort(found)), name
+
+        result['queries'][name] = {
+            'found': len(found),
+            'scan_s': scan_s,
+            'index_s': index_s,
+            'sorted_s': sorted_s,
+        }
+
+    return result
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Benchmark region queries with the spatial index vs full scans'
+    )
+    parser.add_argument(
+        '--sizes', type=int, nargs='+', default=[100_000, 1_000_000, 10_000_000]
+    )
+    parser.add_argument('--repeats', type=int, default=3)
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        res = run_benchmark(size, args.repeats)
+        print(f"{res['n_shots']:>9} shots | build {res['build_s']:.3f}s")
+
+        for name, q in res['queries'].items():
+            print(
+                f"    {name:>13} | {q['found'] / size:>6.1%} of shots"
+                f" | scan {q['scan_s']:.4f}s | index {q['index_s']:.4f}s"
+                f" ({q['scan_s'] / q['index_s']:.1f}x)"
+                f" | sorted {q['sorted_s']:.4f}s"
+                f" ({q['scan_s'] / q['sorted_s']:.1f}x)"
+            )
@@ -0,0 +1,102 @@
+# Importing the required packages:
+import os
+import sys
+import time
+import argparse
+import tempfile
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from utils.understat_scraper_utils import normalize_shots
+from utils.xg_model_utils import train_xg_model, predict_xg, calibration_report
+from understat_fixtures import make_shots
+
+def tile_shots(
+    shots: pd.DataFrame,
+    n_shots: int,
+    seed: int = 14
+)-> pd.DataFrame:
+    """
+    Function to build a large batch of shots by resampling a smaller one
+
+        Parameters:
+            shots (pd.DataFrame): Shots to resample
+            n_shots (int): Number of shots wanted
+            seed (int): Seed for the random generator
+
+        Returns:
+            shots (pd.DataFrame): Dataframe with n_shots rows
+    """
+    rng = np.random.default_rng(seed)
+    idx = rng.integers(0, len(shots), n_shots)
+
+    return shots.iloc[idx].reset_index(drop=True)
+
+def run_benchmark(
+    model,
+    shots: pd.DataFrame,
+    n_shots: int,
+    chunk_size: int,
+    repeats: int = 3
+)-> dict:
+    """
+    Function to time batch scoring of the xG model
+
+        Parameters:
+            model (XGModel): Trained model
+            shots (pd.DataFrame): Shots to resample
+            n_shots (int): Number of shots to score
+            chunk_size (int): Number of shots featurized at once
+            repeats (int): Number of timed runs, the best one is kept
+
+        Returns:
+            result (dict): Best time and throughput
+    """
+    batch = tile_shots(shots, n_shots)
+
+    times = []
+
+    for _ in range(repeats):
+        start = time.perf_counter()
+        predict_xg(batch, model, chunk_size=chunk_size)
+        times.append(time.perf_counter() - start)
+
+    return {
+        'n_shots': n_shots,
+        'best_s': min(times),
+        'shots_per_s': n_shots / min(times),
+    }
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Benchmark xG model training, scoring throughput and calibration'
+    )
+    parser.add_argument('--train', type=int, default=20_000, help='Synthetic shots to train on')
+    parser.add_argument(
+        '--sizes', type=int, nargs='+', default=[100_000, 1_000_000, 5_000_000]
+    )
+    parser.add_argument('--chunk-size', type=int, default=1_000_000)
+    parser.add_argument('--repeats', type=int, default=3)
+    args = parser.parse_args()
+
+    shots = normalize_shots(pd.DataFrame(make_shots(args.train)))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        model = train_xg_model(shots, path=os.path.join(tmp, 'xg_model.joblib'))
+        print(f'trained on {len(shots)} shots in {time.perf_counter() - start:.2f}s')
+
+    for size in args.sizes:
+        res = run_benchmark(model, shots, size, args.chunk_size, args.repeats)
+        print(
+            f"{res['n_shots']:>9} shots | {res['best_s']:.4f}s"
+            f" | {res['shots_per_s'] / 1e6:.2f}M shots/s"
+        )
+
+    table, summary = calibration_report(shots, model)
+
+    print()
+    print(table.to_string(index=False))
+    print()
+    print(summary.to_string(index=False))
@@ -0,0 +1,421 @@
+# Importing the required packages:
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import tempfile
+import tracemalloc
+import subprocess
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.append(ROOT)
+
+from utils.cache_utils import write_cache
+from utils.understat_scraper_utils import BASE_URL, scrape_shots
+from utils.shot_utils import (
+    convert_to_statsbomb,
+    assign_shot_zones,
+    assign_shot_zones_batch,
+    zone_stats
+)
+from utils.helper_utils import (
+    statsbomb_pitch_vert,
+    shot_map,
+    plot_shot_zones,
+    line_plots
+)
+from utils.data_loader_utils import load_excel
+from utils.trendline_utils import render_trends
+from understat_fixtures import (
+    make_shots,
+    make_player_page,
+    make_shot_frame,
+    make_league_table,
+    write_fixture_pages
+)
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000, 1_000_000, 10_000_000]
+
+def _render(fig):
+    # Drawing the canvas so the time includes rasterizing the artists:
+    fig.canvas.draw()
+    plt.close(fig)
+
+def setup_scrape_shots(n_shots: int, tmp: str):
+    """
+    Function to prepare scrape_shots on a synthetic page served from the
+    on-disk cache, so the whole scrape runs offline
+    """
+    cache_dir = os.path.join(tmp, f'cache_{n_shots}')
+    write_cache(
+        BASE_URL + str(n_shots),
+        make_player_page(make_shots(n_shots)).encode('utf8'),
+        cache_dir=cache_dir
+    )
+
+    return lambda: scrape_shots(n_shots, cache_dir=cache_dir, ttl=None)
+
+def setup_convert_to_statsbomb(n_shots: int, tmp: str):
+    shots = make_shot_frame(n_shots)
+
+    return lambda: convert_to_statsbomb(shots, 'X', 'Y')
+
+def setup_assign_shot_zones(n_shots: int, tmp: str):
+    shots = convert_to_statsbomb(make_shot_frame(n_shots), 'X', 'Y')
+    x, y = shots['X'].to_numpy(), shots['Y'].to_numpy()
+
+    return lambda: [assign_shot_zones(i, j) for i, j in zip(x, y)]
+
+def setup_assign_shot_zones_batch(n_shots: int, tmp: str):
+    shots = convert_to_statsbomb(make_shot_frame(n_shots), 'X', 'Y')
+
+    return lambda: assign_shot_zones_batch(shots['X'], shots['Y'])
+
+def setup_zone_stats(n_shots: int, tmp: str):
+    shots = convert_to_statsbomb(make_shot_frame(n_shots), 'X', 'Y')
+
+    return lambda: zone_stats(shots)
+
+def setup_shot_map(n_shots: int, tmp: str):
+    shots = convert_to_statsbomb(make_shot_frame(n_shots), 'X', 'Y')
+
+    def run():
+        fig, ax = plt.subplots(figsize=(16, 10))
+        statsbomb_pitch_vert(ax=ax, bg='#141414')
+
+        for situation, color in [('Goal', '#034694'), ('Miss', 'grey')]:
+            shot_map(
+                axis=ax, data=shots, situation=situation, x_pos='X', y_pos='Y',
+                color=color, edge_col='#141414'
+            )
+
+        _render(fig)
+
+    return run
+
+def setup_plot_shot_zones(n_shots: int, tmp: str):
+    shots = convert_to_statsbomb(make_shot_frame(n_shots), 'X', 'Y')
+
+    def run():
+        fig, ax = plt.subplots(figsize=(16, 10))
+        plot_shot_zones(
+            axis=ax, bg='#141414', grid_col='white', zone_col='#034694',
+            text_col='white', font='sans-serif', data=zone_stats(shots)
+        )
+        _render(fig)
+
+    return run
+
+def setup_line_plots(n_matches: int, tmp: str):
+    rng = np.random.default_rng(14)
+    data = pd.DataFrame({
+        'Round': np.arange(1, n_matches + 1),
+        'roll_xGF': rng.gamma(3.0, 0.45, n_matches),
+        'roll_xGA': rng.gamma(3.0, 0.45, n_matches),
+    })
+
+    def run():
+        fig, ax = plt.subplots(figsize=(15, 20))
+        line_plots(axis=ax, dataframe=data, xG_for='roll_xGF', xG_against='roll_xGA', bg='#141414')
+        _render(fig)
+
+    return run
+
+def setup_xg_trendline(n_matches: int, tmp: str):
+    """
+    Function to prepare the full trendline pipeline, the workbook load and
+    one figure per team, for three seasons of as many teams as it takes to
+    reach n_matches rows
+    """
+    n_teams = max(1, int(np.ceil(n_matches / (3 * 38))))
+    path = os.path.join(tmp, f'league_{n_teams}.xlsx')
+    make_league_table(n_teams=n_teams).to_excel(path, index=False)
+
+    output_dir = os.path.join(tmp, f'trend_{n_teams}')
+
+    def run():
+        df = load_excel(path, cache_dir=os.path.join(tmp, 'excel_cache'))
+        results = render_trends(df, output_dir=output_dir, workers=0)
+
+        if (results['status'] != 'ok').any():
+            raise RuntimeError(results['error'].dropna().iloc[0])
+
+    return run
+
+# Cases of the suite as (setup, largest size, unit of the size). The sizes
+# above the limit are skipped, the slow paths being capped lower:
+CASES = {
+    'scrape_shots': (setup_scrape_shots, 100_000, 'shots'),
+    'convert_to_statsbomb': (setup_convert_to_statsbomb, 10_000_000, 'shots'),
+    'assign_shot_zones': (setup_assign_shot_zones, 100_000, 'shots'),
+    'assign_shot_zones_batch': (setup_assign_shot_zones_batch, 10_000_000, 'shots'),
+    'zone_stats': (setup_zone_stats, 10_000_000, 'shots'),
+    'shot_map': (setup_shot_map, 100_000, 'shots'),
+    'plot_shot_zones': (setup_plot_shot_zones, 10_000_000, 'shots'),
+    'line_plots': (setup_line_plots, 100_000, 'matches'),
+    'xG_trendline': (setup_xg_trendline, 10_000, 'matches'),
+}
+
+def measure(
+    func,
+    repeats: int = 3
+)-> dict:
+    """
+    Function to time a function and measure the peak memory it allocates
+
+    The timed runs come first, then one run under tracemalloc, so tracing
+    does not slow down the timings. Memory allocated outside of Python and
+    numpy, e.g. the Agg canvas, is not traced.
+
+        Parameters:
+            func (callable): Function to measure
+            repeats (int): Number of timed runs
+
+        Returns:
+            result (dict): Best, median and every wall time, and the peak
+            traced memory in MB
+    """
+    times = []
+
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'best_s': min(times),
+        'median_s': float(np.median(times)),
+        'times_s': times,
+        'peak_mb': peak / 2 ** 20,
+    }
+
+def scaling_exponent(
+    sizes: list,
+    times: list
+)-> float:
+    """
+    Function to fit time = c * size ** k over the measured sizes
+
+        Parameters:
+            sizes (list): Sizes of the runs
+            times (list): Best time of every run
+
+        Returns:
+            k (float): Fitted exponent, 1 for linear scaling, None if there
+            are not enough points
+    """
+    points = [(s, t) for s, t in zip(sizes, times) if t > 0]
+
+    if len(points) < 2:
+        return None
+
+    sizes, times = np.log([p[0] for p in points]), np.log([p[1] for p in points])
+
+    return float(np.polyfit(sizes, times, 1)[0])
+
+def _environment()-> dict:
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=ROOT, capture_output=True, text=True, timeout=10
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+
+    return {
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'commit': commit,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'matplotlib': matplotlib.__version__,
+    }
+
+def run_suite(
+    cases: list = None,
+    sizes: list = None,
+    repeats: int = 3,
+    fixture_dir: str = FIXTURE_DIR
+)-> dict:
+    """
+    Function to run the benchmark suite
+
+        Parameters:
+            cases (list): Names of the cases to run, every case if None
+            sizes (list): Sizes to run every case at, capped per case
+            repeats (int): Number of timed runs of every size
+            fixture_dir (str): Folder of saved understat pages, parsed offline
+            by the scrape_shots_fixture case
+
+        Returns:
+            results (dict): Environment and the runs, scaling exponent and any
+            error of every case
+    """
+    sizes = sorted(sizes or DEFAULT_SIZES)
+    results = {'environment': _environment(), 'repeats': repeats, 'cases': {}}
+
+    tmp = tempfile.mkdtemp(prefix='football-bench-')
+
+    try:
+        for name in cases or CASES:
+            setup, limit, unit = CASES[name]
+            case = {'unit': unit, 'runs': []}
+
+            for size in [s for s in sizes if s <= limit]:
+                print(f'{name:>24} | {size:>10} {unit}', end=' | ', flush=True)
+
+                try:
+                    run = measure(setup(size, tmp), repeats)
+                except Exception as error:
+                    case['error'] = f'{type(error).__name__}: {error}'
+                    print(case['error'])
+                    break
+
+                run['size'] = size
+                case['runs'].append(run)
+                print(f"{run['best_s']:.4f}s | {run['peak_mb']:.1f} MB")
+
+            case['scaling'] = scaling_exponent(
+                [r['size'] for r in case['runs']], [r['best_s'] for r in case['runs']]
+            )
+            results['cases'][name] = case
+
+        if cases is None or 'scrape_shots_fixture' in cases:
+            results['cases'].update(_fixture_cases(fixture_dir, tmp, repeats))
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+    return results
+
+def _fixture_cases(
+    fixture_dir: str,
+    tmp: str,
+    repeats: int
+)-> dict:
+    """
+    Function to time scrape_shots on every saved page of the fixture folder
+    """
+    cases = {}
+
+    if not os.path.isdir(fixture_dir):
+        return cases
+
+    for file in sorted(os.listdir(fixture_dir)):
+        if not file.endswith('.html'):
+            continue
+
+        with open(os.path.join(fixture_dir, file), 'rb') as f:
+            content = f.read()
+
+        cache_dir = os.path.join(tmp, 'fixtures')
+        player = os.path.splitext(file)[0]
+        write_cache(BASE_URL + player, content, cache_dir=cache_dir)
+
+        run = measure(lambda: scrape_shots(player, cache_dir=cache_dir, ttl=None), repeats)
+        run['size'] = len(content)
+
+        print(f"{'scrape_shots_fixture':>24} | {file} | {run['best_s']:.4f}s | {run['peak_mb']:.1f} MB")
+        cases[f'scrape_shots_fixture/{file}'] = {'unit': 'bytes', 'runs': [run], 'scaling': None}
+
+    return cases
+
+def compare(
+    old: dict,
+    new: dict
+)-> pd.DataFrame:
+    """
+    Function to compare two saved runs of the suite
+
+        Parameters:
+            old (dict): Results of the baseline run
+            new (dict): Results of the new run
+
+        Returns:
+            table (pd.DataFrame): Best time and peak memory of both runs and
+            their ratio, for every case and size measured in both
+    """
+    rows = []
+
+    for name, case in new['cases'].items():
+        before = {r['size']: r for r in old['cases'].get(name, {}).get('runs', [])}
+
+        for run in case['runs']:
+            if run['size'] not in before:
+                continue
+
+            base = before[run['size']]
+            rows.append({
+                'case': name,
+                'size': run['size'],
+                'old_s': base['best_s'],
+                'new_s': run['best_s'],
+                'time_ratio': run['best_s'] / base['best_s'],
+                'old_mb': base['peak_mb'],
+                'new_mb': run['peak_mb'],
+            })
+
+    return pd.DataFrame(rows)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Time every hot path of utils on synthetic shots and save the results as JSON'
+    )
+    parser.add_argument('--cases', nargs='+', choices=list(CASES) + ['scrape_shots_fixture'])
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES)
+    parser.add_argument('--quick', action='store_true', help='Only run the 1k and 10k sizes')
+    parser.add_argument('--repeats', type=int, default=3)
+    parser.add_argument('--output', help='JSON file of the results, a timestamped file in benchmarks/results by default')
+    parser.add_argument('--compare', metavar='BASELINE', help='JSON file of an earlier run to compare against')
+    parser.add_argument('--write-fixtures', action='store_true', help='Save the synthetic HTML fixtures again and exit')
+    args = parser.parse_args()
+
+    if args.write_fixtures:
+        for path in write_fixture_pages(FIXTURE_DIR):
+            print(path)
+        sys.exit()
+
+    sizes = [1_000, 10_000] if args.quick else args.sizes
+    results = run_suite(args.cases, sizes, args.repeats)
+
+    output = args.output or os.path.join(
+        RESULTS_DIR, datetime.now().strftime('suite_%Y%m%d_%H%M%S.json')
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+
+    with open(output, 'w') as f:
+        json.dump(results, f, indent=2)
+
+    print()
+    for name, case in results['cases'].items():
+        if case['scaling'] is not None:
+            print(f"{name:>24} | time ~ size^{case['scaling']:.2f}")
+    print(f'\nSaved to {output}')
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+
+        print()
+        print(compare(baseline, results).to_string(index=False))
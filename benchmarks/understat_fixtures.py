@@ -0,0 +1,274 @@
+# Importing the required packages:
+import os
+import json
+import numpy as np
+import pandas as pd
+
+# Values used to fill the synthetic shots:
+RESULTS = ['Goal', 'MissedShots', 'SavedShot', 'BlockedShot', 'ShotOnPost']
+SITUATIONS = ['OpenPlay', 'FromCorner', 'SetPiece', 'DirectFreekick', 'Penalty']
+SHOT_TYPES = ['RightFoot', 'LeftFoot', 'Head', 'OtherBodyPart']
+LAST_ACTIONS = ['Pass', 'Cross', 'TakeOn', 'Rebound', 'None', 'Standard']
+TEAMS = [
+    'Chelsea', 'Arsenal', 'Liverpool', 'Manchester City', 'Tottenham',
+    'Bayer Leverkusen', 'Bayern Munich', 'Borussia Dortmund', 'Everton',
+    'Leicester', 'West Ham', 'Aston Villa', 'Newcastle United', 'Brighton',
+    'Wolverhampton Wanderers', 'Crystal Palace', 'Brentford', 'Leeds',
+    'Southampton', 'Burnley'
+]
+
+def make_shots(
+    n_shots: int,
+    player_id: int = 5220,
+    seed: int = 14
+)-> list:
+    """
+    Function to generate understat-shaped shot records, every value stored
+    as a string just like on the understat pages
+
+        Parameters:
+            n_shots (int): Number of shots to generate
+            player_id (int): Player ID written on every shot
+            seed (int): Seed for the random generator
+
+        Returns:
+            shots (list): List of shot dictionaries
+    """
+    rng = np.random.default_rng(seed)
+
+    x = rng.uniform(0.6, 0.99, n_shots)
+    y = rng.uniform(0.15, 0.85, n_shots)
+    xg = rng.beta(1.2, 9.0, n_shots)
+    goal = rng.random(n_shots) < xg
+    minute = rng.integers(1, 96, n_shots)
+    season = rng.integers(2014, 2023, n_shots)
+    home = rng.integers(0, len(TEAMS), n_shots)
+    away = (home + rng.integers(1, len(TEAMS), n_shots)) % len(TEAMS)
+    day = rng.integers(0, 270, n_shots)
+
+    shots = []
+
+    for i in range(n_shots):
+        date = np.datetime64(f'{season[i]}-08-01') + int(day[i])
+
+        shots.append({
+            'id': str(100000 + player_id * 10000 + i),
+            'minute': str(minute[i]),
+            'result': 'Goal' if goal[i] else RESULTS[1 + i % 4],
+            'X': f'{x[i]:.15f}',
+            'Y': f'{y[i]:.15f}',
+            'xG': f'{xg[i]:.15f}',
+            'player': f'Player {player_id}',
+            'h_a': 'h' if i % 2 else 'a',
+            'player_id': str(player_id),
+            'situation': SITUATIONS[i % 23 % len(SITUATIONS)],
+            'season': str(season[i]),
+            'shotType': SHOT_TYPES[i % 7 % len(SHOT_TYPES)],
+            'match_id': str(10000 + i // 3),
+            'h_team': TEAMS[home[i]],
+            'a_team': TEAMS[away[i]],
+            'h_goals': str(i % 4),
+            'a_goals': str(i % 3),
+            'date': f'{date} 15:00:00',
+            'player_assisted': None if i % 3 else 'Player 1',
+            'lastAction': LAST_ACTIONS[i % len(LAST_ACTIONS)],
+        })
+
+    return shots
+
+def encode_dataset(data)-> str:
+    """
+    Function to encode data the way understat embeds it in its pages, as a
+    JSON string with the punctuation written as \\xNN escapes
+
+        Parameters:
+            data (list or dict): Data to encode
+
+        Returns:
+            encoded (str): Escaped JSON string
+    """
+    text = json.dumps(data, separators=(',', ':'))
+
+    return ''.join(
+        c if c.isalnum() or c in ' .-_' else f'\\x{ord(c):02X}'
+        for c in text
+    )
+
+def _page_chrome()-> str:
+    """
+    Function to build the navigation and league tables that surround the data
+    on a real understat page, so that DOM parsing has a realistic amount of
+    markup to go through
+
+        Returns:
+            html (str): HTML of the page chrome
+    """
+    menu = ''.join(
+        f'<li class="menu-item"><a href="/team/{team.replace(" ", "_")}/2021">'
+        f'<span class="team-name">{team}</span></a></li>\n'
+        for team in TEAMS
+    )
+
+    rows = ''.join(
+        '<tr>' + ''.join(
+            f'<td class="align-right"><span>{(i * 7 + j) % 38}</span></td>'
+            for j in range(14)
+        ) + '</tr>\n'
+        for i in range(120)
+    )
+
+    return (
+        f'<nav class="header-menu"><ul>{menu * 6}</ul></nav>\n'
+        f'<div class="chemp"><table class="table-stats">{rows}</table></div>\n'
+    )
+
+def make_player_page(shots: list, matches: list = None)-> str:
+    """
+    Function to build an understat-shaped player page holding the given shots
+
+        Parameters:
+            shots (list): Shot records to embed as shotsData
+            matches (list): Match records to embed as matchesData
+
+        Returns:
+            page (str): HTML of the player page
+    """
+    matches = matches if matches is not None else []
+
+    return (
+        '<!DOCTYPE html>\n<html lang="en">\n<head>\n'
+        '<meta charset="utf-8">\n<title>Player | Understat</title>\n'
+        '<script src="/js/jquery.min.js"></script>\n'
+        '<script src="/js/main.min.js"></script>\n'
+        '</head>\n<body>\n<div class="page-wrapper">\n'
+        + _page_chrome() +
+        '<div class="block"><h3>Shots</h3></div>\n'
+        '<script>\n\tvar groupsData = JSON.parse'
+        f"('{encode_dataset({'season': []})}');\n</script>\n"
+        '<script>\n\tvar shotsData \t= JSON.parse'
+        f"('{encode_dataset(shots)}');\n</script>\n"
+        '<script>\n\tvar matchesData \t= JSON.parse'
+        f"('{encode_dataset(matches)}');\n</script>\n"
+        '</div>\n</body>\n</html>\n'
+    )
+
+def make_shot_frame(
+    n_shots: int,
+    n_players: int = 500,
+    seed: int = 14
+)-> pd.DataFrame:
+    """
+    Function to generate understat-shaped shots straight as a Dataframe with
+    the compact types of normalize_shots, fast enough for millions of rows
+
+        Parameters:
+            n_shots (int): Number of shots to generate
+            n_players (int): Number of players the shots are spread over
+            seed (int): Seed for the random generator
+
+        Returns:
+            df (pd.DataFrame): Dataframe containing the shot data
+    """
+    rng = np.random.default_rng(seed)
+
+    def category(values, codes):
+        return pd.Categorical.from_codes(codes, categories=values)
+
+    xg = rng.beta(1.2, 9.0, n_shots).astype(np.float32)
+    goal = rng.random(n_shots) < xg
+    result = np.where(goal, 0, rng.integers(1, len(RESULTS), n_shots))
+    player = rng.integers(0, n_players, n_shots)
+    home = rng.integers(0, len(TEAMS), n_shots)
+    away = (home + rng.integers(1, len(TEAMS), n_shots)) % len(TEAMS)
+    season = rng.integers(2014, 2023, n_shots).astype(np.int16)
+    day = rng.integers(0, 270, n_shots)
+
+    player_names = [f'Player {i}' for i in range(n_players)]
+
+    return pd.DataFrame({
+        'id': np.arange(n_shots, dtype=np.int64) + 100000,
+        'minute': rng.integers(1, 96, n_shots).astype(np.int16),
+        'result': category(RESULTS, result),
+        'X': rng.uniform(0.6, 0.99, n_shots).astype(np.float32),
+        'Y': rng.uniform(0.15, 0.85, n_shots).astype(np.float32),
+        'xG': xg,
+        'player': category(player_names, player),
+        'h_a': category(['a', 'h'], rng.integers(0, 2, n_shots)),
+        'player_id': (player + 1000).astype(np.int32),
+        'situation': category(SITUATIONS, rng.choice(len(SITUATIONS), n_shots, p=[0.7, 0.12, 0.1, 0.05, 0.03])),
+        'season': season,
+        'shotType': category(SHOT_TYPES, rng.choice(len(SHOT_TYPES), n_shots, p=[0.5, 0.3, 0.18, 0.02])),
+        'match_id': (np.arange(n_shots) // 25 + 10000).astype(np.int32),
+        'h_team': category(TEAMS, home),
+        'a_team': category(TEAMS, away),
+        'h_goals': rng.integers(0, 5, n_shots).astype(np.int8),
+        'a_goals': rng.integers(0, 4, n_shots).astype(np.int8),
+        'date': (
+            (season.astype(int) - 1970).astype('datetime64[Y]').astype('datetime64[D]')
+            + np.timedelta64(212, 'D') + day
+        ).astype('datetime64[ns]'),
+        'player_assisted': category(player_names[:50], rng.integers(-1, 50, n_shots)),
+        'lastAction': category(LAST_ACTIONS, rng.integers(0, len(LAST_ACTIONS), n_shots)),
+    })
+
+def make_league_table(
+    n_teams: int = 20,
+    seasons: list = ('19/20', '20/21', '21/22'),
+    n_rounds: int = 38,
+    seed: int = 14
+)-> pd.DataFrame:
+    """
+    Function to generate a league table of match xG like
+    Data/PL-2021-22-Fixtures.xlsx, for the xG trendline
+
+        Parameters:
+            n_teams (int): Number of teams
+            seasons (list): Season labels
+            n_rounds (int): Matches of every team in a season
+            seed (int): Seed for the random generator
+
+        Returns:
+            df (pd.DataFrame): One row per team and match
+    """
+    rng = np.random.default_rng(seed)
+    n_rows = n_teams * len(seasons) * n_rounds
+
+    teams = [TEAMS[i % len(TEAMS)] + ('' if i < len(TEAMS) else f' {i // len(TEAMS)}') for i in range(n_teams)]
+
+    return pd.DataFrame({
+        'Round': np.tile([f'Matchweek {r}' for r in range(1, n_rounds + 1)], n_teams * len(seasons)),
+        'Result': rng.choice(['W', 'D', 'L'], n_rows),
+        'Team': np.repeat(teams, len(seasons) * n_rounds),
+        'Opponent': rng.choice(TEAMS, n_rows),
+        'xG': rng.gamma(3.0, 0.45, n_rows).round(1),
+        'xGA': rng.gamma(3.0, 0.45, n_rows).round(1),
+        'Season': np.tile(np.repeat(list(seasons), n_rounds), n_teams),
+    })
+
+def write_fixture_pages(
+    folder: str,
+    sizes: list = (100, 1000)
+)-> list:
+    """
+    Function to save synthetic player pages as HTML fixtures
+
+        Parameters:
+            folder (str): Folder of the fixtures
+            sizes (list): Number of shots on every page
+
+        Returns:
+            paths (list): Paths of the saved pages
+    """
+    os.makedirs(folder, exist_ok=True)
+
+    paths = []
+
+    for size in sizes:
+        path = os.path.join(folder, f'player_{size}.html')
+
+        with open(path, 'w', encoding='utf8') as f:
+            f.write(make_player_page(make_shots(size)))
+
+        paths.append(path)
+
+    return paths
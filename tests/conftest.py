@@ -0,0 +1,7 @@
+# Importing the required packages:
+import os
+import sys
+
+# The utils package is imported from the root of the repository, like the
+# scripts in Code and benchmarks do:
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
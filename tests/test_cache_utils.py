@@ -0,0 +1,63 @@
+# Importing the required packages:
+import os
+import time
+import pytest
+
+from utils.cache_utils import cache_path, clear_cache, evict_cache, read_cache, write_cache
+
+URL = 'https://understat.com/player/5220'
+
+def age(path: str, seconds: float, accessed: float = None):
+    """
+    Moving the fetch time of a cache file back, and optionally setting when
+    it was last read
+    """
+    now = time.time()
+    os.utime(path, (now - accessed if accessed is not None else now, now - seconds))
+
+def test_round_trip(tmp_path):
+    path = write_cache(URL, b'<html>shots</html>', cache_dir=str(tmp_path))
+
+    assert path == cache_path(URL, str(tmp_path))
+    assert read_cache(URL, cache_dir=str(tmp_path)) == b'<html>shots</html>'
+    assert read_cache(URL + '0', cache_dir=str(tmp_path)) is None
+    assert not [name for name in os.listdir(tmp_path) if name.endswith('.tmp')]
+
+def test_ttl(tmp_path):
+    path = write_cache(URL, b'page', cache_dir=str(tmp_path))
+    age(path, 120)
+
+    assert read_cache(URL, cache_dir=str(tmp_path), ttl=60) is None
+    assert read_cache(URL, cache_dir=str(tmp_path), ttl=600) == b'page'
+    assert read_cache(URL, cache_dir=str(tmp_path), ttl=None) == b'page'
+
+def test_reading_keeps_the_fetch_time(tmp_path):
+    path = write_cache(URL, b'page', cache_dir=str(tmp_path))
+    age(path, 120, accessed=120)
+    fetched = os.stat(path).st_mtime
+
+    read_cache(URL, cache_dir=str(tmp_path), ttl=None)
+
+    assert os.stat(path).st_mtime == pytest.approx(fetched)
+    assert os.stat(path).st_atime > fetched
+
+def test_evicts_least_recently_used(tmp_path):
+    cache_dir = str(tmp_path)
+    urls = [f'{URL}/{i}' for i in range(3)]
+
+    for i, url in enumerate(urls):
+        # Random bytes so gzip leaves every file about the same size:
+        age(write_cache(url, os.urandom(1000), cache_dir=cache_dir, max_size=None), 0, accessed=100 - i)
+
+    size = os.path.getsize(cache_path(urls[0], cache_dir))
+
+    assert evict_cache(cache_dir, max_size=2 * size + 10) == 1
+    assert read_cache(urls[0], cache_dir=cache_dir) is None
+    assert read_cache(urls[1], cache_dir=cache_dir) is not None
+
+def test_clear_cache(tmp_path):
+    for i in range(3):
+        write_cache(f'{URL}/{i}', b'page', cache_dir=str(tmp_path))
+
+    assert clear_cache(str(tmp_path)) == 3
+    assert clear_cache(str(tmp_path / 'missing')) == 0
@@ -0,0 +1,81 @@
+# Importing the required packages:
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.coordinate_utils import (
+    CoordinateTransform, PROVIDERS, register_provider, transform_coordinates
+)
+from utils.shot_utils import convert_to_statsbomb
+
+def convert_to_statsbomb_baseline(data, x_cords, y_cords):
+    """
+    The step by step conversion convert_to_statsbomb used before the affine
+    transforms
+    """
+    df = data.copy()
+    df[x_cords] = pd.to_numeric(df[x_cords]) * 100
+    df[y_cords] = pd.to_numeric(df[y_cords]) * 100
+    df[x_cords], df[y_cords] = df[y_cords] * .8, df[x_cords] * 1.2
+
+    return df
+
+@pytest.fixture
+def shots():
+    rng = np.random.default_rng(14)
+
+    return pd.DataFrame({
+        'X': [f'{v:.15f}' for v in rng.uniform(0, 1, 500)],
+        'Y': [f'{v:.15f}' for v in rng.uniform(0, 1, 500)],
+    })
+
+def test_convert_to_statsbomb_matches_baseline(shots):
+    df = convert_to_statsbomb(shots, 'X', 'Y')
+    expected = convert_to_statsbomb_baseline(shots, 'X', 'Y')
+
+    np.testing.assert_allclose(df['X'], expected['X'], rtol=1e-12)
+    np.testing.assert_allclose(df['Y'], expected['Y'], rtol=1e-12)
+
+    # The input is only changed with inplace:
+    assert isinstance(shots['X'].iloc[0], str)
+    assert convert_to_statsbomb(shots, 'X', 'Y', inplace=True) is shots
+    np.testing.assert_allclose(shots['X'], expected['X'], rtol=1e-12)
+
+def test_transforms_round_trip(shots):
+    x = pd.to_numeric(shots['X']).to_numpy()
+    y = pd.to_numeric(shots['Y']).to_numpy()
+
+    for source in PROVIDERS:
+        for target in PROVIDERS:
+            transform = CoordinateTransform.between(source, target, vertical=True)
+            x_new, y_new = transform.inverse().apply(*transform.apply(x, y))
+
+            np.testing.assert_allclose(x_new, x, atol=1e-12)
+            np.testing.assert_allclose(y_new, y, atol=1e-12)
+
+def test_opta_flips_y():
+    x, y = CoordinateTransform.between('statsbomb', 'opta').apply([0.0, 60.0, 120.0], [0.0, 40.0, 80.0])
+
+    np.testing.assert_allclose(x, [0, 50, 100])
+    np.testing.assert_allclose(y, [100, 50, 0])
+
+def test_chained_steps_and_dtype():
+    transform = CoordinateTransform().scale(2.0, 3.0).shift(1.0, -1.0).swap_axes()
+    x, y = transform.apply(np.array([1.0, 2.0], dtype=np.float32), np.array([1.0, 0.0], dtype=np.float32))
+
+    assert x.dtype == np.float32
+    np.testing.assert_allclose(x, [2.0, -1.0])
+    np.testing.assert_allclose(y, [3.0, 5.0])
+
+def test_register_provider(monkeypatch):
+    # Letting monkeypatch remove the provider again afterwards:
+    monkeypatch.setitem(PROVIDERS, 'small', None)
+    register_provider('small', 50, 50, y_down=False)
+
+    data = pd.DataFrame({'x': [100.0], 'y': [100.0]})
+    x, y = transform_coordinates(data, 'x', 'y', source='opta', target='small')
+
+    np.testing.assert_allclose([x[0], y[0]], [50.0, 50.0])
+
+    with pytest.raises(ValueError):
+        transform_coordinates(data, 'x', 'y', source='tracab')
@@ -0,0 +1,51 @@
+# Importing the required packages:
+import os
+import numpy as np
+import pandas as pd
+import pytest
+from utils.data_loader_utils import excel_cache_path, invalidate_excel_cache, load_excel
+
+pytest.importorskip('openpyxl')
+
+@pytest.fixture
+def workbook(tmp_path):
+    path = os.path.join(tmp_path, 'Team_xG.xlsx')
+    pd.DataFrame({
+        'Round': [f'Matchweek {i}' for i in range(1, 11)],
+        'xG': np.linspace(0.5, 2.5, 10),
+        'xGA': np.linspace(1.5, 0.5, 10),
+        'Season': ['21/22'] * 10,
+    }).to_excel(path, index=False)
+
+    return path
+
+def test_cached_load_matches_first_load(workbook):
+    first = load_excel(workbook)
+
+    assert os.path.exists(excel_cache_path(workbook))
+
+    cached = load_excel(workbook)
+    pd.testing.assert_frame_equal(cached, first)
+    pd.testing.assert_frame_equal(first, pd.read_excel(workbook))
+
+def test_cached_load_keeps_index_col(workbook):
+    first = load_excel(workbook, index_col='Round')
+    cached = load_excel(workbook, index_col='Round')
+
+    assert first.index.name == 'Round'
+    pd.testing.assert_frame_equal(cached, first)
+
+def test_changed_workbook_is_converted_again(workbook):
+    load_excel(workbook)
+
+    df = pd.read_excel(workbook)
+    df['xG'] = df['xG'] * 2
+    df.to_excel(workbook, index=False)
+
+    pd.testing.assert_frame_equal(load_excel(workbook), df)
+
+def test_invalidate_removes_the_cache(workbook):
+    load_excel(workbook)
+
+    assert invalidate_excel_cache(workbook) == 1
+    assert not os.path.exists(excel_cache_path(workbook))
@@ -0,0 +1,81 @@
+# Importing the required packages:
+import os
+import numpy as np
+import pytest
+
+matplotlib = pytest.importorskip('matplotlib')
+pytest.importorskip('PIL')
+matplotlib.use('Agg')
+
+import matplotlib.pyplot as plt
+from PIL import Image
+from utils import export_utils
+from utils.export_utils import export_dpi, export_figure, export_options, rasterize_dense
+
+@pytest.fixture
+def fig():
+    fig, ax = plt.subplots(figsize=(8, 4))
+    rng = np.random.default_rng(0)
+    ax.scatter(rng.uniform(size=1000), rng.uniform(size=1000))
+    ax.plot([0, 1], [0, 1])
+    yield fig
+    plt.close(fig)
+
+def test_export_options():
+    assert export_options('web')['format'] == 'webp'
+    assert export_options('web', quality=50)['quality'] == 50
+
+    with pytest.raises(KeyError):
+        export_options('poster')
+
+    with pytest.raises(TypeError):
+        export_options(qualty=50)
+
+def test_export_dpi(fig):
+    assert export_dpi(fig, export_options(long_edge=1600)) == 200
+    assert export_dpi(fig, export_options(dpi=100, max_pixels=8 * 4 * 50**2)) == pytest.approx(50)
+
+def test_rasterize_dense_keeps_small_layers_vector(fig):
+    assert rasterize_dense(fig, min_points=500) == 1
+    assert fig.axes[0].collections[0].get_rasterized()
+    assert not fig.axes[0].lines[0].get_rasterized()
+
+def test_png_matches_savefig(fig, tmp_path):
+    path = os.path.join(tmp_path, 'fig.png')
+    expected = os.path.join(tmp_path, 'savefig.png')
+
+    result = export_figure(fig, path, dpi=50, bbox_inches=None)
+    fig.savefig(expected, dpi=50)
+
+    assert (result['width'], result['height']) == (400, 200)
+    assert result['peak_memory_mb'] > 0
+
+    with Image.open(path) as image, Image.open(expected) as saved:
+        assert image.size == saved.size
+        diff = np.abs(np.asarray(image.convert('RGB'), dtype=int) - np.asarray(saved.convert('RGB'), dtype=int))
+
+    assert diff.max() <= 1
+
+def test_preset_replaces_the_extension(fig, tmp_path):
+    result = export_figure(fig, os.path.join(tmp_path, 'fig.jpg'), 'print', wait=False).result()
+
+    assert result['output'].endswith('.pdf')
+    assert os.path.getsize(result['output']) == result['bytes']
+    assert result['rasterized'] == 1
+
+@pytest.mark.parametrize('method', ['proc', 'tracemalloc'])
+def test_peak_memory_is_measured_per_export(fig, tmp_path, monkeypatch, method):
+    if method == 'tracemalloc':
+        monkeypatch.setattr(export_utils, 'CLEAR_REFS', str(tmp_path / 'missing' / 'clear_refs'))
+    elif export_utils._read_hwm_mb() is None:
+        pytest.skip('/proc/self/status is not available')
+
+    # A peak well above anything the export needs, freed before exporting:
+    memory = export_utils._PeakMemory().start()
+    big = np.ones(32 * 1024**2)
+    big_peak = memory.stop()
+    del big
+
+    result = export_figure(fig, os.path.join(tmp_path, 'fig.png'), dpi=50)
+
+    assert 0 < result['peak_memory_mb'] < big_peak - 128
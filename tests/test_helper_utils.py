@@ -0,0 +1,160 @@
+# Importing the required packages:
+import numpy as np
+import pandas as pd
+import pytest
+
+matplotlib = pytest.importorskip('matplotlib')
+pytest.importorskip('mplsoccer')
+matplotlib.use('Agg')
+
+import matplotlib.pyplot as plt
+from matplotlib.collections import PolyCollection
+from matplotlib.colors import to_rgb
+from mplsoccer import VerticalPitch
+from utils.helper_utils import (
+    draw_pitch_template, multi_line_plot, pitch_template, plot_shot_zones, shot_map,
+    shot_map_all, zone_grid_lines, zone_stats
+)
+
+BG = '#141414'
+
+def _render(draw)-> np.ndarray:
+    fig, ax = plt.subplots(figsize=(8, 6), dpi=100)
+    fig.set_facecolor(BG)
+    draw(ax)
+    fig.canvas.draw()
+    image = np.asarray(fig.canvas.buffer_rgba())[..., :3].astype(int)
+    plt.close(fig)
+
+    return image
+
+def _draw_with_plot(ax):
+    VerticalPitch(
+        half=True, pitch_type='statsbomb', pitch_color=BG, goal_type='box', line_color='grey'
+    ).draw(ax=ax)
+
+    for i in [80 - 8.0*x for x in range(1, 10)]:
+        ax.plot([i, i], [45, 120], color='grey', ls='--', lw=0.75, zorder=1)
+
+    for j in [120 - 6.2*x for x in range(1, 10)]:
+        ax.plot([0, 80], [j, j], color='grey', ls='--', lw=0.75, zorder=1)
+
+    for (x0, y0), (x1, y1) in zone_grid_lines:
+        ax.plot([x0, x1], [y0, y1], ls='--', color='white', lw=0.75)
+
+def test_pitch_template_matches_drawing_with_plot():
+    expected = _render(_draw_with_plot)
+    drawn = _render(
+        lambda ax: draw_pitch_template(ax, pitch_template(BG, grid=True, zone_grid_col='white'))
+    )
+
+    assert np.abs(expected - drawn).max() <= 2
+
+@pytest.fixture
+def shots():
+    rng = np.random.default_rng(14)
+    n = 400
+
+    return pd.DataFrame({
+        'X': rng.uniform(0, 80, n),
+        'Y': rng.uniform(60, 120, n),
+        'xG': rng.beta(1.2, 9.0, n).astype(str),
+        'result': np.where(rng.random(n) < 0.15, 'Goal', 'SavedShot'),
+        'situation': rng.choice(['OpenPlay', 'SetPiece', 'Penalty'], n),
+    })
+
+def test_shot_map_all_matches_two_shot_maps(shots):
+    fig, (ax1, ax2) = plt.subplots(1, 2)
+
+    shot_map(ax1, shots, 'Shot', 'X', 'Y', 'grey', 'grey')
+    shot_map(ax1, shots, 'Goal', 'X', 'Y', '#034694', '#034694')
+    shot_map_all(ax2, shots, 'X', 'Y')
+
+    shot, goal = ax1.collections
+    (both,) = ax2.collections
+    plt.close(fig)
+
+    # The goals come last in the single scatter so they are drawn on top:
+    for getter in ('get_offsets', 'get_sizes'):
+        np.testing.assert_allclose(
+            getattr(both, getter)(),
+            np.concatenate([getattr(shot, getter)(), getattr(goal, getter)()])
+        )
+
+    n_shots = len(shot.get_offsets())
+    n_goals = len(shots) - n_shots
+    face = both.get_facecolor()
+
+    np.testing.assert_allclose(face[:n_shots], np.broadcast_to(shot.get_facecolor(), (n_shots, 4)))
+    np.testing.assert_allclose(face[n_shots:], np.broadcast_to(goal.get_facecolor(), (n_goals, 4)))
+    np.testing.assert_allclose(both.get_linewidths(), [1.25] * n_shots + [2.2] * n_goals)
+
+def test_shot_map_all_colors_by_category(shots):
+    fig, ax = plt.subplots()
+    style_map = {'OpenPlay': 'red', 'Penalty': {'color': 'blue', 'edge_col': 'white'}}
+
+    shot_map_all(
+        ax, shots, 'X', 'Y', category='situation', style_map=style_map,
+        goal_lw=1.0, shot_lw=1.0
+    )
+
+    (collection,) = ax.collections
+    plt.close(fig)
+
+    order = np.argsort((shots['result'] == 'Goal').to_numpy(), kind='stable')
+    situation = shots['situation'].to_numpy()[order]
+    expected = {
+        'OpenPlay': to_rgb('red'), 'SetPiece': to_rgb('grey'), 'Penalty': to_rgb('blue')
+    }
+
+    np.testing.assert_allclose(
+        collection.get_facecolor()[:, :3], [expected[s] for s in situation]
+    )
+    np.testing.assert_allclose(collection.get_edgecolor()[situation == 'Penalty', :3], 1.0)
+
+def test_plot_shot_zones_shades_one_collection(shots):
+    stats = zone_stats(shots)
+    fig, ax = plt.subplots()
+
+    plot_shot_zones(ax, BG, 'white', 'red', 'white', 'DejaVu Sans', stats)
+
+    (zones,) = [c for c in ax.collections if isinstance(c, PolyCollection)]
+    labels = [text.get_text() for text in ax.texts]
+    plt.close(fig)
+
+    pct = stats['pct'].to_numpy()
+
+    assert len(zones.get_paths()) == len(stats)
+    np.testing.assert_allclose(zones.get_facecolor()[:, 3], pct / pct.max())
+    assert labels == [f'{p:.0%}' for p in pct if p > 0.05]
+
+def test_multi_line_plot_matches_plot_calls():
+    rng = np.random.default_rng(14)
+    xs = [np.arange(10.0), np.arange(12.0)]
+    ys = [rng.uniform(size=10), rng.uniform(size=12)]
+
+    # Gaps leave one point alone and split the second series in three runs:
+    ys[0][1] = np.nan
+    ys[1][[4, 8]] = np.nan
+
+    fig, (ax1, ax2) = plt.subplots(1, 2)
+
+    for x, y in zip(xs, ys):
+        ax1.plot(x, y, color='red', lw=2)
+        ax1.scatter(x, y, s=100, color='red')
+
+    lines, points = multi_line_plot(ax2, xs, ys, 'red', BG)
+    plt.close(fig)
+
+    # The runs axis.plot draws, the lone first point of the first series
+    # only getting a marker:
+    expected = [(0, slice(2, 10)), (1, slice(0, 4)), (1, slice(5, 8)), (1, slice(9, 12))]
+
+    assert len(lines.get_segments()) == len(expected)
+
+    for segment, (i, run) in zip(lines.get_segments(), expected):
+        np.testing.assert_allclose(segment, ax1.lines[i].get_xydata()[run])
+
+    offsets = np.concatenate([np.column_stack([x, y]) for x, y in zip(xs, ys)])
+    np.testing.assert_allclose(points.get_offsets(), offsets[~np.isnan(offsets[:, 1])])
+    assert ax2.get_xlim() == ax1.get_xlim()
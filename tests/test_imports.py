@@ -0,0 +1,43 @@
+# Importing the required packages:
+import os
+import sys
+import subprocess
+import pytest
+
+from benchmarks.bench_import_time import MODULES, ROOT, import_time
+
+@pytest.mark.parametrize('module', MODULES)
+def test_modules_do_not_import_heavy_packages(module):
+    assert import_time(module)['heavy'] == []
+
+def test_helper_utils_reexports_the_compute_helpers():
+    from utils import helper_utils, shot_utils
+
+    for name in (
+        'convert_to_statsbomb', 'zone_areas', 'assign_shot_zones',
+        'assign_shot_zones_batch', 'zone_stats'
+    ):
+        assert getattr(helper_utils, name) is getattr(shot_utils, name)
+        assert name in helper_utils.__all__
+
+    # Private helpers stay private to shot_utils:
+    assert not [
+        name for name, value in vars(shot_utils).items()
+        if name.startswith('_') and not name.startswith('__')
+        and getattr(helper_utils, name, None) is value
+    ]
+
+def test_instrumentation_loads_profiling_and_tracing_when_used():
+    script = (
+        'import sys, utils.instrumentation_utils; '
+        "print([m for m in ('cProfile', 'tracemalloc', 'inspect', 'multiprocessing') "
+        'if m in sys.modules])'
+    )
+    # With the instrumentation off, as the environment would turn it on:
+    env = {key: value for key, value in os.environ.items() if not key.startswith('FOOTBALL_')}
+    proc = subprocess.run(
+        [sys.executable, '-c', script], cwd=ROOT, env=env, capture_output=True, text=True,
+        check=True
+    )
+
+    assert proc.stdout.strip() == '[]'
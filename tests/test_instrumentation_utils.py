@@ -0,0 +1,122 @@
+# Importing the required packages:
+import os
+import sys
+import glob
+import json
+import threading
+import subprocess
+import textwrap
+from utils.instrumentation_utils import collect_metrics, stage, write_prometheus
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+def test_nested_stages_are_recorded_with_their_path():
+    with collect_metrics() as records:
+        with stage('outer', rows=3):
+            with stage('inner') as record:
+                record['bytes'] = 10
+
+    assert [r['stage'] for r in records] == ['outer/inner', 'outer']
+    assert records[0]['bytes'] == 10
+    assert records[1]['rows'] == 3
+
+def test_memory_peaks_of_overlapping_threads_are_process_wide():
+    barrier = threading.Barrier(2)
+
+    def work():
+        with stage('thread_stage'):
+            barrier.wait()
+            data = bytearray(1 << 20)
+            barrier.wait()
+            del data
+
+    with collect_metrics(memory=True) as records:
+        with stage('alone'):
+            data = bytearray(1 << 20)
+            del data
+
+        threads = [threading.Thread(target=work) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    scopes = {r['stage']: r['peak_scope'] for r in records}
+    assert scopes['alone'] == 'stage'
+    assert [r['peak_scope'] for r in records if r['stage'] == 'thread_stage'] == ['process'] * 2
+
+def test_prometheus_labels(tmp_path):
+    path = os.path.join(tmp_path, 'metrics.prom')
+    write_prometheus([{'stage': 'a', 'seconds': 1.5}], path, labels={'pid': 7})
+
+    with open(path) as f:
+        text = f.read()
+
+    assert 'football_stage_seconds_total{stage="a",pid="7"} 1.5' in text
+
+def _run_pool(tmp_path, metrics: str, start_method: str):
+    module = os.path.join(tmp_path, 'pool_job.py')
+
+    with open(module, 'w') as f:
+        f.write(textwrap.dedent('''
+            import os
+            from utils.instrumentation_utils import stage
+
+            def job(i):
+                with stage('job', rows=i):
+                    return os.getpid()
+        '''))
+
+    script = textwrap.dedent(f'''
+        import sys
+        sys.path[:0] = [{ROOT!r}, {str(tmp_path)!r}]
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+        from utils.instrumentation_utils import stage
+        from pool_job import job
+
+        if __name__ == '__main__':
+            with stage('parent'):
+                context = multiprocessing.get_context({start_method!r})
+                with ProcessPoolExecutor(2, mp_context=context) as executor:
+                    print(sorted(set(executor.map(job, range(8)))))
+    ''')
+    env = {**os.environ, 'FOOTBALL_METRICS': metrics}
+    env.pop('FOOTBALL_METRICS_PARENT', None)
+
+    proc = subprocess.run(
+        [sys.executable, '-c', script], env=env, capture_output=True, text=True, check=True
+    )
+
+    return json.loads(proc.stdout)
+
+def test_pool_workers_write_their_prometheus_files(tmp_path):
+    for start_method in ('spawn', 'fork'):
+        folder = os.path.join(tmp_path, start_method)
+        os.makedirs(folder)
+        pids = _run_pool(folder, os.path.join(folder, 'metrics.prom'), start_method)
+
+        with open(os.path.join(folder, 'metrics.prom')) as f:
+            assert 'stage="parent"' in f.read()
+
+        jobs = 0
+        for pid in pids:
+            with open(os.path.join(folder, f'metrics.{pid}.prom')) as f:
+                text = f.read()
+
+            assert f'pid="{pid}"' in text
+            assert 'stage="parent"' not in text
+            jobs += int(text.split(f'football_stage_calls_total{{stage="job",pid="{pid}"}} ')[1].split()[0])
+
+        assert jobs == 8
+
+def test_pool_workers_append_to_the_jsonl_file(tmp_path):
+    path = os.path.join(tmp_path, 'metrics.jsonl')
+    _run_pool(tmp_path, path, 'spawn')
+
+    with open(path) as f:
+        records = [json.loads(line) for line in f]
+
+    assert sum(r['stage'] == 'job' for r in records) == 8
+    assert sum(r['stage'] == 'parent' for r in records) == 1
+    assert glob.glob(os.path.join(tmp_path, 'metrics.*.jsonl')) == []
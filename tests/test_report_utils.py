@@ -0,0 +1,100 @@
+# Importing the required packages:
+import os
+import sys
+import json
+import subprocess
+import numpy as np
+import pandas as pd
+import pytest
+
+matplotlib = pytest.importorskip('matplotlib')
+
+import matplotlib.pyplot as plt
+from utils import report_utils
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+def _shots(n=60, seed=0):
+    rng = np.random.default_rng(seed)
+
+    return pd.DataFrame({
+        'X': rng.uniform(0.7, 1.0, n),
+        'Y': rng.uniform(0.2, 0.8, n),
+        'xG': rng.uniform(0.01, 0.6, n),
+        'result': rng.choice(['Goal', 'SavedShot', 'MissedShots'], n),
+        'situation': rng.choice(['OpenPlay', 'Penalty'], n),
+    })
+
+def test_in_process_rendering_uses_agg_and_restores_the_backend(monkeypatch):
+    backends = []
+    monkeypatch.setattr(
+        report_utils, 'render_report',
+        lambda spec: backends.append(matplotlib.get_backend().lower()) or {'output': spec['output']}
+    )
+
+    plt.switch_backend('svg')
+
+    try:
+        results = report_utils.render_reports([{'output': 'a.png'}, {'output': 'b.png'}], workers=0)
+        assert matplotlib.get_backend().lower() == 'svg'
+    finally:
+        plt.switch_backend('Agg')
+
+    assert backends == ['agg', 'agg']
+    assert list(results['status']) == ['ok', 'ok']
+
+def _render_or_fail(job):
+    if job.get('fail'):
+        raise ValueError('bad job')
+
+    return {'output': job['output']}
+
+def test_run_jobs_reports_failed_jobs():
+    jobs = [
+        {'team': 'A', 'output': 'a.png'},
+        {'team': 'B', 'output': 'b.png', 'fail': True},
+    ]
+    ok, failed = report_utils.run_jobs(_render_or_fail, jobs, workers=0, keys=('team', 'output'))
+
+    assert ok['status'] == 'ok' and ok['error'] is None
+    assert (failed['team'], failed['output'], failed['status']) == ('B', 'b.png', 'failed')
+    assert failed['error'] == 'ValueError: bad job'
+    assert 'raise ValueError' in failed['traceback']
+    assert ok['pid'] == failed['pid'] == os.getpid()
+
+def test_render_reports_in_process_leaves_no_figures(tmp_path):
+    pytest.importorskip('mplsoccer')
+
+    specs = [
+        {'shots': _shots(), 'kind': kind, 'output': os.path.join(tmp_path, f'{kind}.png'), 'dpi': 30}
+        for kind in ('shot_map', 'zone_map')
+    ]
+    open_before = plt.get_fignums()
+
+    results = report_utils.render_reports(specs, workers=0)
+
+    assert list(results['status']) == ['ok', 'ok'], results['error'].tolist()
+    assert all(os.path.exists(spec['output']) for spec in specs)
+    assert plt.get_fignums() == open_before
+
+def test_command_line_renders_a_spec_file(tmp_path):
+    pytest.importorskip('mplsoccer')
+
+    shots = os.path.join(tmp_path, 'shots.csv')
+    _shots().to_csv(shots, index=False)
+
+    specs = os.path.join(tmp_path, 'specs.json')
+    output = os.path.join(tmp_path, 'report.png')
+
+    with open(specs, 'w') as f:
+        json.dump([{'shots': shots, 'output': output, 'dpi': 30}], f)
+
+    # Run from another folder, so the script has to find utils by itself:
+    proc = subprocess.run(
+        [sys.executable, os.path.join(ROOT, 'Code', 'shot_reports.py'), specs, '--workers', '1'],
+        cwd=tmp_path, capture_output=True, text=True
+    )
+
+    assert proc.returncode == 0, proc.stderr
+    assert ' ok ' in proc.stdout
+    assert os.path.exists(output)
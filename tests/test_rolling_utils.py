@@ -0,0 +1,64 @@
+# Importing the required packages:
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.rolling_utils import RollingXG
+
+@pytest.fixture
+def matches():
+    rng = np.random.default_rng(14)
+    teams = np.repeat(['Chelsea', 'Arsenal', 'Everton'], 60)
+    rounds = np.tile(np.arange(1, 61), 3)
+
+    df = pd.DataFrame({
+        'team': teams,
+        'Round': rounds,
+        'xG': rng.gamma(2.0, 0.7, len(teams)),
+        'xGA': rng.gamma(2.0, 0.6, len(teams)),
+    })
+
+    # A missing match only spoils the windows holding it, like in pandas:
+    df.loc[70, 'xGA'] = np.nan
+
+    # Shuffling the teams while keeping the order of every team's matches:
+    return df.sample(frac=1, random_state=3).sort_values(['Round'], kind='stable')
+
+@pytest.mark.parametrize('center', [True, False])
+def test_matches_pandas_rolling(matches, center):
+    engine = RollingXG(windows=(1, 4, 5, 10), center=center)
+    engine.extend(matches, team_col='team')
+
+    for team, group in matches.groupby('team'):
+        df = engine.series(team)
+
+        assert df['Round'].tolist() == group['Round'].tolist()
+
+        for metric in ('xG', 'xGA'):
+            for window in (1, 4, 5, 10):
+                expected = group[metric].rolling(window, center=center).mean()
+
+                np.testing.assert_allclose(
+                    df[f'roll_{metric}_{window}'], expected, rtol=1e-12, atol=1e-12
+                )
+
+def test_append_reports_final_values():
+    engine = RollingXG(windows=(3,), metrics=('xG',), center=True)
+
+    assert engine.append('Chelsea', xG=1.0) == []
+    assert engine.append('Chelsea', xG=2.0) == []
+
+    # The third match completes the window centred on the second one:
+    assert engine.append('Chelsea', xG=3.0) == [(1, 'xG', 3, 2.0)]
+    assert engine.series('Chelsea')['Round'].tolist() == [1, 2, 3]
+
+def test_long_series_does_not_drift():
+    values = np.random.default_rng(1).normal(1e6, 1.0, 20000)
+    engine = RollingXG(windows=(7,), metrics=('xG',), center=False)
+
+    for value in values:
+        engine.append('Chelsea', xG=value)
+
+    expected = pd.Series(values).rolling(7).mean()
+
+    np.testing.assert_allclose(engine.series('Chelsea')['roll_xG_7'], expected, rtol=1e-13)
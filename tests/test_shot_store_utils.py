@@ -0,0 +1,68 @@
+# Importing the required packages:
+import os
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip('pyarrow')
+
+from benchmarks.understat_fixtures import make_shots
+from utils.shot_store_utils import read_shots, write_shots
+from utils.understat_scraper_utils import normalize_shots
+
+@pytest.fixture(params=['strings', 'normalized'])
+def shots(request):
+    df = pd.DataFrame(make_shots(300))
+
+    # The scrapers give normalized shots, or plain strings with normalize=False:
+    return normalize_shots(df) if request.param == 'normalized' else df
+
+def sorted_ids(df: pd.DataFrame)-> list:
+    return sorted(int(i) for i in df['id'])
+
+def test_round_trip(shots, tmp_path):
+    assert write_shots(shots, str(tmp_path)) == len(shots)
+
+    df = read_shots(str(tmp_path))
+
+    assert sorted_ids(df) == sorted_ids(shots)
+    assert not [
+        name for _, _, files in os.walk(tmp_path) for name in files
+        if name.endswith('.tmp')
+    ]
+
+    df = df.sort_values('id').reset_index(drop=True)
+    expected = shots.assign(id=shots['id'].astype(int)).sort_values('id').reset_index(drop=True)
+
+    np.testing.assert_allclose(df['xG'], expected['xG'].astype(float), rtol=1e-6)
+    assert df['season'].astype(int).tolist() == expected['season'].astype(int).tolist()
+    assert (df['team'] == np.where(expected['h_a'] == 'h', expected['h_team'], expected['a_team'])).all()
+
+def test_writing_again_drops_stored_ids(shots, tmp_path):
+    write_shots(shots.iloc[:200], str(tmp_path))
+
+    # Rescraped shots replace the stored copies instead of doubling them:
+    updated = shots.iloc[100:].assign(xG='0.5')
+
+    assert write_shots(updated, str(tmp_path)) == 100
+
+    df = read_shots(str(tmp_path))
+
+    assert sorted_ids(df) == sorted_ids(shots)
+    assert (df.loc[df['id'].isin(updated['id'].astype(int)), 'xG'] == 0.5).all()
+
+def test_filters(shots, tmp_path):
+    write_shots(shots, str(tmp_path))
+
+    season = shots['season'].iloc[0]
+    df = read_shots(str(tmp_path), columns=['id', 'result'], filters={'season': season})
+
+    assert list(df.columns) == ['id', 'result']
+    assert sorted_ids(df) == sorted_ids(shots[shots['season'] == season])
+
+    teams = ['Arsenal', 'Chelsea']
+    df = read_shots(str(tmp_path), filters={'team': teams, 'result': 'Goal'})
+    team = np.where(shots['h_a'] == 'h', shots['h_team'], shots['a_team'])
+    expected = shots[np.isin(team, teams) & (shots['result'] == 'Goal')]
+
+    assert sorted_ids(df) == sorted_ids(expected)
@@ -0,0 +1,108 @@
+# Importing the required packages:
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.understat_fixtures import make_shot_frame
+from utils.shot_stream_utils import (
+    ShotAggregator, aggregate_shots, iter_shot_chunks, process_chunks, source_format
+)
+from utils.shot_utils import convert_to_statsbomb, zone_stats
+
+@pytest.fixture(scope='module')
+def shots():
+    return make_shot_frame(5000, n_players=60)
+
+@pytest.fixture(scope='module', params=['csv', 'jsonl', 'parquet'])
+def source(request, shots, tmp_path_factory):
+    path = tmp_path_factory.mktemp('shots') / f'shots.{request.param}'
+
+    if request.param == 'csv':
+        shots.to_csv(path, index=False)
+    elif request.param == 'jsonl':
+        shots.to_json(path, orient='records', lines=True, date_format='iso')
+    else:
+        pytest.importorskip('pyarrow')
+        shots.to_parquet(path, row_group_size=1000)
+
+    return str(path)
+
+def expected_zones(shots: pd.DataFrame)-> pd.DataFrame:
+    return zone_stats(convert_to_statsbomb(shots, 'X', 'Y'))
+
+def expected_players(shots: pd.DataFrame)-> pd.DataFrame:
+    grouped = shots.assign(
+        player=shots['player'].astype(str),
+        goals=(shots['result'] == 'Goal').astype(np.int64),
+        xG=shots['xG'].astype(float),
+    ).groupby(['player_id', 'player']).agg(
+        shots=('xG', 'size'), xG=('xG', 'sum'), goals=('goals', 'sum')
+    )
+
+    return grouped.reset_index().sort_values('player_id').reset_index(drop=True)
+
+def assert_zones_equal(zones: pd.DataFrame, expected: pd.DataFrame):
+    assert zones['zone_area'].tolist() == expected['zone_area'].tolist()
+    np.testing.assert_array_equal(zones['num_shots'], expected['num_shots'])
+    np.testing.assert_array_equal(zones['goals'], expected['goals'])
+    np.testing.assert_allclose(zones['xG'], expected['xG'], rtol=1e-5)
+
+def test_aggregate_shots_matches_zone_stats_and_groupby(shots, source):
+    result = aggregate_shots(source, chunksize=700)
+
+    assert result['shots'] == len(shots)
+    assert result['chunks'] >= 5
+    assert_zones_equal(result['zones'], expected_zones(shots))
+
+    players = result['groups']['player']
+    players = players.assign(player=players['player'].astype(str))
+    players = players.sort_values('player_id').reset_index(drop=True)
+    expected = expected_players(shots)
+
+    assert players['player'].tolist() == expected['player'].tolist()
+    np.testing.assert_array_equal(players['shots'], expected['shots'])
+    np.testing.assert_array_equal(players['goals'], expected['goals'])
+    np.testing.assert_allclose(players['xG'], expected['xG'], rtol=1e-5)
+
+def test_filters_and_predicate(shots, source):
+    kept = shots[(shots['season'] == 2020) & (shots['situation'] != 'Penalty')]
+
+    result = aggregate_shots(
+        source,
+        chunksize=700,
+        filters={'season': 2020},
+        predicate=lambda df: (df['situation'] != 'Penalty').to_numpy()
+    )
+
+    assert result['shots'] == len(kept)
+    assert_zones_equal(result['zones'], expected_zones(kept))
+
+def test_merge_matches_one_pass(shots):
+    halves = [shots.iloc[:2000], shots.iloc[2000:]]
+    aggregators = [
+        ShotAggregator().update(next(process_chunks([half.copy()])))
+        for half in halves
+    ]
+    merged = aggregators[0].merge(aggregators[1])
+    whole = ShotAggregator().update(next(process_chunks([shots.copy()])))
+
+    assert merged.shots == len(shots)
+    pd.testing.assert_frame_equal(merged.zones(), whole.zones(), check_exact=False)
+    pd.testing.assert_frame_equal(
+        merged.groups('player').sort_values('player_id').reset_index(drop=True),
+        whole.groups('player').sort_values('player_id').reset_index(drop=True),
+        check_exact=False
+    )
+
+    with pytest.raises(ValueError):
+        merged.merge(ShotAggregator(by={'team': ('h_team',)}))
+
+def test_chunks_and_formats(source):
+    chunks = list(iter_shot_chunks(source, chunksize=700, columns=['X', 'Y', 'xG']))
+
+    assert all(len(chunk) <= 700 for chunk in chunks)
+    assert all(list(chunk.columns) == ['X', 'Y', 'xG'] for chunk in chunks)
+    assert source_format(source + '.gz') == source_format(source)
+
+    with pytest.raises(ValueError):
+        source_format('shots.xlsx')
@@ -0,0 +1,116 @@
+# Importing the required packages:
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.shot_utils import (
+    assign_shot_zones, assign_shot_zones_batch, zone_areas, zone_bounds, zone_frame,
+    zone_stats
+)
+
+@pytest.fixture
+def coords():
+    rng = np.random.default_rng(14)
+    x = rng.uniform(0, 80, 5000).round(1)
+    y = rng.uniform(40, 120, 5000).round(1)
+
+    # Adding every zone corner so shots on shared boundaries are covered:
+    corners = np.array([
+        (zone[x_key], zone[y_key])
+        for zone in zone_areas.values()
+        for x_key in ('x_lower_bound', 'x_upper_bound')
+        for y_key in ('y_lower_bound', 'y_upper_bound')
+    ])
+
+    return np.concatenate([x, corners[:, 0]]), np.concatenate([y, corners[:, 1]])
+
+def test_assign_shot_zones_batch_matches_scalar(coords):
+    x, y = coords
+
+    expected = [assign_shot_zones(i, j) for i, j in zip(x, y)]
+
+    assert list(assign_shot_zones_batch(x, y)) == expected
+    assert list(assign_shot_zones_batch(pd.Series(x), pd.Series(y))) == expected
+
+def test_zone_bounds_are_built_once():
+    names, bounds = zone_bounds()
+
+    assert zone_bounds()[1] is bounds
+    assert names.tolist() == list(zone_areas) + [None]
+    assert bounds[-1].tolist() == [18.0, 62.0, 55.0, 85.8]
+
+    with pytest.raises(ValueError):
+        bounds[0, 0] = 1.0
+
+def test_assign_shot_zones_batch_outside_every_zone():
+    zones = assign_shot_zones_batch(np.array([40.0, -1.0]), np.array([10.0, 110.0]))
+
+    assert list(zones) == [None, None]
+
+def naive_zone_stats(shots: pd.DataFrame)-> pd.DataFrame:
+    """
+    Aggregating the shots of every zone with assign_shot_zones and groupby,
+    the way the notebooks used to
+    """
+    df = shots.assign(
+        zone_area=[assign_shot_zones(x, y) for x, y in zip(shots['X'], shots['Y'])],
+        goal=(shots['result'] == 'Goal').astype(int),
+        xG=shots['xG'].astype(float),
+    )
+    grouped = df.groupby('zone_area').agg(
+        num_shots=('xG', 'size'), xG=('xG', 'sum'), goals=('goal', 'sum')
+    )
+
+    return grouped.reindex(list(zone_areas)).fillna(0)
+
+@pytest.fixture
+def shots(coords):
+    x, y = coords
+    rng = np.random.default_rng(3)
+
+    return pd.DataFrame({
+        'X': x,
+        'Y': y,
+        'xG': rng.beta(1.2, 9.0, len(x)),
+        'result': np.where(rng.random(len(x)) < 0.12, 'Goal', 'MissedShots'),
+    })
+
+def test_zone_stats_matches_groupby(shots):
+    stats = zone_stats(shots)
+    expected = naive_zone_stats(shots)
+
+    assert stats['zone_area'].tolist() == list(zone_areas)
+    np.testing.assert_array_equal(stats['num_shots'], expected['num_shots'])
+    np.testing.assert_allclose(stats['xG'], expected['xG'])
+    np.testing.assert_array_equal(stats['goals'], expected['goals'])
+    np.testing.assert_allclose(
+        stats['pct'], expected['num_shots'] / expected['num_shots'].sum()
+    )
+    np.testing.assert_allclose(
+        stats['conversion'], expected['goals'] / expected['num_shots']
+    )
+
+def test_zone_stats_uses_zone_area_column(shots):
+    zoned = shots.assign(zone_area=assign_shot_zones_batch(shots['X'], shots['Y']))
+
+    # Moving the shots away shows the column is used instead of X-Y:
+    zoned[['X', 'Y']] = -1.0
+
+    pd.testing.assert_frame_equal(zone_stats(zoned), zone_stats(shots))
+
+def test_zone_frame_sums_batches(shots):
+    totals = [
+        zone_stats(shots.iloc[start:start + 2000])[['num_shots', 'xG', 'goals']].to_numpy()
+        for start in range(0, len(shots), 2000)
+    ]
+    num_shots, xg, goals = sum(totals).T
+
+    pd.testing.assert_frame_equal(
+        zone_frame(num_shots, xg, goals), zone_stats(shots), check_dtype=False
+    )
+
+def test_zone_stats_without_shots(shots):
+    stats = zone_stats(shots.iloc[:0])
+
+    assert (stats['num_shots'] == 0).all()
+    assert (stats['pct'] == 0).all()
@@ -0,0 +1,64 @@
+# Importing the required packages:
+import numpy as np
+import pytest
+from utils.spatial_index_utils import ShotIndex, regions
+
+def _shots(n=2000, seed=0, x_max=80.0):
+    rng = np.random.default_rng(seed)
+    return rng.uniform(0, x_max, n), rng.uniform(60, 120, n)
+
+def _brute_rect(x, y, x_lower, x_upper, y_lower, y_upper):
+    return np.flatnonzero((x >= x_lower) & (x <= x_upper) & (y >= y_lower) & (y <= y_upper))
+
+@pytest.mark.parametrize('cell_size', [1.0, 2.0, 7.5])
+def test_rect_matches_brute_force(cell_size):
+    x, y = _shots()
+    index = ShotIndex(x, y, cell_size)
+    rng = np.random.default_rng(1)
+
+    for _ in range(200):
+        x_lower, x_upper = np.sort(rng.uniform(-10, 90, 2))
+        y_lower, y_upper = np.sort(rng.uniform(50, 130, 2))
+
+        np.testing.assert_array_equal(
+            index.rect(x_lower, x_upper, y_lower, y_upper, sort=True),
+            _brute_rect(x, y, x_lower, x_upper, y_lower, y_upper)
+        )
+
+def test_radius_matches_brute_force():
+    x, y = _shots()
+    index = ShotIndex(x, y)
+
+    for cx, cy, r in [(40, 108, 12), (0, 60, 5), (-20, 90, 10), (40, 200, 30)]:
+        expected = np.flatnonzero((x - cx)**2 + (y - cy)**2 <= r * r)
+        np.testing.assert_array_equal(index.radius(cx, cy, r, sort=True), expected)
+
+def test_polygon_matches_rect_for_a_box():
+    x, y = _shots()
+    index = ShotIndex(x, y)
+    box = [(18, 102), (62, 102), (62, 120), (18, 120)]
+
+    np.testing.assert_array_equal(
+        index.polygon(box, sort=True), _brute_rect(x, y, 18, 62, 102, 120)
+    )
+
+def test_queries_outside_the_data_area_are_empty():
+    # Every shot has x <= 40, zone_2 lies at x >= 62:
+    x, y = _shots(x_max=40.0)
+    index = ShotIndex(x, y)
+
+    assert len(index.region('zone_2')) == 0
+    assert len(index.rect(75, 90, 60, 120)) == 0
+    assert len(index.rect(-30, -10, 60, 120)) == 0
+    assert len(index.rect(0, 40, 130, 140)) == 0
+    assert len(index.polygon([(75, 60), (90, 60), (90, 120)])) == 0
+    assert len(index.radius(100, 90, 5)) == 0
+
+def test_regions_match_brute_force():
+    x, y = _shots()
+    index = ShotIndex(x, y)
+
+    for name, bounds in regions().items():
+        np.testing.assert_array_equal(
+            index.region(name, sort=True), _brute_rect(x, y, *bounds)
+        )
@@ -0,0 +1,90 @@
+# Importing the required packages:
+import os
+import numpy as np
+import pandas as pd
+import pytest
+from utils.trendline_utils import match_number, prepare_trends, season_label, trend_series
+
+def _matches(teams=('A', 'B'), seasons=('20/21', '21/22'), rounds=38, seed=0):
+    rng = np.random.default_rng(seed)
+    rows = [
+        {'Team': team, 'Season': season, 'Round': f'Matchweek {r}',
+         'xG': rng.gamma(2, 0.7), 'xGA': rng.gamma(2, 0.7)}
+        for team in teams for season in seasons for r in range(1, rounds + 1)
+    ]
+
+    # Shuffled, like postponed games listed out of order:
+    return pd.DataFrame(rows).sample(frac=1, random_state=seed)
+
+def test_match_number_and_season_label():
+    assert match_number(pd.Series(['Matchweek 12', 'Matchweek 3'])).tolist() == [12, 3]
+    assert season_label('19/20') == '2019-20'
+    assert season_label('2020') == '2020'
+
+def test_prepare_trends_matches_a_rolling_mean_per_team():
+    data = _matches()
+    df = prepare_trends(data, window=5)
+
+    for team, team_df in df.groupby('Team'):
+        expected = data[data['Team'] == team].assign(Round=lambda d: match_number(d['Round']))
+        expected = expected.sort_values(['Season', 'Round'])
+        roll = expected['xG'].rolling(5, center=True).mean().to_numpy()
+
+        np.testing.assert_allclose(team_df['roll_xGF'].to_numpy(), roll)
+
+def test_trend_series_lays_seasons_end_to_end():
+    df = prepare_trends(_matches())
+    x, series, seasons = trend_series(df, ['roll_xGF'])
+
+    assert seasons == ['20/21', '21/22']
+    np.testing.assert_array_equal(x['A'], np.arange(1, 77))
+    np.testing.assert_array_equal(series['roll_xGF']['B'], df.loc[df['Team'] == 'B', 'roll_xGF'])
+
+def test_render_trends_in_process(tmp_path):
+    matplotlib = pytest.importorskip('matplotlib')
+    pytest.importorskip('highlight_text')
+
+    import matplotlib.pyplot as plt
+    from utils.trendline_utils import render_trends
+
+    before = matplotlib.get_backend()
+    results = render_trends(_matches(), output_dir=str(tmp_path), workers=0, dpi=20)
+
+    assert list(results['status']) == ['ok', 'ok'], results['error'].tolist()
+    assert all(os.path.exists(path) for path in results['output'])
+    assert matplotlib.get_backend() == before
+    assert plt.get_fignums() == []
+
+def test_plot_trend_grid_draws_one_collection_per_colour():
+    pytest.importorskip('matplotlib')
+    pytest.importorskip('highlight_text')
+
+    import matplotlib.pyplot as plt
+    from matplotlib.collections import LineCollection, PathCollection
+    from utils.trendline_utils import plot_trend_grid, trend_style
+
+    df = prepare_trends(_matches(teams=('A', 'B', 'C', 'D')))
+    fig = plot_trend_grid(df, trend_style(df), ncols=3)
+    axes = [ax for ax in fig.axes if ax.get_visible()]
+
+    try:
+        assert [ax.get_title() for ax in axes] == ['A', 'B', 'C', 'D']
+
+        for ax in axes:
+            lines = [c for c in ax.collections if isinstance(c, LineCollection)]
+            points = [c for c in ax.collections if isinstance(c, PathCollection)]
+
+            # The league behind the team, then the for and against lines:
+            assert len(lines) == 3
+            assert len(points) == 2
+            team = df[df['Team'] == ax.get_title()]
+            assert len(points[0].get_offsets()) == team['roll_xGF'].notna().sum()
+
+        # The rolling averages run across seasons, so each of the other three
+        # teams adds one line per column:
+        assert len(lines[0].get_segments()) == 3 * 2
+    finally:
+        plt.close(fig)
+
+    with pytest.raises(ValueError):
+        plot_trend_grid(df, trend_style(df), teams=['Z'])
@@ -0,0 +1,417 @@
+# Importing the required packages:
+import os
+import json
+import time
+import threading
+import numpy as np
+import pandas as pd
+import pytest
+import requests
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from benchmarks.understat_fixtures import encode_dataset, make_player_page, make_shots
+from utils.cache_utils import write_cache
+from utils.understat_scraper_utils import (
+    SHOT_DTYPES, _RateLimiter, dataset_frames, extract_dataset, extract_datasets,
+    fetch_page, normalize_shots, page_url, parse_shots, read_refresh_state,
+    refresh_shots, scrape_page, scrape_shots_many, write_refresh_state
+)
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'benchmarks', 'fixtures')
+
+class FakeResponse:
+    def __init__(self, status_code: int, content: bytes = b'', headers: dict = None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        pass
+
+class FakeSession:
+    """
+    Session serving a fixed player page, answering 304 when the request
+    carries the ETag of the page
+    """
+    def __init__(self, shots: list, etag: str = '"v1"'):
+        self.serve(shots, etag)
+        self.requests = []
+
+    def serve(self, shots: list, etag: str):
+        self.content = make_player_page(shots).encode('utf-8')
+        self.etag = etag
+
+    def get(self, url, timeout=None, headers=None):
+        self.requests.append(headers or {})
+
+        if (headers or {}).get('If-None-Match') == self.etag:
+            return FakeResponse(304)
+
+        return FakeResponse(200, self.content, {'ETag': self.etag})
+
+@pytest.fixture
+def shots():
+    return make_shots(30, player_id=5220)
+
+def refresh(session, tmp_path, known=None):
+    return refresh_shots(
+        '5220', known=known, session=session, cache_dir=None,
+        state_dir=str(tmp_path), normalize=False
+    )
+
+def test_fetch_page_reads_through_the_cache(shots, tmp_path):
+    session = FakeSession(shots)
+    url = 'https://understat.test/player/5220'
+
+    assert fetch_page(url, session=session, cache_dir=str(tmp_path)) == session.content
+    assert fetch_page(url, session=session, cache_dir=str(tmp_path)) == session.content
+    assert len(session.requests) == 1
+
+    fetch_page(url, session=session, cache_dir=str(tmp_path), refresh=True)
+    fetch_page(url, session=session, cache_dir=None)
+    assert len(session.requests) == 3
+
+def test_first_refresh_returns_every_shot(shots, tmp_path):
+    new, merged = refresh(FakeSession(shots), tmp_path)
+
+    assert len(new) == len(merged) == len(shots)
+
+    state = read_refresh_state('5220', str(tmp_path))
+    assert state['ids'] == sorted(int(shot['id']) for shot in shots)
+    assert state['last_id'] == max(state['ids'])
+    assert state['etag'] == '"v1"'
+
+def test_late_shot_with_lower_id_is_new(shots, tmp_path):
+    late = shots.pop(3)
+    session = FakeSession(shots)
+    refresh(session, tmp_path)
+
+    session.serve(shots + [late], '"v2"')
+    new, merged = refresh(session, tmp_path)
+
+    assert new['id'].tolist() == [late['id']]
+    assert len(merged) == len(shots) + 1
+
+def test_late_shot_with_lower_id_is_new_against_known(shots, tmp_path):
+    late = shots.pop(3)
+    session = FakeSession(shots)
+    _, known = refresh(session, tmp_path)
+
+    session.serve(shots + [late], '"v2"')
+    new, merged = refresh(session, tmp_path, known=known)
+
+    assert new['id'].tolist() == [late['id']]
+    assert sorted(merged['id']) == sorted(shot['id'] for shot in shots + [late])
+
+def test_unchanged_page_is_not_downloaded(shots, tmp_path):
+    session = FakeSession(shots)
+    _, known = refresh(session, tmp_path)
+
+    new, merged = refresh(session, tmp_path, known=known)
+
+    assert session.requests[-1].get('If-None-Match') == '"v1"'
+    assert len(new) == 0
+    assert len(merged) == len(shots)
+
+def test_known_missing_state_shots_is_not_conditional(shots, tmp_path):
+    session = FakeSession(shots)
+    _, known = refresh(session, tmp_path)
+
+    new, _ = refresh(session, tmp_path, known=known.iloc[5:])
+
+    assert 'If-None-Match' not in session.requests[-1]
+    assert len(new) == 5
+
+def test_state_without_ids_counts_every_shot_as_new(shots, tmp_path):
+    write_refresh_state('5220', {'player_id': '5220', 'last_id': 10**9}, str(tmp_path))
+    new, _ = refresh(FakeSession(shots), tmp_path)
+
+    assert len(new) == len(shots)
+
+def test_page_without_shots(shots, tmp_path):
+    session = FakeSession([])
+
+    new, merged = refresh(session, tmp_path)
+    assert len(new) == len(merged) == 0
+
+    session.serve(shots, '"v2"')
+    _, known = refresh(session, tmp_path)
+
+    # The shots held are kept when the page is emptied:
+    session.serve([], '"v3"')
+    new, merged = refresh(session, tmp_path, known=known)
+
+    assert len(new) == 0
+    assert len(merged) == len(shots)
+
+def test_cached_pages_take_no_rate_slot(tmp_path, monkeypatch):
+    base_url = 'https://understat.test/player/'
+    cache_dir = str(tmp_path / 'cache')
+    pages = {
+        base_url + str(player): make_player_page(make_shots(5, player_id=player))
+        for player in (1, 2, 3)
+    }
+
+    for player in (1, 2):
+        url = base_url + str(player)
+        write_cache(url, pages[url].encode('utf-8'), cache_dir)
+
+    waits = []
+    monkeypatch.setattr(_RateLimiter, 'wait', lambda self: waits.append(1))
+    monkeypatch.setattr(
+        requests.Session, 'request',
+        lambda self, method, url, **kwargs: FakeResponse(200, pages[url].encode('utf-8'))
+    )
+
+    df, errors = scrape_shots_many(
+        [1, 2, 3], rate_limit=1000, base_url=base_url, cache_dir=cache_dir,
+        ttl=None, normalize=False
+    )
+
+    assert len(errors) == 0
+    assert len(df) == 15
+    assert len(waits) == 1
+
+def test_parse_shots_matches_bs4(shots):
+    pytest.importorskip('bs4')
+    pytest.importorskip('lxml')
+
+    content = make_player_page(shots).encode('utf-8')
+    fast = parse_shots(content)
+
+    pd.testing.assert_frame_equal(fast, parse_shots(content, parser='bs4'))
+    assert fast['id'].tolist() == [shot['id'] for shot in shots]
+    assert extract_dataset(content, 'matchesData') == []
+    assert extract_dataset(content, 'rostersData') is None
+
+def test_parse_shots_falls_back_to_bs4(shots):
+    pytest.importorskip('bs4')
+    pytest.importorskip('lxml')
+
+    # Renaming the variable so only its position on the page is left:
+    content = make_player_page(shots).replace('shotsData', 'shotData').encode('utf-8')
+
+    assert parse_shots(content)['id'].tolist() == [shot['id'] for shot in shots]
+
+    with pytest.raises(ValueError):
+        parse_shots(content, parser='dom')
+
+def test_normalize_shots(shots):
+    data = pd.DataFrame(shots)
+    df = normalize_shots(data)
+
+    for col, dtype in SHOT_DTYPES.items():
+        assert df[col].dtype == dtype, col
+
+    np.testing.assert_allclose(df['xG'], pd.to_numeric(data['xG']), rtol=1e-6)
+    assert df['id'].tolist() == pd.to_numeric(data['id']).tolist()
+    assert df['result'].astype(str).tolist() == data['result'].tolist()
+    assert df['date'].tolist() == pd.to_datetime(data['date']).tolist()
+
+    # The input is left as it was and normalizing twice changes nothing:
+    assert data['xG'].tolist() == [shot['xG'] for shot in shots]
+    assert df.attrs['memory']['after'] < df.attrs['memory']['before']
+    pd.testing.assert_frame_equal(normalize_shots(df), df)
+
+def dataset_page(datasets: dict)-> str:
+    scripts = ''.join(
+        f"<script>\n\tvar {name} = JSON.parse('{encode_dataset(value)}');\n</script>\n"
+        for name, value in datasets.items()
+    )
+
+    return f'<html><body>{scripts}</body></html>'
+
+@pytest.fixture
+def datasets(shots):
+    return {
+        'shotsData': shots,
+        'matchesData': [
+            {'id': str(i), 'goals': {'h': str(i % 3), 'a': '1'}, 'datetime': '2021-08-14 15:00:00'}
+            for i in range(4)
+        ],
+        'groupsData': {
+            'season': [{'season': '2021', 'goals': '20'}, {'season': '2020', 'goals': '23'}],
+            'position': {
+                '2021': {
+                    'FW': {'goals': '18', 'shots': '100'},
+                    'Sub': {'goals': '2', 'shots': '9'},
+                },
+            },
+        },
+        'teamsData': {
+            '88': {'id': '88', 'title': 'Manchester City', 'history': [
+                {'xG': 1.5, 'result': 'w', 'date': '2021-08-14 15:00:00'},
+                {'xG': 0.7, 'result': 'l', 'date': '2021-08-21 15:00:00'},
+            ]},
+        },
+    }
+
+def test_extract_datasets_matches_extract_dataset(datasets):
+    content = dataset_page(datasets).encode('utf-8')
+    data = extract_datasets(content)
+
+    assert list(data) == list(datasets)
+
+    for name in datasets:
+        expected = json.loads(json.dumps(datasets[name]))
+        assert data[name] == extract_dataset(content, name) == expected
+
+    assert list(extract_datasets(content, ['teamsData', 'missing'])) == ['teamsData']
+
+def test_dataset_frames(datasets):
+    frames = dataset_frames(extract_datasets(dataset_page(datasets)))
+
+    assert set(frames) == {
+        'shotsData', 'matchesData', 'groupsData.season', 'groupsData.position', 'teamsData'
+    }
+    pd.testing.assert_frame_equal(
+        frames['shotsData'], normalize_shots(pd.DataFrame(datasets['shotsData']))
+    )
+
+    matches = frames['matchesData']
+    assert matches['goals_h'].tolist() == [0, 1, 2, 0]
+    assert matches['datetime'].dtype.kind == 'M'
+
+    position = frames['groupsData.position']
+    assert position[['season', 'position', 'goals']].values.tolist() == [
+        [2021, 'FW', 18], [2021, 'Sub', 2]
+    ]
+
+    # One row per match of the team, with the team fields repeated:
+    teams = frames['teamsData']
+    assert teams['title'].tolist() == ['Manchester City'] * 2
+    assert teams['xG'].tolist() == [1.5, 0.7]
+
+    raw = dataset_frames(extract_datasets(dataset_page(datasets)), typed=False)
+    assert raw['matchesData']['goals_h'].tolist() == ['0', '1', '2', '0']
+
+def test_scrape_page(datasets, tmp_path):
+    url = page_url('team', 'Manchester City', 2021)
+    session = FakeSession([])
+    session.content = dataset_page(datasets).encode('utf-8')
+
+    assert url == 'https://understat.com/team/Manchester_City/2021'
+
+    frames = scrape_page(
+        'team', 'Manchester City', 2021, names=['teamsData'], session=session,
+        cache_dir=str(tmp_path)
+    )
+
+    assert list(frames) == ['teamsData']
+
+    with pytest.raises(ValueError):
+        page_url('club', 'Chelsea')
+
+def test_scrape_shots_many_retries_and_reports_errors(monkeypatch):
+    base_url = 'https://understat.test/player/'
+    pages = {
+        base_url + str(player): make_player_page(make_shots(3, player_id=player))
+        for player in (1, 2, 3)
+    }
+    calls = {}
+
+    def request(self, method, url, **kwargs):
+        calls[url] = calls.get(url, 0) + 1
+
+        # Player 2 fails once with a server error, player 3 is not found:
+        if (url.endswith('/2') and calls[url] == 1) or url.endswith('/3'):
+            res = requests.Response()
+            res.status_code = 503 if url.endswith('/2') else 404
+            res.url = url
+            return res
+
+        return FakeResponse(200, pages[url].encode('utf-8'))
+
+    monkeypatch.setattr(requests.Session, 'request', request)
+
+    df, errors = scrape_shots_many(
+        [2, 1, 3, 1], base_url=base_url, cache_dir=None, backoff=0, normalize=False
+    )
+
+    # Repeated ids are scraped once and the shots keep the order given:
+    assert df['player_id'].drop_duplicates().tolist() == ['2', '1']
+    assert calls[base_url + '2'] == 2
+    assert calls[base_url + '1'] == 1
+
+    # A 404 is not retried:
+    assert errors['player_id'].tolist() == ['3']
+    assert errors['attempts'].tolist() == [1]
+    assert 'HTTPError' in errors['error'].iloc[0]
+
+def fixture_page(player_id: str)-> bytes:
+    with open(os.path.join(FIXTURE_DIR, f'player_{player_id}.html'), 'rb') as f:
+        return f.read()
+
+@pytest.fixture
+def understat_server():
+    """
+    Local server holding the saved player pages. /player/flaky fails once
+    with a server error and then serves player_100, /player/slow answers
+    after a second
+    """
+    calls = {}
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            name = self.path.rsplit('/', 1)[-1]
+
+            with lock:
+                calls[name] = calls.get(name, 0) + 1
+                n_calls = calls[name]
+
+            if name == 'slow':
+                time.sleep(1.0)
+            if name == 'flaky' and n_calls == 1:
+                self.send_error(500)
+                return
+
+            try:
+                content = fixture_page('100' if name in ('flaky', 'slow') else name)
+            except FileNotFoundError:
+                self.send_error(404)
+                return
+
+            try:
+                self.send_response(200)
+                self.send_header('Content-Length', str(len(content)))
+                self.end_headers()
+                self.wfile.write(content)
+            except ConnectionError:
+                # The client gave up on the slow page:
+                pass
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    yield f'http://127.0.0.1:{server.server_address[1]}/player/', calls
+
+    server.shutdown()
+    server.server_close()
+
+def test_scrape_shots_many_against_a_local_server(understat_server):
+    base_url, calls = understat_server
+
+    df, errors = scrape_shots_many(
+        ['1000', 'flaky', 'slow', '100'], max_workers=4, timeout=0.3, retries=1,
+        backoff=0, base_url=base_url, cache_dir=None, normalize=False
+    )
+
+    # The shots of every page that answered, in the order of the ids given:
+    expected = pd.concat(
+        [parse_shots(fixture_page(page)) for page in ('1000', '100', '100')],
+        ignore_index=True
+    )
+    assert df['id'].tolist() == expected['id'].tolist()
+    assert len(df) == 1200
+
+    # The server error is retried once, the timeout on every attempt:
+    assert calls == {'1000': 1, 'flaky': 2, 'slow': 2, '100': 1}
+    assert errors['player_id'].tolist() == ['slow']
+    assert errors['attempts'].tolist() == [2]
+    assert 'Timeout' in errors['error'].iloc[0]
@@ -0,0 +1,99 @@
+# Importing the required packages:
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip('sklearn')
+pytest.importorskip('joblib')
+
+from sklearn.linear_model import LogisticRegression
+from benchmarks.understat_fixtures import make_shots
+from utils.understat_scraper_utils import normalize_shots
+from utils.xg_model_utils import (
+    CATEGORY_LEVELS, NUMERIC_FEATURES, XGModel, calibration_report,
+    feature_names, predict_xg, shot_features, train_xg_model
+)
+
+@pytest.fixture(scope='module')
+def shots():
+    return normalize_shots(pd.DataFrame(make_shots(4000)))
+
+@pytest.fixture(scope='module')
+def model(shots):
+    return train_xg_model(shots, path=None)
+
+def test_shot_features(shots):
+    features = shot_features(shots)
+
+    assert features.shape == (len(shots), len(feature_names()))
+    assert features.dtype == np.float32
+
+    # Distance to the goal centre on the Statsbomb pitch:
+    x = shots['X'].to_numpy(dtype=float) * 120
+    y = shots['Y'].to_numpy(dtype=float) * 80
+    np.testing.assert_allclose(features[:, 0], np.hypot(120 - x, y - 40), rtol=1e-5)
+
+    # One level, or Other, set for every categorical column:
+    offset = len(NUMERIC_FEATURES)
+
+    for col, levels in CATEGORY_LEVELS.items():
+        block = features[:, offset:offset + len(levels) + 1]
+        expected = [
+            levels.index(v) if v in levels else len(levels)
+            for v in shots[col].astype(str)
+        ]
+
+        assert (block.sum(axis=1) == 1).all()
+        assert block.argmax(axis=1).tolist() == expected
+        offset += len(levels) + 1
+
+def test_folded_weights_match_logistic_regression(shots, model):
+    features = shot_features(shots).astype(np.float64)
+    goals = (shots['result'] == 'Goal').to_numpy()
+
+    scaled = (features - model.mean) / model.scale
+    expected = LogisticRegression(C=model.C, max_iter=1000).fit(scaled, goals)
+
+    np.testing.assert_allclose(
+        features @ model.coef + model.intercept,
+        expected.decision_function(scaled),
+        rtol=1e-4, atol=1e-4
+    )
+
+def test_calibrated_scores(shots, model):
+    features = shot_features(shots)
+    xg = model.score(features)
+    raw = features @ model.coef + model.intercept
+
+    assert xg.dtype == np.float32
+    assert ((xg >= 0) & (xg <= 1)).all()
+
+    # The calibration keeps the order of the raw scores:
+    order = np.argsort(raw)
+    assert (np.diff(xg[order]) >= 0).all()
+
+def test_predict_xg_in_chunks(shots, model):
+    np.testing.assert_array_equal(
+        predict_xg(shots, model, chunk_size=333), model.score(shot_features(shots))
+    )
+
+def test_save_and_load(model, tmp_path, monkeypatch):
+    path = model.save(str(tmp_path / 'model.joblib'))
+    loaded = XGModel.load(path)
+
+    np.testing.assert_array_equal(loaded.coef, model.coef)
+
+    with pytest.raises(FileNotFoundError):
+        XGModel.load(str(tmp_path / 'missing.joblib'))
+
+    monkeypatch.setitem(CATEGORY_LEVELS, 'situation', ['OpenPlay'])
+
+    with pytest.raises(ValueError):
+        XGModel.load(path)
+
+def test_calibration_report(shots, model):
+    table, summary = calibration_report(shots, model)
+
+    assert summary['source'].tolist() == ['model', 'understat']
+    assert (summary['goals'] == (shots['result'] == 'Goal').sum()).all()
+    assert table.groupby('source')['shots'].sum().tolist() == [len(shots)] * 2
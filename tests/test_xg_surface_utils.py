@@ -0,0 +1,90 @@
+# Importing the required packages:
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.understat_fixtures import make_shots
+from utils.understat_scraper_utils import normalize_shots
+from utils.xg_surface_utils import (
+    HALF_PITCH, XGSurface, surface_from_model, surface_from_shots
+)
+
+def plane(x, y, k):
+    # Bilinear interpolation is exact on a plane:
+    return 0.002 * x + 0.004 * y + 0.1 * k
+
+@pytest.fixture
+def surface():
+    xs = np.arange(0, 80.5, 0.5)
+    ys = np.arange(60, 120.5, 0.5)
+    gx, gy = np.meshgrid(xs, ys)
+    grids = np.stack([plane(gx, gy, k) for k in range(2)]).astype(np.float32)
+
+    return XGSurface(grids, ['RightFoot', 'Head'], 'shotType', 0.5)
+
+@pytest.fixture
+def points():
+    rng = np.random.default_rng(14)
+
+    return rng.uniform(0, 80, 2000), rng.uniform(60, 120, 2000), rng.integers(0, 2, 2000)
+
+def test_lookup_matches_direct_computation(surface, points):
+    x, y, k = points
+    keys = np.array(surface.keys)[k]
+
+    np.testing.assert_allclose(surface.lookup(x, y, keys), plane(x, y, k), atol=1e-5)
+    np.testing.assert_allclose(surface.lookup(x, y, 'Head'), plane(x, y, 1), atol=1e-5)
+    assert surface.lookup(80.0, 120.0, 'RightFoot') == pytest.approx(plane(80, 120, 0), abs=1e-5)
+
+def test_lookup_outside_and_unknown_keys(surface):
+    xg = surface.lookup([-1.0, 40.0, 40.0, np.nan], [100.0, 59.0, 100.0, 100.0], 'Head')
+
+    assert np.isnan(xg[[0, 1, 3]]).all()
+    assert not np.isnan(xg[2])
+
+    with pytest.raises(KeyError):
+        surface.lookup(40.0, 100.0, 'LeftFoot')
+
+    with pytest.raises(KeyError):
+        surface.lookup([40.0], [100.0], ['LeftFoot'])
+
+@pytest.mark.parametrize('memory_map', [True, False])
+def test_save_and_load(surface, points, tmp_path, memory_map):
+    path = surface.save(str(tmp_path / 'surface.npy'))
+    loaded = XGSurface.load(path, memory_map=memory_map)
+    x, y, _ = points
+
+    assert loaded.keys == surface.keys
+    assert loaded.extent == HALF_PITCH
+    np.testing.assert_array_equal(loaded.lookup(x, y, 'Head'), surface.lookup(x, y, 'Head'))
+
+def test_surface_from_model_matches_predict_xg():
+    pytest.importorskip('sklearn')
+    from utils.xg_model_utils import predict_xg, train_xg_model
+
+    model = train_xg_model(normalize_shots(pd.DataFrame(make_shots(3000))), path=None)
+    surface = surface_from_model(model, keys=['RightFoot', 'Head'], resolution=2.0)
+
+    # Scoring shots at grid points directly, with the model's coordinates:
+    x = np.array([0.0, 40.0, 36.0, 80.0])
+    y = np.array([60.0, 110.0, 118.0, 120.0])
+    shots = pd.DataFrame({
+        'X': y, 'Y': x, 'situation': 'OpenPlay', 'shotType': 'Head', 'lastAction': 'Pass'
+    })
+
+    np.testing.assert_allclose(
+        surface.lookup(x, y, 'Head'), predict_xg(shots, model, source='statsbomb'), atol=1e-6
+    )
+
+def test_surface_from_shots():
+    pytest.importorskip('scipy')
+
+    shots = normalize_shots(pd.DataFrame(make_shots(3000)))
+    surface = surface_from_shots(shots, resolution=2.0, sigma=4.0)
+
+    assert sorted(surface.keys) == sorted(shots['shotType'].astype(str).unique())
+
+    # Averaging shots that all have the same xG gives that xG everywhere:
+    flat = surface_from_shots(shots.assign(xG=0.25), resolution=2.0, sigma=4.0)
+
+    np.testing.assert_allclose(flat.grids, 0.25, rtol=1e-5)
@@ -0,0 +1,172 @@
+# Importing the required packages:
+import os
+import gzip
+import time
+import hashlib
+import tempfile
+
+# Default location and limits of the on-disk cache:
+CACHE_DIR = os.environ.get(
+    'UNDERSTAT_CACHE_DIR',
+    os.path.join(os.path.expanduser('~'), '.cache', 'football-analytics')
+)
+CACHE_TTL = 12 * 60 * 60
+CACHE_MAX_SIZE = 512 * 1024 * 1024
+
+def cache_path(
+    url: str,
+    cache_dir: str = CACHE_DIR
+)-> str:
+    """
+    Function to get the cache file of a url
+
+        Parameters:
+            url (str): Url of the cached page
+            cache_dir (str): Folder holding the cache files
+
+        Returns:
+            path (str): Path of the compressed cache file for the url
+    """
+    key = hashlib.sha256(url.encode('utf8')).hexdigest()
+
+    return os.path.join(cache_dir, key + '.gz')
+
+def read_cache(
+    url: str,
+    cache_dir: str = CACHE_DIR,
+    ttl: float = CACHE_TTL
+)-> bytes:
+    """
+    Function to read a page from the cache
+
+    The modified time of a cache file is when the page was fetched and is
+    used for the ttl, the access time is when it was last read and is used
+    for the LRU eviction.
+
+        Parameters:
+            url (str): Url of the cached page
+            cache_dir (str): Folder holding the cache files
+            ttl (float): Seconds a cached page stays valid, never expires if None
+
+        Returns:
+            content (bytes): Raw page content, None if the page is not cached
+            or has expired
+    """
+    path = cache_path(url, cache_dir)
+
+    try:
+        fetched = os.stat(path).st_mtime
+
+        if ttl is not None and time.time() - fetched > ttl:
+            return None
+
+        with gzip.open(path, 'rb') as f:
+            content = f.read()
+
+        # Marking the file as recently used for the LRU eviction:
+        os.utime(path, (time.time(), fetched))
+    except (OSError, EOFError):
+        return None
+
+    return content
+
+def write_cache(
+    url: str,
+    content: bytes,
+    cache_dir: str = CACHE_DIR,
+    max_size: int = CACHE_MAX_SIZE
+)-> str:
+    """
+    Function to write a page to the cache and evict old pages if the cache
+    grows past its maximum size
+
+        Parameters:
+            url (str): Url of the page
+            content (bytes): Raw page content
+            cache_dir (str): Folder holding the cache files
+            max_size (int): Maximum total size of the cache in bytes, no
+            limit if None
+
+        Returns:
+            path (str): Path of the written cache file
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    path = cache_path(url, cache_dir)
+
+    # Writing to a temporary file first so readers never see half a file:
+    fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+
+    try:
+        with os.fdopen(fd, 'wb') as raw, gzip.GzipFile(
+            fileobj=raw, mode='wb', compresslevel=6, mtime=0
+        ) as f:
+            f.write(content)
+
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    if max_size is not None:
+        evict_cache(cache_dir, max_size)
+
+    return path
+
+def evict_cache(
+    cache_dir: str = CACHE_DIR,
+    max_size: int = CACHE_MAX_SIZE
+)-> int:
+    """
+    Function to delete the least recently used pages until the cache fits
+    in its maximum size
+
+        Parameters:
+            cache_dir (str): Folder holding the cache files
+            max_size (int): Maximum total size of the cache in bytes
+
+        Returns:
+            removed (int): Number of pages deleted from the cache
+    """
+    entries = []
+
+    with os.scandir(cache_dir) as it:
+        for entry in it:
+            if entry.name.endswith('.gz'):
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_atime, stat.st_size, entry.path))
+
+    total = sum(size for _, size, _ in entries)
+    removed = 0
+
+    for _, size, path in sorted(entries):
+        if total <= max_size:
+            break
+
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+
+        total -= size
+        removed += 1
+
+    return removed
+
+def clear_cache(cache_dir: str = CACHE_DIR)-> int:
+    """
+    Function to delete every page in the cache
+
+        Parameters:
+            cache_dir (str): Folder holding the cache files
+
+        Returns:
+            removed (int): Number of pages deleted from the cache
+    """
+    if not os.path.isdir(cache_dir):
+        return 0
+
+    return evict_cache(cache_dir, max_size=-1)
@@ -0,0 +1,275 @@
+# Importing the required packages:
+import numpy as np
+import pandas as pd
+
+# Pitch coordinate systems as (length, width, y axis pointing down). Every
+# system has x along the length of the pitch in the attacking direction.
+# Understat shares the y direction of Statsbomb, as convert_to_statsbomb has
+# always assumed:
+PROVIDERS = {
+    'understat': (1.0, 1.0, True),
+    'statsbomb': (120.0, 80.0, True),
+    'opta': (100.0, 100.0, False),
+    'wyscout': (100.0, 100.0, True),
+    'metric': (105.0, 68.0, False),
+}
+
+def register_provider(
+    name: str,
+    length: float,
+    width: float,
+    y_down: bool = False
+):
+    """
+    Function to add a pitch coordinate system, e.g. a metric pitch of a
+    different size
+
+        Parameters:
+            name (str): Name of the coordinate system
+            length (float): Value of x at the end of the pitch
+            width (float): Value of y at the other side of the pitch
+            y_down (bool): Whether y grows from the top touchline down
+    """
+    PROVIDERS[name] = (float(length), float(width), bool(y_down))
+
+def _to_unit(provider: str)-> np.ndarray:
+    """
+    Function to get the matrix taking a provider's coordinates to the unit
+    pitch, x and y from 0 to 1 with y growing down
+
+        Parameters:
+            provider (str): Name of the coordinate system
+
+        Returns:
+            matrix (np.ndarray): 3x3 affine matrix
+    """
+    if provider not in PROVIDERS:
+        raise ValueError(
+            f'Unknown provider {provider!r}, expected one of {list(PROVIDERS)}'
+        )
+
+    length, width, y_down = PROVIDERS[provider]
+
+    if y_down:
+        return np.array([
+            [1 / length, 0, 0],
+            [0, 1 / width, 0],
+            [0, 0, 1],
+        ])
+
+    return np.array([
+        [1 / length, 0, 0],
+        [0, -1 / width, 1],
+        [0, 0, 1],
+    ])
+
+class CoordinateTransform:
+    """
+    Class holding an affine transform of pitch coordinates as one 3x3 matrix,
+    so that any chain of transforms is applied to the data in a single step
+
+        Parameters:
+            matrix (np.ndarray): 3x3 affine matrix, identity if None
+    """
+    def __init__(self, matrix: np.ndarray = None):
+        self.matrix = np.eye(3) if matrix is None else np.asarray(
+            matrix, dtype=float
+        )
+
+    @classmethod
+    def between(
+        cls,
+        source: str,
+        target: str,
+        vertical: bool = False
+    ):
+        """
+        Function to build the transform from one provider to another
+
+            Parameters:
+                source (str): Name of the coordinate system of the data
+                target (str): Name of the coordinate system wanted
+                vertical (bool): Swap x and y so the output can be drawn
+                straight on the axes of a VerticalPitch
+
+            Returns:
+                transform (CoordinateTransform): Composed transform
+        """
+        matrix = np.linalg.inv(_to_unit(target)) @ _to_unit(source)
+        transform = cls(matrix)
+
+        return transform.swap_axes() if vertical else transform
+
+    def then(self, other):
+        """
+        Function to chain a transform after this one
+
+            Parameters:
+                other (CoordinateTransform): Transform applied afterwards
+
+            Returns:
+                transform (CoordinateTransform): Composed transform
+        """
+        return CoordinateTransform(other.matrix @ self.matrix)
+
+    def swap_axes(self):
+        """
+        Function to chain a swap of x and y after this transform
+
+            Returns:
+                transform (CoordinateTransform): Composed transform
+        """
+        swap = np.array([
+            [0, 1, 0],
+            [1, 0, 0],
+            [0, 0, 1],
+        ])
+
+        return self.then(CoordinateTransform(swap))
+
+    def scale(self, sx: float, sy: float = None):
+        """
+        Function to chain a scaling of x and y after this transform
+
+            Parameters:
+                sx (float): Factor for x
+                sy (float): Factor for y, same as sx if None
+
+            Returns:
+                transform (CoordinateTransform): Composed transform
+        """
+        sy = sx if sy is None else sy
+
+        return self.then(CoordinateTransform(np.diag([sx, sy, 1.0])))
+
+    def shift(self, dx: float, dy: float):
+        """
+        Function to chain a translation of x and y after this transform
+
+            Parameters:
+                dx (float): Offset added to x
+                dy (float): Offset added to y
+
+            Returns:
+                transform (CoordinateTransform): Composed transform
+        """
+        matrix = np.eye(3)
+        matrix[:2, 2] = [dx, dy]
+
+        return self.then(CoordinateTransform(matrix))
+
+    def inverse(self):
+        """
+        Function to get the transform undoing this one
+
+            Returns:
+                transform (CoordinateTransform): Inverse transform
+        """
+        return CoordinateTransform(np.linalg.inv(self.matrix))
+
+    def apply(
+        self,
+        x: np.ndarray,
+        y: np.ndarray
+    )-> tuple:
+        """
+        Function to transform arrays of coordinates
+
+        Terms with a zero coefficient are skipped, so a plain rescale costs
+        one multiply per output value. Float inputs keep their precision.
+
+            Parameters:
+                x (np.ndarray): x coordinates (array or Series)
+                y (np.ndarray): y coordinates (array or Series)
+
+            Returns:
+                x_new (np.ndarray): Transformed x coordinates
+                y_new (np.ndarray): Transformed y coordinates
+        """
+        x = _as_float(x)
+        y = _as_float(y)
+        dtype = np.result_type(x.dtype, y.dtype)
+
+        out = []
+
+        for a, b, c in self.matrix[:2]:
+            # Dropping the float noise left by composing the matrices:
+            a, b, c = (0.0 if abs(v) < 1e-12 else v for v in (a, b, c))
+
+            if a and not b:
+                res = x * dtype.type(a)
+            elif b and not a:
+                res = y * dtype.type(b)
+            else:
+                res = x * dtype.type(a) + y * dtype.type(b)
+
+            if c:
+                res += dtype.type(c)
+
+            out.append(res)
+
+        return out[0], out[1]
+
+    def __repr__(self):
+        return f'CoordinateTransform(\n{np.round(self.matrix, 6)}\n)'
+
+def _as_float(values)-> np.ndarray:
+    """
+    Function to get coordinates as a float array without copying data that
+    is already float
+
+        Parameters:
+            values (np.ndarray): Coordinates (array, Series or strings)
+
+        Returns:
+            values (np.ndarray): Float array of the coordinates
+    """
+    if isinstance(values, pd.Series):
+        values = values.to_numpy()
+
+    values = np.asarray(values)
+
+    if values.dtype.kind != 'f':
+        values = pd.to_numeric(values).astype(float, copy=False)
+
+    return values
+
+def transform_coordinates(
+    data: pd.DataFrame,
+    x_cords: str,
+    y_cords: str,
+    source: str = 'understat',
+    target: str = 'statsbomb',
+    vertical: bool = False,
+    inplace: bool = False
+):
+    """
+    Function to convert the X-Y coordinates of a Dataframe between providers
+
+        Parameters:
+            data (pd.DataFrame): Dataframe containing X-Y data
+            x_cords (str): X coordinate column name
+            y_cords (str): Y coordinate column name
+            source (str): Coordinate system of the data
+            target (str): Coordinate system wanted
+            vertical (bool): Swap x and y so the output can be drawn straight
+            on the axes of a VerticalPitch
+            inplace (bool): Overwrite the two coordinate columns of data
+            instead of returning the new arrays
+
+        Returns:
+            data (pd.DataFrame): The same Dataframe with the new coordinates,
+            if inplace is True
+            x_new, y_new (tuple): Arrays of the new coordinates, if inplace
+            is False
+    """
+    transform = CoordinateTransform.between(source, target, vertical=vertical)
+    x_new, y_new = transform.apply(data[x_cords], data[y_cords])
+
+    if not inplace:
+        return x_new, y_new
+
+    data[x_cords] = x_new
+    data[y_cords] = y_new
+
+    return data
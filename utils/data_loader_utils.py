@@ -0,0 +1,222 @@
+# Importing the required packages:
+import os
+import json
+import shutil
+import hashlib
+import tempfile
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+# Name of the folder next to the workbooks holding the converted copies:
+CACHE_FOLDER = '.cache'
+
+# Version of the cached files, caches of another version are converted
+# again. Version 2 keeps the index of the sheet:
+CACHE_VERSION = 2
+
+def _file_hash(path: str)-> str:
+    """
+    Function to hash the content of a file
+
+        Parameters:
+            path (str): Path of the file
+
+        Returns:
+            digest (str): sha256 hex digest of the file
+    """
+    digest = hashlib.sha256()
+
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+
+    return digest.hexdigest()
+
+def excel_cache_path(
+    path: str,
+    sheet_name=0,
+    cache_dir: str = None
+)-> str:
+    """
+    Function to get the Arrow file caching a sheet of a workbook
+
+        Parameters:
+            path (str): Path of the Excel workbook
+            sheet_name (str or int): Sheet of the workbook
+            cache_dir (str): Folder of the cache, a .cache folder next to the
+            workbook if None
+
+        Returns:
+            cache_path (str): Path of the Arrow (Feather v2) file
+    """
+    if cache_dir is None:
+        cache_dir = os.path.join(os.path.dirname(os.path.abspath(path)), CACHE_FOLDER)
+
+    name = os.path.splitext(os.path.basename(path))[0]
+
+    return os.path.join(cache_dir, f'{name}.{sheet_name}.arrow')
+
+def _read_meta(meta_path: str)-> dict:
+    try:
+        with open(meta_path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def _write_atomic(path: str, write):
+    """
+    Function to write a file through a temporary file, so readers never see
+    half a file
+
+        Parameters:
+            path (str): Path of the file
+            write (callable): Function writing the content to a given path
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    os.close(fd)
+
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+def _json_writer(data: dict):
+    """
+    Function to build a writer of JSON data for _write_atomic
+
+        Parameters:
+            data (dict): Data to write
+
+        Returns:
+            write (callable): Function writing the data to a given path
+    """
+    def write(path):
+        with open(path, 'w') as f:
+            json.dump(data, f, indent=2)
+
+    return write
+
+def load_excel(
+    path: str,
+    sheet_name=0,
+    cache_dir: str = None,
+    memory_map: bool = True,
+    refresh: bool = False,
+    **read_kwargs
+)-> pd.DataFrame:
+    """
+    Function to load a sheet of an Excel workbook, converting it once to an
+    uncompressed Arrow file and reading that file on later loads. The Arrow
+    file skips the Excel parsing, the columns are still copied into pandas
+
+    The cache is keyed by the size, modified time and sha256 hash of the
+    workbook. A workbook whose modified time changed but whose content did
+    not keeps its cache, a workbook whose content changed is converted again.
+
+        Parameters:
+            path (str): Path of the Excel workbook
+            sheet_name (str or int): Sheet of the workbook
+            cache_dir (str): Folder of the cache, a .cache folder next to the
+            workbook if None
+            memory_map (bool): Memory-map the Arrow file while it is
+            converted to pandas, instead of reading it into memory first
+            refresh (bool): Convert the workbook again even if the cache is valid
+            **read_kwargs: Extra arguments passed to pd.read_excel
+
+        Returns:
+            df (pd.DataFrame): Dataframe of the sheet
+    """
+    cache_path = excel_cache_path(path, sheet_name, cache_dir)
+    meta_path = cache_path + '.json'
+
+    stat = os.stat(path)
+    meta = None if refresh else _read_meta(meta_path)
+    kwargs_key = json.loads(json.dumps(read_kwargs, default=str))
+    valid = False
+
+    if meta is not None and os.path.exists(cache_path) and (
+        meta.get('read_kwargs') == kwargs_key
+        and meta.get('version') == CACHE_VERSION
+    ):
+        if meta['size'] == stat.st_size and meta['mtime_ns'] == stat.st_mtime_ns:
+            valid = True
+        elif meta['size'] == stat.st_size and meta['sha256'] == _file_hash(path):
+            # Only the modified time changed, e.g. after a fresh checkout:
+            meta['mtime_ns'] = stat.st_mtime_ns
+            _write_atomic(meta_path, _json_writer(meta))
+            valid = True
+
+    if valid:
+        table = feather.read_table(cache_path, memory_map=memory_map)
+        return table.to_pandas()
+
+    df = pd.read_excel(path, sheet_name=sheet_name, **read_kwargs)
+
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+
+    # Keeping the index, e.g. from index_col, so a cached load returns the
+    # same Dataframe as the first one. Writing uncompressed so loads skip
+    # the decompression:
+    table = pa.Table.from_pandas(df, preserve_index=True)
+    _write_atomic(
+        cache_path,
+        lambda p: feather.write_feather(table, p, compression='uncompressed')
+    )
+
+    meta = {
+        'version': CACHE_VERSION,
+        'source': os.path.abspath(path),
+        'sheet_name': sheet_name,
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'sha256': _file_hash(path),
+        'read_kwargs': kwargs_key,
+        'schema': {field.name: str(field.type) for field in table.schema},
+    }
+    _write_atomic(meta_path, _json_writer(meta))
+
+    return df
+
+def invalidate_excel_cache(
+    path: str,
+    sheet_name=0,
+    cache_dir: str = None
+)-> int:
+    """
+    Function to delete cached copies so the workbooks are converted again on
+    their next load
+
+        Parameters:
+            path (str): Path of the Excel workbook, or of a data folder to
+            clear the whole cache of that folder
+            sheet_name (str or int): Sheet of the workbook, ignored for folders
+            cache_dir (str): Folder of the cache, a .cache folder next to the
+            workbook if None
+
+        Returns:
+            removed (int): Number of cached sheets deleted
+    """
+    if os.path.isdir(path):
+        folder = cache_dir or os.path.join(path, CACHE_FOLDER)
+
+        if not os.path.isdir(folder):
+            return 0
+
+        removed = len([f for f in os.listdir(folder) if f.endswith('.arrow')])
+        shutil.rmtree(folder)
+
+        return removed
+
+    cache_path = excel_cache_path(path, sheet_name, cache_dir)
+    removed = 0
+
+    for file in (cache_path, cache_path + '.json'):
+        if os.path.exists(file):
+            os.remove(file)
+            removed += file == cache_path
+
+    return removed
@@ -0,0 +1,484 @@
+# Importing the required packages:
+import io
+import os
+import time
+import threading
+import numpy as np
+from concurrent.futures import Future, ThreadPoolExecutor
+from utils.instrumentation_utils import stage
+
+# Output presets. long_edge sets the dpi so the longest side of the figure
+# gets that many pixels, whatever the size of the figure. The print preset
+# keeps text and pitch lines as vectors and rasterizes the dense layers at
+# its dpi:
+EXPORT_PRESETS = {
+    'social': {'format': 'png', 'long_edge': 2048, 'compress_level': 6},
+    'web': {'format': 'webp', 'long_edge': 1600, 'quality': 85},
+    'print': {'format': 'pdf', 'dpi': 300, 'rasterize': True},
+}
+
+# Export options, any of them can be given to export_figure on top of a
+# preset:
+EXPORT_DEFAULTS = {
+    'format': None,
+    'dpi': 100,
+    'long_edge': None,
+    'max_pixels': None,
+    'compress_level': 6,
+    'quality': 90,
+    'method': 4,
+    'lossless': False,
+    'rasterize': False,
+    'min_points': 500,
+    'facecolor': None,
+    'transparent': False,
+    'bbox_inches': 'tight',
+}
+
+# Formats encoded with Pillow in a background thread, and their Pillow name:
+RASTER_FORMATS = {'png': 'PNG', 'webp': 'WEBP', 'jpg': 'JPEG', 'jpeg': 'JPEG'}
+
+# Formats written by matplotlib itself:
+VECTOR_FORMATS = {'pdf', 'svg', 'eps', 'ps'}
+
+# Threads encoding the rendered images:
+ENCODER_THREADS = 2
+
+_encoder = None
+_encoder_lock = threading.Lock()
+
+def _encoder_pool()-> ThreadPoolExecutor:
+    global _encoder
+
+    with _encoder_lock:
+        if _encoder is None:
+            _encoder = ThreadPoolExecutor(ENCODER_THREADS, thread_name_prefix='export')
+
+        return _encoder
+
+# Linux files to reset and read the peak resident memory of the process:
+CLEAR_REFS = '/proc/self/clear_refs'
+PROC_STATUS = '/proc/self/status'
+
+# Exports measured with tracemalloc, which is stopped after the last one if
+# it was started for them:
+_tracing_exports = 0
+_tracing_started = False
+_tracing_lock = threading.Lock()
+
+def _read_hwm_mb()-> float:
+    """
+    Function to read the peak resident memory of the process on Linux
+
+        Returns:
+            peak (float): VmHWM in MB, None if it cannot be read
+    """
+    try:
+        with open(PROC_STATUS) as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    except (OSError, ValueError, IndexError):
+        pass
+
+    return None
+
+class _PeakMemory:
+    """
+    Class measuring the peak memory of one export, from before the figure is
+    drawn until the image is written
+
+    On Linux the peak resident memory of the process is reset to the current
+    resident memory by writing 5 to /proc/self/clear_refs and read back as
+    VmHWM. Elsewhere the peak of the Python allocations traced by tracemalloc
+    is used. Both are process wide, so exports running at the same time are
+    counted together
+    """
+    def __init__(self):
+        self.tracing = False
+
+    def start(self):
+        try:
+            with open(CLEAR_REFS, 'w') as f:
+                f.write('5')
+
+            if _read_hwm_mb() is not None:
+                return self
+        except OSError:
+            pass
+
+        global _tracing_exports, _tracing_started
+        import tracemalloc
+
+        with _tracing_lock:
+            if _tracing_exports == 0:
+                _tracing_started = not tracemalloc.is_tracing()
+
+                if _tracing_started:
+                    tracemalloc.start()
+
+            _tracing_exports += 1
+            tracemalloc.reset_peak()
+
+        self.tracing = True
+
+        return self
+
+    def stop(self)-> float:
+        """
+        Function to end the measurement
+
+            Returns:
+                peak (float): Peak memory in MB during the export
+        """
+        if not self.tracing:
+            return _read_hwm_mb()
+
+        global _tracing_exports
+        import tracemalloc
+
+        with _tracing_lock:
+            peak = tracemalloc.get_traced_memory()[1] / 1024**2
+            _tracing_exports -= 1
+
+            if _tracing_exports == 0 and _tracing_started:
+                tracemalloc.stop()
+
+        self.tracing = False
+
+        return peak
+
+def rasterize_dense(
+    fig,
+    min_points: int = 500
+)-> int:
+    """
+    Function to rasterize the dense layers of a figure, the scatters and
+    lines with many points, so vector outputs stay small and quick to write.
+    Text, the pitch markings and other small layers stay vectors
+
+        Parameters:
+            fig (plt.Figure): Figure to export
+            min_points (int): Number of points from which a layer is dense
+
+        Returns:
+            count (int): Number of layers rasterized
+    """
+    from matplotlib.collections import LineCollection, PathCollection
+
+    count = 0
+
+    for ax in fig.axes:
+        for artist in ax.collections:
+            if isinstance(artist, PathCollection):
+                n_points = len(artist.get_offsets())
+            elif isinstance(artist, LineCollection):
+                n_points = sum(len(segment) for segment in artist.get_segments())
+            else:
+                continue
+
+            if n_points >= min_points:
+                artist.set_rasterized(True)
+                count += 1
+
+        for line in ax.lines:
+            if len(line.get_xdata()) >= min_points:
+                line.set_rasterized(True)
+                count += 1
+
+    return count
+
+def export_options(
+    preset: str = None,
+    **options
+)-> dict:
+    """
+    Function to get the options of an export, the preset on top of
+    EXPORT_DEFAULTS and the options on top of the preset
+
+        Parameters:
+            preset (str): Name of a preset of EXPORT_PRESETS, None for the
+            defaults alone
+            **options: Any key of EXPORT_DEFAULTS
+
+        Returns:
+            options (dict): Options of the export
+    """
+    if preset is not None and preset not in EXPORT_PRESETS:
+        raise KeyError(f'Unknown preset {preset!r}, expected one of {list(EXPORT_PRESETS)}')
+
+    unknown = set(options) - set(EXPORT_DEFAULTS)
+    if unknown:
+        raise TypeError(f'Unknown export options {sorted(unknown)}')
+
+    return {**EXPORT_DEFAULTS, **EXPORT_PRESETS.get(preset, {}), **options}
+
+def export_dpi(
+    fig,
+    options: dict
+)-> float:
+    """
+    Function to get the dpi of an export from the size of the figure
+
+        Parameters:
+            fig (plt.Figure): Figure to export
+            options (dict): Options from export_options
+
+        Returns:
+            dpi (float): Resolution of the export
+    """
+    width, height = fig.get_size_inches()
+
+    if options['long_edge']:
+        dpi = options['long_edge'] / max(width, height)
+    else:
+        dpi = options['dpi']
+
+    # Lowering the dpi of huge figures so the image fits the pixel budget:
+    max_pixels = options['max_pixels']
+
+    if max_pixels and width * height * dpi**2 > max_pixels:
+        dpi = np.sqrt(max_pixels / (width * height))
+
+    return float(dpi)
+
+def _render(
+    fig,
+    dpi: float,
+    options: dict
+)-> tuple:
+    """
+    Function to draw a figure into a raw RGBA buffer
+
+        Parameters:
+            fig (plt.Figure): Figure to export
+            dpi (float): Resolution of the export
+            options (dict): Options from export_options
+
+        Returns:
+            pixels (memoryview): RGBA bytes of the image
+            size (tuple): Width and height of the image in pixels
+    """
+    # A tight bounding box changes the size of the image, the renderer of
+    # the last draw has the final one:
+    sizes = []
+    cid = fig.canvas.mpl_connect(
+        'draw_event',
+        lambda event: sizes.append((int(event.renderer.width), int(event.renderer.height)))
+    )
+
+    buffer = io.BytesIO()
+
+    try:
+        fig.savefig(
+            buffer,
+            format='rgba',
+            dpi=dpi,
+            facecolor=options['facecolor'] or 'auto',
+            transparent=options['transparent'],
+            bbox_inches=options['bbox_inches']
+        )
+    finally:
+        fig.canvas.mpl_disconnect(cid)
+
+    pixels = buffer.getbuffer()
+    width, height = sizes[-1]
+
+    if len(pixels) != width * height * 4:
+        raise RuntimeError(f'Rendered {len(pixels)} bytes for a {width}x{height} image')
+
+    return pixels, (width, height)
+
+def _encode(
+    pixels: memoryview,
+    size: tuple,
+    path: str,
+    fmt: str,
+    options: dict
+)-> dict:
+    """
+    Function to encode a rendered image with Pillow and write it to a file
+
+        Parameters:
+            pixels (memoryview): RGBA bytes of the image
+            size (tuple): Width and height of the image in pixels
+            path (str): Path of the image
+            fmt (str): Format of the image, a key of RASTER_FORMATS
+            options (dict): Options from export_options
+
+        Returns:
+            result (dict): Encoding time and size of the file
+    """
+    from PIL import Image
+
+    start = time.perf_counter()
+
+    with stage('export_encode', output=path, format=fmt) as record:
+        image = Image.frombuffer('RGBA', size, pixels, 'raw', 'RGBA', 0, 1)
+
+        # Dropping the alpha channel of opaque figures makes smaller files:
+        if fmt in ('jpg', 'jpeg') or not options['transparent']:
+            image = image.convert('RGB')
+
+        if fmt == 'png':
+            params = {'compress_level': options['compress_level']}
+        elif fmt == 'webp':
+            params = {
+                'quality': options['quality'],
+                'method': options['method'],
+                'lossless': options['lossless'],
+            }
+        else:
+            params = {'quality': options['quality']}
+
+        # Writing to a temporary file first, so a half written image is
+        # never left at the path:
+        tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+
+        try:
+            image.save(tmp_path, format=RASTER_FORMATS[fmt], **params)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        n_bytes = os.path.getsize(path)
+        record['bytes'] = n_bytes
+
+    return {'encode_s': time.perf_counter() - start, 'bytes': n_bytes}
+
+def export_figure(
+    fig,
+    path: str,
+    preset: str = None,
+    wait: bool = True,
+    **options
+):
+    """
+    Function to export a figure to an image file. The figure is drawn in
+    the calling thread and the image is encoded in a background thread, so
+    with wait=False the next figure can be drawn while this one is encoded.
+    The figure can be closed as soon as the function returns, the dense
+    layers rasterized for a vector output stay rasterized
+
+        Parameters:
+            fig (plt.Figure): Figure to export
+            path (str): Path of the image. With a preset its extension is
+            replaced by the format of the preset
+            preset (str): 'social', 'web' or 'print', see EXPORT_PRESETS
+            wait (bool): Wait for the image to be written, instead of
+            returning a Future of the result
+            **options: Any key of EXPORT_DEFAULTS, e.g. dpi, compress_level
+            or quality
+
+        Returns:
+            result (dict): Output path, format, dpi, size in pixels, render
+            and encode time, file size and peak memory in MB from drawing
+            the figure to writing the image (peak_memory_mb), or a Future of
+            it if wait is False
+    """
+    options = export_options(preset, **options)
+
+    fmt = options['format']
+
+    if fmt is None:
+        fmt = os.path.splitext(path)[1].lstrip('.').lower() or 'png'
+    elif preset is not None:
+        path = f'{os.path.splitext(path)[0]}.{fmt}'
+
+    if fmt not in RASTER_FORMATS and fmt not in VECTOR_FORMATS:
+        raise ValueError(
+            f'Unsupported format {fmt!r}, expected one of '
+            f'{sorted(RASTER_FORMATS) + sorted(VECTOR_FORMATS)}'
+        )
+
+    folder = os.path.dirname(path)
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+
+    start = time.perf_counter()
+    dpi = export_dpi(fig, options)
+    memory = _PeakMemory().start()
+
+    result = {
+        'output': path,
+        'format': fmt,
+        'dpi': dpi,
+        'width': None,
+        'height': None,
+        'rasterized': 0,
+    }
+
+    if fmt in VECTOR_FORMATS:
+        bbox_inches = options['bbox_inches']
+
+        if options['rasterize']:
+            # Working out the tight box before rasterizing, as savefig would
+            # otherwise rasterize the dense layers a second time to find it:
+            if bbox_inches == 'tight' and hasattr(fig.canvas, 'get_renderer'):
+                from matplotlib import rcParams
+
+                bbox_inches = fig.get_tightbbox(fig.canvas.get_renderer()).padded(
+                    rcParams['savefig.pad_inches']
+                )
+
+            result['rasterized'] = rasterize_dense(fig, options['min_points'])
+
+        try:
+            with stage('export_render', output=path, format=fmt):
+                fig.savefig(
+                    path,
+                    format=fmt,
+                    dpi=dpi,
+                    facecolor=options['facecolor'] or 'auto',
+                    transparent=options['transparent'],
+                    bbox_inches=bbox_inches
+                )
+        finally:
+            peak = memory.stop()
+
+        seconds = time.perf_counter() - start
+        result.update({
+            'render_s': seconds,
+            'encode_s': 0.0,
+            'seconds': seconds,
+            'bytes': os.path.getsize(path),
+            'peak_memory_mb': peak,
+        })
+
+        if wait:
+            return result
+
+        future = Future()
+        future.set_result(result)
+
+        return future
+
+    try:
+        with stage('export_render', output=path, format=fmt) as record:
+            pixels, size = _render(fig, dpi, options)
+            record['bytes'] = len(pixels)
+    except BaseException:
+        memory.stop()
+        raise
+
+    result.update({
+        'width': size[0],
+        'height': size[1],
+        'render_s': time.perf_counter() - start,
+    })
+
+    def encode():
+        try:
+            result.update(_encode(pixels, size, path, fmt, options))
+        finally:
+            result['peak_memory_mb'] = memory.stop()
+
+        result['seconds'] = time.perf_counter() - start
+
+        return result
+
+    future = _encoder_pool().submit(encode)
+
+    return future.result() if wait else future
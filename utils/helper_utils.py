@@ -1,51 +1,223 @@
 # Importing the required packages:
+from __future__ import annotations
+
 import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
-import matplotlib.patheffects as path_effects
-from mplsoccer import Pitch, VerticalPitch
-
-def convert_to_statsbomb(
-    data: pd.DataFrame,
-    x_cords: str,
-    y_cords: str
-)-> pd.DataFrame:
+from typing import TYPE_CHECKING
+from utils.instrumentation_utils import timed
+
+# The data and compute helpers live in shot_utils, which never loads
+# matplotlib. They are imported here too so existing imports keep working,
+# and listed in __all__ as part of this module's interface:
+from utils.shot_utils import (
+    convert_to_statsbomb,
+    zone_areas,
+    assign_shot_zones,
+    assign_shot_zones_batch,
+    zone_stats
+)
+
+__all__ = [
+    'convert_to_statsbomb',
+    'zone_areas',
+    'assign_shot_zones',
+    'assign_shot_zones_batch',
+    'zone_stats',
+    'zone_grid_lines',
+    'pitch_template',
+    'draw_pitch_template',
+    'statsbomb_pitch_vert',
+    'shot_map',
+    'shot_map_all',
+    'plot_shot_zones',
+    'multi_line_plot',
+    'line_plots',
+]
+
+# matplotlib and mplsoccer are only imported by the plotting functions that
+# use them, so importing this module stays cheap. The annotations only need
+# the names while type checking:
+if TYPE_CHECKING:
+    import matplotlib.pyplot as plt
+# Pitch backgrounds already drawn once, keyed by their look:
+_pitch_templates = {}
+
+# Grid lines splitting the pitch into the shot zones:
+zone_grid_lines = [
+    [(62.0, 40.0), (62.0, 102.0)],
+    [(18.0, 40.0), (18.0, 102.0)],
+    [(30.0, 102.0), (30.0, 114.0)],
+    [(50.0, 102.0), (50.0, 114.0)],
+    [(62.0, 102.0), (80.0, 102.0)],
+    [(18.0, 102.0), (0.0, 102.0)],
+    [(18.0, 85.8), (62.0, 85.8)],
+]
+
+def pitch_template(
+    bg: str,
+    line_color: str = 'grey',
+    grid: bool = False,
+    zone_grid_col: str = None,
+    pitch_type: str = 'statsbomb'
+)-> dict:
     """
-    Function to convert understat X and Y coordinate data to Statsbomb coordinates
+    Function to get the background of a vertical half pitch, drawn once with
+    mplsoccer and then reused as a handful of collections for every figure
 
         Parameters:
-            data (pd.DataFrame): Dataframe containing X-Y data 
-            x_cords (str): X coordinate column name
-            y_cords (str): Y coordinate column name
-        
+            bg (str): Background color
+            line_color (str): Color of the pitch markings
+            grid (bool): Whether the grid of statsbomb_pitch_vert is drawn
+            zone_grid_col (str): Color of the shot zone grid, no zone grid if None
+            pitch_type (str): mplsoccer pitch type
+
         Returns:
-            df (pd.DataFrame): Updated Dataframe with Statsbomb X-Y 
-            coordinates
-    
+            template (dict): Axes settings and the pitch markings as paths in
+            data coordinates, grouped by style
     """
-    df = data.copy()
+    key = (pitch_type, bg, line_color, grid, zone_grid_col)
 
-    # Convert X and Y coordinate values to numeric type:
-    df[x_cords] = pd.to_numeric(df[x_cords])
-    df[y_cords] = pd.to_numeric(df[y_cords])
+    if key in _pitch_templates:
+        return _pitch_templates[key]
 
-    # Rescaling the coordinates from 0-1 to 0-100:
-    df[x_cords] = df[x_cords] * 100
-    df[y_cords] = df[y_cords] * 100
+    from matplotlib.colors import to_rgba
+    from matplotlib.figure import Figure
+    from mplsoccer import VerticalPitch
 
-    df['xx'] = df[y_cords]
-    df['yy'] = df[x_cords]
+    # Drawing the pitch on a figure that is never shown:
+    fig = Figure()
+    ax = fig.add_subplot()
 
-    df[x_cords] = df['xx']
-    df[y_cords] = df['yy']
+    pitch = VerticalPitch(
+        half=True,
+        pitch_type= pitch_type,
+        pitch_color=bg,
+        goal_type='box',
+        line_color=line_color,
+    )
+
+    pitch.draw(ax = ax)
+
+    patches = {}
+    for patch in ax.patches:
+        group = patches.setdefault(patch.get_zorder(), {
+            'paths': [], 'facecolors': [], 'edgecolors': [], 'linewidths': []
+        })
+        group['paths'].append(
+            patch.get_path().transformed(patch.get_patch_transform())
+        )
+        group['facecolors'].append(patch.get_facecolor())
+        group['edgecolors'].append(patch.get_edgecolor())
+        group['linewidths'].append(patch.get_linewidth())
+
+    lines = {}
+    def add_line(xy, color, lw, ls, zorder):
+        group = lines.setdefault((zorder, ls), {
+            'segments': [], 'colors': [], 'linewidths': []
+        })
+        group['segments'].append(np.asarray(xy, dtype=float))
+        group['colors'].append(to_rgba(color))
+        group['linewidths'].append(float(lw))
+
+    for line in ax.lines:
+        add_line(
+            line.get_xydata(), 
+            line.get_color(), 
+            line.get_linewidth(), 
+            line.get_linestyle(), 
+            line.get_zorder()
+        )
+
+    if grid:
+        for i in [80 - 8.0*x for x in range(1,10)]:
+            add_line([(i, 45), (i, 120)], 'grey', 0.75, '--', 1)
+
+        for j in [120 - 6.2*x for x in range(1,10)]:
+            add_line([(0, j), (80, j)], 'grey', 0.75, '--', 1)
+
+    if zone_grid_col is not None:
+        for segment in zone_grid_lines:
+            add_line(segment, zone_grid_col, 0.75, '--', 2)
+
+    template = {
+        'xlim': ax.get_xlim(),
+        'ylim': ax.get_ylim(),
+        'aspect': ax.get_aspect(),
+        'facecolor': ax.get_facecolor(),
+        'patches': sorted(patches.items(), key=lambda item: item[0]),
+        'lines': sorted(lines.items(), key=lambda item: item[0][0]),
+    }
 
-    # Rescaling the X-Y coordinates to the statsbomb scale:
-    df[x_cords] = df[x_cords] * .8
-    df[y_cords] = df[y_cords] * 1.2
+    _pitch_templates[key] = template
 
-    return df
+    return template
 
+def draw_pitch_template(
+    ax: plt.Axes,
+    template: dict
+)-> plt.Axes:
+    """
+    Function to draw a cached pitch background on an axes
+
+        Parameters:
+            ax (plt.Axes): Axes to draw the pitch on
+            template (dict): Pitch background from pitch_template
+
+        Returns:
+            ax (plt.Axes): Axes with the pitch
+    """
+    from matplotlib import rcParams
+    from matplotlib.collections import LineCollection, PathCollection
+
+    ax.set_facecolor(template['facecolor'])
+
+    for spine in ax.spines.values():
+        spine.set_visible(False)
+
+    ax.grid(False)
+    ax.tick_params(
+        bottom=False, top=False, left=False, right=False,
+        labelbottom=False, labeltop=False, labelleft=False, labelright=False
+    )
+
+    ax.set_xlim(*template['xlim'])
+    ax.set_ylim(*template['ylim'])
+    ax.set_aspect(template['aspect'])
+
+    for zorder, group in template['patches']:
+        ax.add_collection(
+            PathCollection(
+                group['paths'],
+                facecolors=group['facecolors'],
+                edgecolors=group['edgecolors'],
+                linewidths=group['linewidths'],
+                transform=ax.transData,
+                zorder=zorder
+            ),
+            autolim=False
+        )
+
+    for (zorder, ls), group in template['lines']:
+        # Line2D caps its dashes with lines.dash_capstyle and its solid lines
+        # with lines.solid_capstyle, a collection uses one capstyle for both:
+        solid = ls in ('-', 'solid')
+
+        ax.add_collection(
+            LineCollection(
+                group['segments'],
+                colors=group['colors'],
+                linewidths=group['linewidths'],
+                linestyles=ls,
+                capstyle=rcParams['lines.solid_capstyle' if solid else 'lines.dash_capstyle'],
+                joinstyle=rcParams['lines.solid_joinstyle' if solid else 'lines.dash_joinstyle'],
+                zorder=zorder
+            ),
+            autolim=False
+        )
+
+    return ax
 
+@timed()
 def statsbomb_pitch_vert(
     ax: plt.Axes,
     bg: str,
@@ -62,40 +234,13 @@ def statsbomb_pitch_vert(
         Returns:
             ax (plt.Axes): Vertical pitch with Statsbomb coordinates
     """
-    pitch = VerticalPitch(
-        half=True,
-        pitch_type= 'statsbomb',
-        pitch_color=bg,
-        goal_type='box',
-        line_color='grey',
-    )
+    template = pitch_template(bg=bg, grid=grid)
 
-    pitch.draw(ax = ax)
-
-    if grid:
-        y_lines = [120 - 6.2*x for x in range(1,10)]
-        x_lines = [80 - 8.0*x for x in range(1,10)]
-
-        for i in x_lines:
-            ax.plot(
-                [i, i], [45, 120],
-                color='grey',
-                ls = '--',
-                lw=0.75,
-                zorder=1
-            )
-
-        for j in y_lines:
-            ax.plot(
-                [0, 80], [j, j],
-                color='grey',
-                ls='--',
-                lw='0.75',
-                zorder=1
-            )
+    draw_pitch_template(ax=ax, template=template)
 
     return ax
 
+@timed(rows='data')
 def shot_map(
     axis: plt.Axes,
     data: pd.DataFrame,
@@ -120,16 +265,21 @@ def shot_map(
         Returns:
             axis (plt.Axes): Shot Map
     """
-    if situation == 'Goal':
-        filt = data['result'] == situation
+    # Selecting the shots with a mask over the columns, without copying the
+    # Dataframe:
+    filt = (data['result'] == 'Goal').to_numpy()
 
-        data = data[filt]
+    if situation != 'Goal':
+        filt = ~filt
 
-        size = np.sqrt(data['xG'].astype(float))*500
+    x = data[x_pos].to_numpy()[filt]
+    y = data[y_pos].to_numpy()[filt]
+    size = np.sqrt(data['xG'].to_numpy(dtype=float)[filt])*500
 
+    if situation == 'Goal':
         axis.scatter(
-            data[x_pos].tolist(),
-            data[y_pos].tolist(),
+            x,
+            y,
             s=size,
             alpha=0.7,
             color=color,
@@ -139,15 +289,9 @@ def shot_map(
         )
 
     else:
-        filt = data['result'] != 'Goal'
-
-        data = data[filt]
-
-        size = np.sqrt(data['xG'].astype(float))*500
-
         axis.scatter(
-            data[x_pos].tolist(),
-            data[y_pos].tolist(),
+            x,
+            y,
             s=size,
             alpha=0.45,
             color=color,
@@ -158,85 +302,128 @@ def shot_map(
 
     return axis
 
-# Defining zone areas for shot zone plot:
-zone_areas = {
-    'zone_1': {
-        'x_lower_bound': 0.0, 'x_upper_bound': 18.0,
-        'y_lower_bound': 102.0, 'y_upper_bound': 120.0,
-    },
-    'zone_2': {
-        'x_lower_bound': 62.0, 'x_upper_bound': 80.0,
-        'y_lower_bound': 102.0, 'y_upper_bound': 120.0,
-    },
-    'zone_3': {
-        'x_lower_bound': 0.0, 'x_upper_bound': 18.0,
-        'y_lower_bound': 55.0, 'y_upper_bound': 102.0,        
-    },
-    'zone_4': {
-        'x_lower_bound': 62.0, 'x_upper_bound': 80.0,
-        'y_lower_bound': 55.0, 'y_upper_bound': 102.0,
-    },
-    'zone_5': {
-        'x_lower_bound': 50.0, 'x_upper_bound': 62.0,
-        'y_lower_bound': 102.0, 'y_upper_bound': 120.0,
-    },
-    'zone_6': {
-        'x_lower_bound': 18.0, 'x_upper_bound': 30.0,
-        'y_lower_bound': 102.0, 'y_upper_bound': 120.0,
-    },
-    'zone_7': {
-        'x_lower_bound': 30.0, 'x_upper_bound': 50.0,
-        'y_lower_bound': 102.0, 'y_upper_bound': 114.0,
-    },
-    'zone_8': {
-        'x_lower_bound': 30.0, 'x_upper_bound': 50.0,
-        'y_lower_bound': 114.0, 'y_upper_bound': 120.0,
-    },
-    'zone_9': {
-        'x_lower_bound': 50.0, 'x_upper_bound': 62.0,
-        'y_lower_bound': 85.8, 'y_upper_bound': 102.0,
-    },
-    'zone_10': {
-        'x_lower_bound': 18.0, 'x_upper_bound': 30.0,
-        'y_lower_bound': 85.8, 'y_upper_bound': 102.0,
-    },
-    'zone_11': {
-        'x_lower_bound': 30.0, 'x_upper_bound': 50.0,
-        'y_lower_bound': 85.8, 'y_upper_bound': 102.0,
-    },
-    'zone_12': {
-        'x_lower_bound': 18.0, 'x_upper_bound': 62.0,
-        'y_lower_bound': 55.0, 'y_upper_bound': 85.8,
-    }
-}
+def _style_colors(
+    values: np.ndarray,
+    style_map: dict,
+    key: str,
+    default: str
+)-> np.ndarray:
+    """
+    Function to look up one RGBA color per shot from a style map
 
-def assign_shot_zones(
-    x: float,
-    y: float
-)-> str:
+        Parameters:
+            values (np.ndarray): Category of every shot
+            style_map (dict): Color, or dict of styles, for each category
+            key (str): Style to read from the dicts, e.g. 'color'
+            default (str): Color of the categories missing from the map
+
+        Returns:
+            colors (np.ndarray): Array of shape (n, 4) with the colors
+    """
+    from matplotlib.colors import to_rgba
+
+    uniques, inverse = np.unique(values, return_inverse=True)
+    palette = []
+
+    for value in uniques:
+        style = style_map.get(value, default)
+        if isinstance(style, dict):
+            style = style.get(key, style.get('color', default))
+        palette.append(to_rgba(style))
+
+    return np.array(palette, dtype=float).reshape(-1, 4)[inverse]
+
+@timed(rows='data')
+def shot_map_all(
+    axis: plt.Axes,
+    data: pd.DataFrame,
+    x_pos: str,
+    y_pos: str,
+    goal_col: str = '#034694',
+    shot_col: str = 'grey',
+    goal_edge_col: str = None,
+    shot_edge_col: str = None,
+    category: str = None,
+    style_map: dict = None,
+    goal_lw: float = 2.2,
+    shot_lw: float = 1.25
+)->plt.Axes:
     """
-    Function to assign shot zones based on x and y coordinate values of the shot
+    Function to plot goals and other shots on a football pitch in one pass,
+    as a single scatter whose sizes, colors, alpha and line widths are set
+    per shot. Goals are drawn after the other shots so they sit on top
 
         Parameters:
-            x (float): x coordinate of the shot
-            y (float): y coordinate of the shot
+            axis (plt.Axes): Axes specified for the football pitch
+            data (pd.DataFrame): Dataframe containing the Shot data
+            x_pos (str): Values of x-coordinate of the shot
+            y_pos (str): Values of y-coordinate of the shot
+            goal_col (str): Color for the goals
+            shot_col (str): Color for the other shots
+            goal_edge_col (str): Edge color for the goals, goal_col if None
+            shot_edge_col (str): Edge color for the other shots, shot_col if None
+            category (str): Column to color the shots by, e.g. situation or 
+            shotType, instead of goal_col and shot_col
+            style_map (dict): Color for each category, or a dict with 'color'
+            and 'edge_col', categories missing from it use shot_col
+            goal_lw (float): Edge width of the goals
+            shot_lw (float): Edge width of the other shots. Matplotlib sets
+            per-point widths in a Python loop, so giving both the same width
+            is quicker for very large shot sets
 
         Returns:
-            zone (str): Shot zone based on x and y coordinate values of the shot 
+            axis (plt.Axes): Shot Map
     """
-    global zone_areas
-
-    for zone in zone_areas:
-        if (
-            (x >= zone_areas[zone]['x_lower_bound']) 
-            & (x <= zone_areas[zone]['x_upper_bound'])
-        ):
-            if (
-                (y >= zone_areas[zone]['y_lower_bound']) 
-                & (y <= zone_areas[zone]['y_upper_bound'])
-            ):
-                return zone
+    from matplotlib.colors import to_rgba
+
+    x = data[x_pos].to_numpy(dtype=float)
+    y = data[y_pos].to_numpy(dtype=float)
+    xg = data['xG'].to_numpy(dtype=float)
+    goal = (data['result'] == 'Goal').to_numpy(dtype=bool)
 
+    if category is not None:
+        values = data[category].astype(str).to_numpy()
+        style_map = style_map or {}
+
+        face = _style_colors(values, style_map, 'color', shot_col)
+        edge = _style_colors(values, style_map, 'edge_col', shot_col)
+    else:
+        goal_edge_col = goal_col if goal_edge_col is None else goal_edge_col
+        shot_edge_col = shot_col if shot_edge_col is None else shot_edge_col
+
+        face = np.where(goal[:, None], to_rgba(goal_col), to_rgba(shot_col))
+        edge = np.where(
+            goal[:, None], to_rgba(goal_edge_col), to_rgba(shot_edge_col)
+        )
+
+    # Drawing the goals last so they sit on top of the other shots:
+    order = np.argsort(goal, kind='stable')
+
+    # Same styling as shot_map, goals stand out with more opaque, thicker
+    # markers:
+    alpha = np.where(goal, 0.7, 0.45)
+    face[:, 3] *= alpha
+    edge[:, 3] *= alpha
+
+    sizes = np.sqrt(xg)*500
+    widths = np.where(goal, goal_lw, shot_lw)[order]
+
+    if goal_lw == shot_lw:
+        widths = goal_lw
+
+    axis.scatter(
+        x[order],
+        y[order],
+        s=sizes[order],
+        facecolors=face[order],
+        edgecolors=edge[order],
+        linewidths=widths,
+        zorder=3
+    )
+
+    return axis
+
+@timed(rows='data')
 def plot_shot_zones(
     axis: plt.Axes,
     bg: str,
@@ -262,88 +449,53 @@ def plot_shot_zones(
             axis (plt.Axes): Shot zone plot 
 
     """
-    global zone_areas
+    import matplotlib.patheffects as path_effects
+    from matplotlib.colors import to_rgba
+    from matplotlib.collections import PolyCollection
 
-    pitch = VerticalPitch(
-        half=True,
-        pitch_type= 'statsbomb',
-        pitch_color=bg,
-        goal_type='box',
-        line_color='grey',
-    )
+    # Drawing the pitch and the grids:
+    template = pitch_template(bg=bg, zone_grid_col=grid_col)
 
-    pitch.draw(ax = axis)
+    draw_pitch_template(ax=axis, template=template)
 
-    # Plotting the grids:
-    axis.plot(
-        [62.0, 62.0], [40.0, 102.0], 
-        ls='--', 
-        color=grid_col, 
-        lw=0.75
-    )
-    axis.plot(
-        [18.0, 18.0], [40.0, 102.0], 
-        ls='--', 
-        color=grid_col, 
-        lw=0.75
-    )
-    axis.plot(
-        [30.0, 30.0], [102.0, 114.0], 
-        ls='--', 
-        color=grid_col, 
-        lw=0.75
-    )
-    axis.plot(
-        [50.0, 50.0], [102.0, 114.0], 
-        ls='--', 
-        color=grid_col, 
-        lw=0.75
-    )
-    axis.plot(
-        [62.0, 80.0], [102.0, 102.0], 
-        ls='--', 
-        color=grid_col, 
-        lw=0.75
-    )
-    axis.plot(
-        [18.0, 0.0], [102.0, 102.0], 
-        ls='--', 
-        color=grid_col, 
-        lw=0.75
-    )
-    axis.plot(
-        [18.0, 62.0], [85.8, 85.8], 
-        ls='--', 
-        color=grid_col, 
-        lw=0.75
-    )
+    zones = data['zone_area'].to_numpy()
+    shot_pcts = data['pct'].to_numpy(dtype=float)
+    max_value = shot_pcts.max() if len(shot_pcts) else 0
 
-    max_value = data['pct'].max()
-
-    for zone in data['zone_area']:
-        shot_pct = data[
-            data['zone_area'] == zone
-        ]['pct'].iloc[0]
-        
-        x_lim = [
-            zone_areas[zone]['x_lower_bound'], 
-            zone_areas[zone]['x_upper_bound']
-        ]
-        
+    # Drawing every zone as one collection, shaded by its share of shots:
+    verts = []
+    for zone in zones:
+        x1 = zone_areas[zone]['x_lower_bound']
+        x2 = zone_areas[zone]['x_upper_bound']
         y1 = zone_areas[zone]['y_lower_bound']
         y2 = zone_areas[zone]['y_upper_bound']
-        
-        axis.fill_between(
-            x=x_lim, 
-            y1=y1, 
-            y2=y2, 
-            color=zone_col, 
-            alpha=(shot_pct/max_value),
-            zorder=0, 
-            ec='None'
-        )
-       
+
+        verts.append([(x1, y1), (x2, y1), (x2, y2), (x1, y2)])
+
+    face = np.tile(to_rgba(zone_col), (len(zones), 1))
+    face[:, 3] = shot_pcts / max_value if max_value > 0 else 0
+
+    axis.add_collection(
+        PolyCollection(
+            verts,
+            facecolors=face,
+            edgecolors='none',
+            linewidths=0,
+            zorder=0
+        ),
+        autolim=False
+    )
+
+    for zone, shot_pct in zip(zones, shot_pcts):
         if shot_pct > 0.05:
+            x_lim = [
+                zone_areas[zone]['x_lower_bound'], 
+                zone_areas[zone]['x_upper_bound']
+            ]
+
+            y1 = zone_areas[zone]['y_lower_bound']
+            y2 = zone_areas[zone]['y_upper_bound']
+
             x_pos = x_lim[0] + abs(x_lim[0] - x_lim[1])/2
             y_pos = y1 + abs(y1 - y2)/2
             text_ = axis.annotate(
@@ -367,12 +519,114 @@ def plot_shot_zones(
     
     return axis
 
+def _split_series(
+    x: np.ndarray,
+    y: np.ndarray
+)-> list:
+    """
+    Function to split a series into its runs of valid points, as a line is
+    broken wherever a value is missing
+
+        Parameters:
+            x (np.ndarray): x values of the series
+            y (np.ndarray): y values of the series
+
+        Returns:
+            runs (list): (n, 2) arrays of points, one per run
+    """
+    points = np.column_stack([x, y]).astype(float, copy=False)
+    valid = ~np.isnan(points).any(axis=1)
+
+    if valid.all():
+        return [points]
+
+    # Run boundaries are where the valid mask flips:
+    edges = np.flatnonzero(np.diff(valid.astype(np.int8))) + 1
+
+    return [run for run in np.split(points, edges) if not np.isnan(run[0]).any()]
+
+def multi_line_plot(
+    axis: plt.Axes,
+    xs: list,
+    ys: list,
+    color: str,
+    bg: str,
+    lw: float = 2,
+    size: float = 100,
+    alpha: float = 1.0,
+    zorder: float = 2,
+    markers: bool = True
+)-> tuple:
+    """
+    Function to draw many series of one colour as a single LineCollection and
+    a single scatter, instead of one plot and one scatter call per series
+
+        Parameters:
+            axis (plt.Axes): Plot axis
+            xs (list): x values of every series, arrays or columns
+            ys (list): y values of every series, arrays or columns
+            color (str): Color of every series
+            bg (str): Background Color for the plot, used for the marker edges
+            lw (float): Width of the lines
+            size (float): Size of the markers
+            alpha (float): Opacity of the lines and markers
+            zorder (float): Order of the lines, the markers go just above them
+            markers (bool): Draw a marker at every point
+
+        Returns:
+            lines (LineCollection): Lines of every series
+            points (PathCollection): Markers of every series, None if markers
+            is False
+    """
+    from matplotlib.collections import LineCollection
+
+    runs = [
+        run
+        for x, y in zip(xs, ys)
+        for run in _split_series(np.asarray(x), np.asarray(y))
+    ]
+
+    # Same joins and caps as axis.plot:
+    lines = LineCollection(
+        [run for run in runs if len(run) > 1],
+        colors=color,
+        linewidths=lw,
+        alpha=alpha,
+        zorder=zorder,
+        capstyle='projecting',
+        joinstyle='round'
+    )
+    axis.add_collection(lines, autolim=True)
+
+    points = None
+
+    if markers:
+        offsets = np.concatenate(runs) if runs else np.empty((0, 2))
+
+        points = axis.scatter(
+            offsets[:, 0],
+            offsets[:, 1],
+            s=size,
+            color=color,
+            edgecolors=bg,
+            alpha=alpha,
+            zorder=zorder + 1,
+            linewidth=1
+        )
+
+    axis.autoscale_view()
+
+    return lines, points
+
+@timed(rows='dataframe')
 def line_plots(
     axis: plt.Axes, 
     dataframe: pd.DataFrame, 
     xG_for: str, 
     xG_against: str,
-    bg:str
+    bg:str,
+    for_col: str = '#2F2FFF',
+    against_col: str = '#FF0000'
 )-> plt.Axes:
     """Function to create the lineplot for the xG trend graph
 
@@ -382,48 +636,18 @@ def line_plots(
             xG_for (str): Column name for running xG scored
             xG_against (str): Column name for running xG conceded  
             bg (str): Background Color for the plot
+            for_col (str): Color of the xG for line
+            against_col (str): Color of the xG against line
 
         Returns:
             axis (plt.Axes): Plot with xG trend lines
     """
-    # xG for:-
-    axis.plot(
-        dataframe['Round'].tolist(),
-        dataframe[xG_for].tolist(),
-        color='#2F2FFF', 
-        zorder=2, 
-        lw=2, 
-        mec=bg
-    )
+    rounds = dataframe['Round'].to_numpy(dtype=float)
 
-    axis.scatter(
-        dataframe['Round'].tolist(),
-        dataframe[xG_for].tolist(),
-        s=100, 
-        color='#2F2FFF', 
-        edgecolors=bg, 
-        zorder=3, 
-        linewidth=1
-    )
+    # xG for:-
+    multi_line_plot(axis, [rounds], [dataframe[xG_for].to_numpy(dtype=float)], for_col, bg)
 
     # xG Against:
-    axis.plot(
-        dataframe['Round'].tolist(),
-        dataframe[xG_against].tolist(),
-        color='#FF0000', 
-        zorder=2, 
-        lw=2, 
-        mec=bg
-    )
-
-    axis.scatter(
-        dataframe['Round'].tolist(),
-        dataframe[xG_against].tolist(),
-        s=100, 
-        color='#FF0000', 
-        edgecolors=bg, 
-        zorder=3, 
-        linewidth=1
-    )
+    multi_line_plot(axis, [rounds], [dataframe[xG_against].to_numpy(dtype=float)], against_col, bg)
 
     return axis
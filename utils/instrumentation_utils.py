@@ -0,0 +1,529 @@
+# Importing the required packages:
+import os
+import json
+import time
+import atexit
+import functools
+import threading
+import contextlib
+
+# Environment variables turning the instrumentation on for a whole process:
+# the metrics file (a .prom file is written in the Prometheus text format,
+# anything else as JSON lines), whether peak memory is traced, and the
+# cProfile stats file:
+METRICS_ENV = 'FOOTBALL_METRICS'
+MEMORY_ENV = 'FOOTBALL_METRICS_MEMORY'
+PROFILE_ENV = 'FOOTBALL_PROFILE'
+
+# Process that turned the instrumentation on from the environment. Worker
+# processes inherit it and write their own files next to its one:
+PARENT_ENV = 'FOOTBALL_METRICS_PARENT'
+
+# Active recorder, None while the instrumentation is off:
+_recorder = None
+
+class _NullRecord:
+    """
+    Class taking the fields of a stage while the instrumentation is off and
+    dropping them
+    """
+    def __setitem__(self, key, value):
+        pass
+
+    def update(self, *args, **kwargs):
+        pass
+
+class _NullStage:
+    """
+    Class of the single stage handed out while the instrumentation is off, so
+    a disabled stage costs one call and no allocation
+    """
+    record = _NullRecord()
+
+    def __enter__(self):
+        return self.record
+
+    def __exit__(self, *exc):
+        return False
+
+_NULL_STAGE = _NullStage()
+
+class _Recorder:
+    """
+    Class collecting the records of every stage
+
+        Parameters:
+            path (str): File the records are written to, nothing is written
+            if None
+            memory (bool): Trace the peak memory of every stage with
+            tracemalloc, which slows the traced code down
+            stream (bool): Append every record to a JSON lines file as soon as
+            its stage ends, instead of writing them all at the end
+            labels (dict): Extra labels of the Prometheus metrics, e.g. the
+            pid of a worker process
+    """
+    def __init__(
+        self,
+        path: str = None,
+        memory: bool = False,
+        stream: bool = False,
+        labels: dict = None
+    ):
+        self.path = path
+        self.memory = memory
+        self.stream = stream and path is not None and not is_prometheus(path)
+        self.labels = labels
+        self.records = []
+        self.lock = threading.Lock()
+        self.local = threading.local()
+
+        # Stages open in any thread, to tell when their memory peaks mix:
+        self.open = set()
+
+    def stack(self)-> list:
+        if not hasattr(self.local, 'stack'):
+            self.local.stack = []
+
+        return self.local.stack
+
+    def add(self, record: dict):
+        with self.lock:
+            self.records.append(record)
+
+            if self.stream:
+                with open(self.path, 'a') as f:
+                    f.write(json.dumps(record, default=str) + '\n')
+
+    def write(self):
+        if self.path is None or self.stream:
+            return
+
+        if is_prometheus(self.path):
+            write_prometheus(self.records, self.path, self.labels)
+        else:
+            write_jsonl(self.records, self.path)
+
+class _Stage:
+    """
+    Class timing one stage and recording it when it ends
+
+        Parameters:
+            recorder (_Recorder): Recorder of the stage
+            name (str): Name of the stage
+            fields (dict): Extra fields of the record, e.g. rows or bytes
+    """
+    def __init__(self, recorder: _Recorder, name: str, fields: dict):
+        self.recorder = recorder
+        self.name = name
+        self.record = fields
+
+    def __enter__(self):
+        stack = self.recorder.stack()
+        self.path = '/'.join([frame.name for frame in stack] + [self.name])
+        self.child_peak = 0
+        self.outer_peak = 0
+        self.shared = False
+
+        if self.recorder.memory:
+            import tracemalloc
+
+            self.thread = threading.get_ident()
+
+            with self.recorder.lock:
+                others = [s for s in self.recorder.open if s.thread != self.thread]
+
+                # tracemalloc has one peak for the whole process, so while
+                # stages run in other threads it is neither restarted nor
+                # the peak of this stage alone:
+                if others:
+                    self.shared = True
+                    for other in others:
+                        other.shared = True
+                else:
+                    # Keeping the peak of the enclosing stage before
+                    # restarting it:
+                    self.outer_peak = tracemalloc.get_traced_memory()[1]
+                    tracemalloc.reset_peak()
+
+                self.recorder.open.add(self)
+
+        stack.append(self)
+        self.wall = time.time()
+        self.start = time.perf_counter()
+
+        return self.record
+
+    def __exit__(self, exc_type, exc, tb):
+        seconds = time.perf_counter() - self.start
+
+        stack = self.recorder.stack()
+        stack.pop()
+
+        record = {
+            'stage': self.path,
+            'name': self.name,
+            'seconds': seconds,
+            'start': self.wall,
+            'pid': os.getpid(),
+            'thread': threading.current_thread().name,
+            **self.record,
+            'error': None if exc_type is None else exc_type.__name__,
+        }
+
+        if self.recorder.memory:
+            import tracemalloc
+
+            with self.recorder.lock:
+                self.recorder.open.discard(self)
+
+            peak = max(tracemalloc.get_traced_memory()[1], self.child_peak)
+            record['peak_bytes'] = peak
+            record['peak_scope'] = 'process' if self.shared else 'stage'
+
+            # Handing the peak back to the enclosing stage:
+            if stack:
+                stack[-1].child_peak = max(stack[-1].child_peak, peak, self.outer_peak)
+                stack[-1].shared |= self.shared
+
+        self.recorder.add(record)
+
+        return False
+
+def enabled()-> bool:
+    """
+    Function to check whether stages are being recorded
+
+        Returns:
+            enabled (bool): Whether the instrumentation is on
+    """
+    return _recorder is not None
+
+def stage(name: str, **fields):
+    """
+    Function to time a stage of the work, as a context manager giving a dict
+    to add fields such as rows or bytes to the record
+
+        with stage('fetch_page', url=url) as record:
+            content = ...
+            record['bytes'] = len(content)
+
+    Stages nest, the record of an inner stage is named after the stages
+    around it, e.g. 'scrape_shots/download'. Nothing is recorded while the
+    instrumentation is off.
+
+        Parameters:
+            name (str): Name of the stage
+            **fields: Extra fields of the record
+
+        Returns:
+            stage (context manager): The stage
+    """
+    recorder = _recorder
+
+    if recorder is None:
+        return _NULL_STAGE
+
+    return _Stage(recorder, name, fields)
+
+def timed(
+    name: str = None,
+    rows: str = None
+):
+    """
+    Function to build a decorator recording every call of a function as a
+    stage. While the instrumentation is off the function is called straight
+    away
+
+        Parameters:
+            name (str): Name of the stage, the name of the function if None
+            rows (str): Argument whose length is recorded as the rows
+
+        Returns:
+            decorator (callable): The decorator
+    """
+    def decorate(func):
+        stage_name = name or func.__name__
+        signature = None
+
+        if rows:
+            import inspect
+            signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            recorder = _recorder
+
+            if recorder is None:
+                return func(*args, **kwargs)
+
+            fields = {}
+
+            if rows:
+                value = signature.bind_partial(*args, **kwargs).arguments.get(rows)
+                if value is not None:
+                    fields['rows'] = len(value)
+
+            with _Stage(recorder, stage_name, fields):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorate
+
+def is_prometheus(path: str)-> bool:
+    return str(path).endswith('.prom')
+
+def write_jsonl(
+    records: list,
+    path: str,
+    append: bool = True
+):
+    """
+    Function to write stage records as JSON lines
+
+        Parameters:
+            records (list): Stage records
+            path (str): Path of the file
+            append (bool): Append to the file instead of overwriting it
+    """
+    with open(path, 'a' if append else 'w') as f:
+        for record in records:
+            f.write(json.dumps(record, default=str) + '\n')
+
+def _label(value)-> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def write_prometheus(
+    records: list,
+    path: str,
+    labels: dict = None
+):
+    """
+    Function to write the totals of every stage in the Prometheus text
+    format, e.g. for the node exporter textfile collector
+
+        Parameters:
+            records (list): Stage records
+            path (str): Path of the .prom file, written through a temporary
+            file so the collector never reads half of it
+            labels (dict): Extra labels of every metric, e.g. {'pid': 1234}
+            so the files of several processes do not clash
+    """
+    totals = {}
+
+    for record in records:
+        total = totals.setdefault(record['stage'], {
+            'calls': 0, 'errors': 0, 'seconds': 0.0, 'bytes': 0, 'rows': 0, 'peak_bytes': None,
+        })
+        total['calls'] += 1
+        total['errors'] += record.get('error') is not None
+        total['seconds'] += record['seconds']
+        total['bytes'] += record.get('bytes') or 0
+        total['rows'] += record.get('rows') or 0
+
+        if record.get('peak_bytes') is not None:
+            total['peak_bytes'] = max(total['peak_bytes'] or 0, record['peak_bytes'])
+
+    metrics = [
+        ('calls', 'counter', 'Number of times the stage ran'),
+        ('errors', 'counter', 'Number of times the stage raised an error'),
+        ('seconds', 'counter', 'Total time spent in the stage'),
+        ('bytes', 'counter', 'Total bytes handled by the stage'),
+        ('rows', 'counter', 'Total rows handled by the stage'),
+        ('peak_bytes', 'gauge', 'Largest peak of traced memory during the stage, '
+         'of the whole process when stages overlapped in threads'),
+    ]
+
+    extra = ''.join(f',{key}="{_label(value)}"' for key, value in (labels or {}).items())
+    lines = []
+
+    for key, kind, doc in metrics:
+        name = f'football_stage_{key}' + ('_total' if kind == 'counter' else '')
+        values = [
+            (stage_name, total[key]) for stage_name, total in totals.items()
+            if total[key] is not None
+        ]
+
+        if not values:
+            continue
+
+        lines.append(f'# HELP {name} {doc}')
+        lines.append(f'# TYPE {name} {kind}')
+        lines += [f'{name}{{stage="{_label(s)}"{extra}}} {v}' for s, v in values]
+
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+
+    with open(tmp_path, 'w') as f:
+        f.write('\n'.join(lines) + '\n')
+
+    os.replace(tmp_path, path)
+
+@contextlib.contextmanager
+def profile_batch(path: str = None):
+    """
+    Function to run cProfile around a block, e.g. a whole batch of reports
+
+        Parameters:
+            path (str): File the stats are dumped to, for pstats or snakeviz
+
+        Returns:
+            profiler (cProfile.Profile): The profiler, as a context manager
+    """
+    import cProfile
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+
+    try:
+        yield profiler
+    finally:
+        profiler.disable()
+
+        if path is not None:
+            profiler.dump_stats(path)
+
+@contextlib.contextmanager
+def collect_metrics(
+    path: str = None,
+    memory: bool = False,
+    profile: str = None
+):
+    """
+    Function to record every stage run inside a block
+
+        with collect_metrics('metrics.jsonl') as records:
+            shots = scrape_shots('5220')
+
+        Parameters:
+            path (str): File the records are written to when the block ends,
+            a .prom file in the Prometheus text format and JSON lines
+            otherwise, nothing is written if None
+            memory (bool): Trace the peak memory of every stage
+            profile (str): File the cProfile stats of the block are dumped
+            to, no profiling if None
+
+        Returns:
+            records (list): Records of the stages, filled as they end
+    """
+    global _recorder
+
+    previous = _recorder
+    recorder = _Recorder(path=path, memory=memory)
+    started_tracing = False
+
+    # The profiling and memory tracing modules are only imported when used,
+    # importing this module stays cheap:
+    if memory:
+        import tracemalloc
+
+        started_tracing = not tracemalloc.is_tracing()
+
+        if started_tracing:
+            tracemalloc.start()
+
+    _recorder = recorder
+
+    try:
+        with (profile_batch(profile) if profile else contextlib.nullcontext()):
+            yield recorder.records
+    finally:
+        _recorder = previous
+
+        if started_tracing:
+            tracemalloc.stop()
+
+        recorder.write()
+
+def process_path(
+    path: str,
+    pid: int = None
+)-> str:
+    """
+    Function to get the .prom file of a worker process, next to the file of
+    the process that turned the instrumentation on, e.g. metrics.123.prom
+
+        Parameters:
+            path (str): Metrics file of the parent process
+            pid (int): Id of the worker process, the current one if None
+
+        Returns:
+            path (str): Metrics file of the worker process
+    """
+    root, ext = os.path.splitext(path)
+
+    return f'{root}.{os.getpid() if pid is None else pid}{ext}'
+
+def _start_recorder(
+    path: str,
+    memory: bool
+):
+    """
+    Function to turn the instrumentation on for the rest of the process from
+    the environment
+
+    The records are written by a multiprocessing finalizer, which runs at
+    the exit of the main process like atexit does, and also in the worker
+    processes of a pool, which leave through os._exit without running
+    atexit. Every process appends to the same JSON lines file, as each
+    record is one line with its pid. A .prom file holds totals, so every
+    worker writes its own one, see process_path, with its pid as a label.
+
+        Parameters:
+            path (str): Metrics file from the environment
+            memory (bool): Trace the peak memory of every stage
+    """
+    global _recorder
+    import multiprocessing.util
+
+    parent = os.environ.setdefault(PARENT_ENV, str(os.getpid()))
+    labels = None
+
+    if parent != str(os.getpid()) and is_prometheus(path):
+        path = process_path(path)
+        labels = {'pid': os.getpid()}
+
+    if memory:
+        import tracemalloc
+
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    _recorder = _Recorder(path=path, memory=memory, stream=True, labels=labels)
+    multiprocessing.util.Finalize(None, _recorder.write, exitpriority=10)
+
+def _enable_from_env():
+    """
+    Function to turn the instrumentation on for the whole process when the
+    environment variables are set
+    """
+    path = os.environ.get(METRICS_ENV)
+
+    if path:
+        import multiprocessing.util
+
+        memory = os.environ.get(MEMORY_ENV, '').lower() in ('1', 'true', 'yes')
+
+        _start_recorder(path, memory)
+
+        # A forked worker starts from a copy of this process, it gets a
+        # recorder of its own instead of the records of its parent, once
+        # multiprocessing has cleared the finalizers it inherited:
+        multiprocessing.util.register_after_fork(
+            _start_recorder, lambda _: _start_recorder(path, memory)
+        )
+
+    profile_path = os.environ.get(PROFILE_ENV)
+
+    if profile_path:
+        import cProfile
+
+        profiler = cProfile.Profile()
+        profiler.enable()
+
+        def dump():
+            profiler.disable()
+            profiler.dump_stats(profile_path)
+
+        atexit.register(dump)
+
+_enable_from_env()
@@ -0,0 +1,338 @@
+# Importing the required packages:
+import os
+import time
+import traceback
+import contextlib
+import multiprocessing
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from utils.instrumentation_utils import stage
+
+# Default look of the rendered reports, any key can be overridden per spec:
+REPORT_DEFAULTS = {
+    'kind': 'shot_map',
+    'filters': None,
+    'exclude': {'situation': ['Penalty']},
+    'bg': '#141414',
+    'goal_col': '#034694',
+    'shot_col': 'grey',
+    'zone_col': '#034694',
+    'grid_col': 'white',
+    'text_col': 'white',
+    'font': 'sans-serif',
+    'grid': False,
+    'figsize': (16, 10),
+    'dpi': 100,
+    'preset': None,
+}
+
+def _init_worker():
+    """
+    Function run once in every worker process to select the headless Agg
+    backend before pyplot is imported
+    """
+    os.environ['MPLBACKEND'] = 'Agg'
+
+    import matplotlib
+    matplotlib.use('Agg')
+
+@contextlib.contextmanager
+def headless_backend():
+    """
+    Function to draw with the Agg backend inside a block, like the worker
+    processes do, so rendering in this process opens no windows. The
+    backend in use before the block is put back after it
+    """
+    import matplotlib
+    import matplotlib.pyplot as plt
+
+    previous = matplotlib.get_backend()
+    plt.switch_backend('Agg')
+
+    try:
+        yield
+    finally:
+        plt.switch_backend(previous)
+
+def _select_shots(
+    shots: pd.DataFrame,
+    filters: dict = None,
+    exclude: dict = None
+)-> pd.DataFrame:
+    """
+    Function to keep the shots matching every filter and none of the
+    exclusions
+
+        Parameters:
+            shots (pd.DataFrame): Dataframe containing the shot data
+            filters (dict): Values to keep for each column, a single value or
+            a list of values
+            exclude (dict): Values to drop for each column
+
+        Returns:
+            shots (pd.DataFrame): Dataframe with the selected shots
+    """
+    mask = np.ones(len(shots), dtype=bool)
+
+    for col, values in (filters or {}).items():
+        values = values if isinstance(values, (list, tuple, set)) else [values]
+        mask &= shots[col].astype(str).isin([str(v) for v in values]).to_numpy()
+
+    for col, values in (exclude or {}).items():
+        values = values if isinstance(values, (list, tuple, set)) else [values]
+        mask &= ~shots[col].astype(str).isin([str(v) for v in values]).to_numpy()
+
+    return shots[mask]
+
+def render_report(spec: dict)-> dict:
+    """
+    Function to render one shot map or zone map report to an image file
+
+        Parameters:
+            spec (dict): Report spec holding the 'output' path, the shots as
+            a Dataframe or the path of a CSV, JSON lines or Parquet file of
+            shots in 'shots', or an understat 'player_id' to scrape, and any
+            of the keys of REPORT_DEFAULTS. 'kind' is 'shot_map' or
+            'zone_map', 'filters' and 'exclude' pick the shots to plot
+
+        Returns:
+            result (dict): Output path, number of shots and render time
+    """
+    import matplotlib.pyplot as plt
+    from utils.shot_utils import convert_to_statsbomb, zone_stats
+    from utils.helper_utils import (
+        statsbomb_pitch_vert,
+        shot_map_all,
+        plot_shot_zones
+    )
+
+    start = time.perf_counter()
+    spec = {**REPORT_DEFAULTS, **spec}
+
+    if isinstance(spec.get('shots'), str):
+        from utils.shot_stream_utils import iter_shot_chunks
+        shots = pd.concat(iter_shot_chunks(spec['shots']), ignore_index=True)
+    elif spec.get('shots') is not None:
+        shots = spec['shots']
+    else:
+        from utils.understat_scraper_utils import scrape_shots
+        shots = scrape_shots(str(spec['player_id']))
+
+    loaded = time.perf_counter()
+
+    shots = _select_shots(shots, spec['filters'], spec['exclude'])
+    shots = convert_to_statsbomb(data=shots, x_cords='X', y_cords='Y')
+
+    fig, ax = plt.subplots(figsize=spec['figsize'])
+
+    try:
+        if spec['kind'] == 'shot_map':
+            statsbomb_pitch_vert(ax=ax, bg=spec['bg'], grid=spec['grid'])
+
+            shot_map_all(
+                axis=ax,
+                data=shots,
+                x_pos='X',
+                y_pos='Y',
+                goal_col=spec['goal_col'],
+                shot_col=spec['shot_col']
+            )
+
+        elif spec['kind'] == 'zone_map':
+            data = zone_stats(shots)
+
+            plot_shot_zones(
+                axis=ax,
+                bg=spec['bg'],
+                grid_col=spec['grid_col'],
+                zone_col=spec['zone_col'],
+                text_col=spec['text_col'],
+                font=spec['font'],
+                data=data,
+            )
+
+        else:
+            raise ValueError(
+                f"kind must be 'shot_map' or 'zone_map', got {spec['kind']!r}"
+            )
+
+        drawn = time.perf_counter()
+
+        output = save_figure(fig, spec['output'], spec)
+    finally:
+        plt.close(fig)
+
+    end = time.perf_counter()
+
+    return {
+        'output': output,
+        'n_shots': len(shots),
+        'load_s': loaded - start,
+        'draw_s': drawn - loaded,
+        'save_s': end - drawn,
+        'total_s': end - start,
+    }
+
+def save_figure(
+    fig,
+    output: str,
+    style: dict
+)-> str:
+    """
+    Function to save a rendered figure, with export_figure when the style
+    names an export preset and with savefig otherwise. The folder of the
+    image is created if needed, the figure is left open
+
+        Parameters:
+            fig (plt.Figure): Figure to save
+            output (str): Path of the image
+            style (dict): Style holding the 'preset', 'bg' and 'dpi' keys
+
+        Returns:
+            output (str): Path of the image written, whose extension is the
+            format of the preset if one is given
+    """
+    out_dir = os.path.dirname(output)
+    if out_dir:
+        os.makedirs(out_dir, exist_ok=True)
+
+    if style['preset'] is not None:
+        from utils.export_utils import export_figure
+
+        return export_figure(
+            fig, output, style['preset'], facecolor=style['bg']
+        )['output']
+
+    with stage('savefig', output=output):
+        fig.savefig(
+            output,
+            facecolor=style['bg'],
+            bbox_inches='tight',
+            dpi=style['dpi']
+        )
+
+    return output
+
+def _run_job(
+    render,
+    job: dict,
+    keys: tuple
+)-> dict:
+    """
+    Function to render a figure in a worker, catching any error so one bad
+    job does not stop the batch
+
+        Parameters:
+            render (callable): Function rendering one job, see run_jobs
+            job (dict): Job to render
+            keys (tuple): Keys of the job copied to the result if it failed
+
+        Returns:
+            result (dict): Timings of the figure, or the error if it failed
+    """
+    start = time.perf_counter()
+
+    try:
+        result = render(job)
+        result['status'] = 'ok'
+        result['error'] = None
+    except Exception as error:
+        result = {
+            **{key: job.get(key) for key in keys},
+            'total_s': time.perf_counter() - start,
+            'status': 'failed',
+            'error': ''.join(
+                traceback.format_exception_only(type(error), error)
+            ).strip(),
+            'traceback': traceback.format_exc(),
+        }
+
+    result['pid'] = os.getpid()
+
+    return result
+
+def run_jobs(
+    render,
+    jobs: list,
+    workers: int = None,
+    start_method: str = 'spawn',
+    keys: tuple = ('output',)
+)-> list:
+    """
+    Function to render a batch of figures in a pool of worker processes, or
+    in this process, using the headless Agg backend. A job that fails gives
+    a 'failed' result with its error and traceback instead of stopping the
+    batch
+
+        Parameters:
+            render (callable): Module level function taking one job and
+            returning a dict of its output and timings
+            jobs (list): Jobs to render
+            workers (int): Number of worker processes, the number of CPUs if
+            None and everything in this process if 0
+            start_method (str): Multiprocessing start method of the workers,
+            'spawn' keeps the parent's matplotlib state out of the workers
+            keys (tuple): Keys of a job copied to its result if it failed
+
+        Returns:
+            results (list): One dict per job, in the same order, with its
+            status, error and the pid of the process that rendered it
+    """
+    results = [None] * len(jobs)
+
+    if workers == 0:
+        with headless_backend():
+            for i, job in enumerate(jobs):
+                results[i] = _run_job(render, job, keys)
+    else:
+        context = multiprocessing.get_context(start_method)
+
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=context,
+            initializer=_init_worker
+        ) as executor:
+            futures = {
+                executor.submit(_run_job, render, job, keys): i
+                for i, job in enumerate(jobs)
+            }
+
+            for future in as_completed(futures):
+                results[futures[future]] = future.result()
+
+    return results
+
+def render_reports(
+    specs: list,
+    workers: int = None,
+    start_method: str = 'spawn'
+)-> pd.DataFrame:
+    """
+    Function to render a batch of shot map and zone map reports in a pool of
+    worker processes, or in this process, using the headless Agg backend
+
+        Parameters:
+            specs (list): Report specs, see render_report
+            workers (int): Number of worker processes, the number of CPUs if
+            None and everything in this process if 0
+            start_method (str): Multiprocessing start method of the workers,
+            'spawn' keeps the parent's matplotlib state out of the workers
+
+        Returns:
+            results (pd.DataFrame): One row per spec, in the same order, with
+            the output path, status, timings and error of every job
+    """
+    results = run_jobs(
+        render_report, specs, workers=workers, start_method=start_method
+    )
+
+    columns = [
+        'output', 'status', 'n_shots', 'load_s', 'draw_s', 'save_s',
+        'total_s', 'pid', 'error'
+    ]
+    df = pd.DataFrame(results)
+
+    return df.reindex(columns=columns + [
+        col for col in df.columns if col not in columns
+    ])
@@ -0,0 +1,208 @@
+# Importing the required packages:
+import math
+from collections import deque
+import numpy as np
+import pandas as pd
+
+class _RunningWindow:
+    """
+    Class keeping the last `window` values of a series and their running sum,
+    so every new value updates the mean in O(1)
+
+        Parameters:
+            window (int): Number of values in the window
+    """
+    def __init__(self, window: int):
+        self.window = window
+        self.values = deque()
+        self.total = 0.0
+        self.comp = 0.0
+        self.n_nan = 0
+
+    def _add(self, value: float):
+        # Neumaier summation so long seasons do not drift from a full recompute:
+        total = self.total + value
+        if abs(self.total) >= abs(value):
+            self.comp += (self.total - total) + value
+        else:
+            self.comp += (value - total) + self.total
+        self.total = total
+
+    def push(self, value: float)-> float:
+        """
+        Function to add a value to the window
+
+            Parameters:
+                value (float): New value of the series
+
+            Returns:
+                mean (float): Mean of the full window ending at this value,
+                NaN until the window is full or while it holds a NaN
+        """
+        self.values.append(value)
+
+        if math.isnan(value):
+            self.n_nan += 1
+        else:
+            self._add(value)
+
+        if len(self.values) > self.window:
+            old = self.values.popleft()
+
+            if math.isnan(old):
+                self.n_nan -= 1
+            else:
+                self._add(-old)
+
+        if len(self.values) < self.window or self.n_nan:
+            return np.nan
+
+        return (self.total + self.comp) / self.window
+
+class RollingXG:
+    """
+    Class tracking rolling averages of match metrics, e.g. xG and xGA, for
+    several teams and window sizes at once. Appending a match costs O(1) per
+    team, metric and window, with no recompute of the season
+
+    With center=True the averages match pandas rolling(window, center=True):
+    the value of a match is only final once (window - 1) // 2 later matches
+    are known and stays NaN until then.
+
+        Parameters:
+            windows (tuple): Window sizes, e.g. (5, 10, 20)
+            metrics (tuple): Names of the metrics of every match
+            center (bool): Centre the windows on each match instead of ending
+            them there
+    """
+    def __init__(
+        self,
+        windows: tuple = (5, 10, 20),
+        metrics: tuple = ('xG', 'xGA'),
+        center: bool = True
+    ):
+        self.windows = tuple(windows)
+        self.metrics = tuple(metrics)
+        self.center = center
+        self.teams = {}
+
+    def _team(self, team: str)-> dict:
+        if team not in self.teams:
+            self.teams[team] = {
+                'rounds': [],
+                'values': {metric: [] for metric in self.metrics},
+                'rolling': {
+                    (metric, window): []
+                    for metric in self.metrics for window in self.windows
+                },
+                'state': {
+                    (metric, window): _RunningWindow(window)
+                    for metric in self.metrics for window in self.windows
+                },
+            }
+
+        return self.teams[team]
+
+    def append(
+        self,
+        team: str,
+        round_: int = None,
+        **values
+    )-> list:
+        """
+        Function to add the next match of a team
+
+            Parameters:
+                team (str): Name of the team
+                round_ (int): Round or match number, the match count if None
+                **values (float): Value of every metric, e.g. xG=1.2, xGA=0.4
+
+            Returns:
+                updates (list): (match index, metric, window, value) of every
+                rolling value made final by this match
+        """
+        state = self._team(team)
+        idx = len(state['rounds'])
+
+        state['rounds'].append(idx + 1 if round_ is None else round_)
+
+        updates = []
+
+        for metric in self.metrics:
+            value = float(values.get(metric, np.nan))
+            state['values'][metric].append(value)
+
+            for window in self.windows:
+                rolling = state['rolling'][(metric, window)]
+                rolling.append(np.nan)
+
+                mean = state['state'][(metric, window)].push(value)
+
+                # A centred window ending at this match belongs to an earlier
+                # match, which is now final:
+                pos = idx - (window - 1) // 2 if self.center else idx
+
+                if pos >= 0:
+                    rolling[pos] = mean
+
+                    if not math.isnan(mean):
+                        updates.append((pos, metric, window, mean))
+
+        return updates
+
+    def extend(
+        self,
+        data: pd.DataFrame,
+        team_col: str = None,
+        round_col: str = 'Round',
+        team: str = None
+    ):
+        """
+        Function to add many matches at once, in the order of the Dataframe
+
+            Parameters:
+                data (pd.DataFrame): Dataframe with one match per row and a
+                column for every metric
+                team_col (str): Column with the team names
+                round_col (str): Column with the round of the match
+                team (str): Team of every row, if there is no team column
+
+            Returns:
+                self (RollingXG): The engine, to allow chaining
+        """
+        teams = data[team_col].to_numpy() if team_col else [team] * len(data)
+        rounds = data[round_col].to_numpy() if round_col in data else [None] * len(data)
+        columns = [data[metric].to_numpy(dtype=float) for metric in self.metrics]
+
+        for i in range(len(data)):
+            self.append(
+                teams[i],
+                rounds[i],
+                **{metric: col[i] for metric, col in zip(self.metrics, columns)}
+            )
+
+        return self
+
+    def series(self, team: str)-> pd.DataFrame:
+        """
+        Function to get the current trend series of a team
+
+            Parameters:
+                team (str): Name of the team
+
+            Returns:
+                df (pd.DataFrame): One row per match with the Round, every
+                metric and a roll_<metric>_<window> column for every window
+        """
+        state = self._team(team)
+
+        df = pd.DataFrame({'Round': state['rounds']})
+
+        for metric in self.metrics:
+            df[metric] = state['values'][metric]
+
+        for metric in self.metrics:
+            for window in self.windows:
+                df[f'roll_{metric}_{window}'] = state['rolling'][(metric, window)]
+
+        return df
@@ -0,0 +1,248 @@
+# Importing the required packages:
+import os
+import uuid
+import urllib.parse
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+# Types of the understat shot fields in the store:
+SHOT_SCHEMA = pa.schema([
+    ('id', pa.int64()),
+    ('minute', pa.int16()),
+    ('result', pa.string()),
+    ('X', pa.float32()),
+    ('Y', pa.float32()),
+    ('xG', pa.float32()),
+    ('player', pa.string()),
+    ('h_a', pa.string()),
+    ('player_id', pa.int32()),
+    ('situation', pa.string()),
+    ('season', pa.int16()),
+    ('shotType', pa.string()),
+    ('match_id', pa.int32()),
+    ('h_team', pa.string()),
+    ('a_team', pa.string()),
+    ('h_goals', pa.int8()),
+    ('a_goals', pa.int8()),
+    ('date', pa.timestamp('s')),
+    ('player_assisted', pa.string()),
+    ('lastAction', pa.string()),
+    ('team', pa.string()),
+    ('league', pa.string()),
+])
+
+PARTITION_COLS = ('season', 'team')
+
+def _shot_table(data: pd.DataFrame)-> pa.Table:
+    """
+    Function to convert a shot Dataframe to an arrow table with the store
+    types, columns outside the schema keep the type arrow infers for them
+
+        Parameters:
+            data (pd.DataFrame): Dataframe containing the shot data
+
+        Returns:
+            table (pa.Table): Typed arrow table of the shots
+    """
+    # Dropping the pandas metadata so the columns are read back with the
+    # store types rather than the dtypes of the scraped Dataframe:
+    table = pa.Table.from_pandas(
+        data, preserve_index=False
+    ).replace_schema_metadata(None)
+
+    for i, name in enumerate(table.column_names):
+        if name in SHOT_SCHEMA.names:
+            field = SHOT_SCHEMA.field(name)
+            table = table.set_column(
+                i, field, pc.cast(table.column(i), field.type)
+            )
+
+    return table
+
+def _partition_dir(
+    store_dir: str,
+    partition_cols: tuple,
+    values: tuple
+)-> str:
+    """
+    Function to get the folder of a partition, using the hive key=value
+    layout with the values url-encoded
+
+        Parameters:
+            store_dir (str): Root folder of the shot store
+            partition_cols (tuple): Names of the partition columns
+            values (tuple): Values of the partition columns
+
+        Returns:
+            path (str): Folder of the partition
+    """
+    parts = [
+        f"{col}={urllib.parse.quote(str(val), safe='')}"
+        for col, val in zip(partition_cols, values)
+    ]
+
+    return os.path.join(store_dir, *parts)
+
+def _partitioning(partition_cols: tuple)-> ds.Partitioning:
+    """
+    Function to build the hive partitioning of the store with typed keys
+
+        Parameters:
+            partition_cols (tuple): Names of the partition columns
+
+        Returns:
+            partitioning (ds.Partitioning): Hive partitioning of the store
+    """
+    fields = [
+        SHOT_SCHEMA.field(col) if col in SHOT_SCHEMA.names
+        else pa.field(col, pa.string())
+        for col in partition_cols
+    ]
+
+    return ds.partitioning(pa.schema(fields), flavor='hive')
+
+def write_shots(
+    data: pd.DataFrame,
+    store_dir: str,
+    partition_cols: tuple = PARTITION_COLS
+)-> int:
+    """
+    Function to append shots to the Parquet shot store, dropping shots whose
+    id is already stored
+
+    Shots are split into one folder per partition, e.g.
+    season=2021/team=Chelsea. The team of a shot is the team of the player
+    taking it and is worked out from h_a if the data has no team column.
+
+        Parameters:
+            data (pd.DataFrame): Dataframe containing the shot data, as
+            returned by scrape_shots
+            store_dir (str): Root folder of the shot store
+            partition_cols (tuple): Columns the store is partitioned by,
+            e.g. ('season', 'league')
+
+        Returns:
+            n_new (int): Number of shots that were not in the store before
+    """
+    partition_cols = tuple(partition_cols)
+    df = data
+
+    if 'team' in partition_cols and 'team' not in df.columns:
+        df = df.assign(
+            team=np.where(df['h_a'] == 'h', df['h_team'], df['a_team'])
+        )
+
+    table = _shot_table(df)
+    n_new = 0
+
+    groups = df.groupby(list(partition_cols), sort=False, observed=True)
+
+    for values, group in groups.indices.items():
+        values = values if isinstance(values, tuple) else (values,)
+        part_dir = _partition_dir(store_dir, partition_cols, values)
+        part_file = os.path.join(part_dir, 'shots.parquet')
+
+        # The partition values live in the folder names, not in the files:
+        new = table.take(pa.array(group)).drop_columns(list(partition_cols))
+
+        if os.path.exists(part_file):
+            old = pq.read_table(part_file)
+            old_ids = old.column('id')
+            new_ids = new.column('id')
+
+            n_new += len(
+                pc.unique(new_ids.filter(pc.invert(pc.is_in(new_ids, old_ids))))
+            )
+
+            # Newly scraped shots replace the stored copies with the same id:
+            old = old.filter(pc.invert(pc.is_in(old_ids, new_ids)))
+            new = pa.concat_tables([old, new], promote_options='permissive')
+        else:
+            n_new += len(pc.unique(new.column('id')))
+
+        # Keeping the last copy of every shot id:
+        ids = new.column('id').to_numpy()
+        _, last = np.unique(ids[::-1], return_index=True)
+        keep = np.sort(len(ids) - 1 - last)
+        new = new.take(pa.array(keep))
+
+        # Writing to a temporary file first so readers never see half a file:
+        os.makedirs(part_dir, exist_ok=True)
+        tmp_file = os.path.join(part_dir, f'.{uuid.uuid4().hex}.tmp')
+        pq.write_table(new, tmp_file, compression='zstd')
+        os.replace(tmp_file, part_file)
+
+    return n_new
+
+def filter_expression(filters: dict = None)-> pc.Expression:
+    """
+    Function to build the arrow filter of a dict of column values
+
+        Parameters:
+            filters (dict): Values to keep for each column, a single value
+            or a list of values, e.g. {'team': 'Chelsea', 'season': [2020, 2021]}
+
+        Returns:
+            expression (pc.Expression): Filter keeping the rows matching
+            every column, None if there are no filters
+    """
+    expression = None
+
+    for col, values in (filters or {}).items():
+        many = isinstance(values, (list, tuple, set, np.ndarray, pd.Series))
+        values = pa.array(list(values) if many else [values])
+
+        # Casting the values to the store type so e.g. seasons can be given
+        # as the strings understat uses:
+        if col in SHOT_SCHEMA.names:
+            values = pc.cast(values, SHOT_SCHEMA.field(col).type)
+
+        if many:
+            condition = pc.field(col).isin(values)
+        else:
+            condition = pc.field(col) == values[0]
+
+        expression = condition if expression is None else expression & condition
+
+    return expression
+
+def read_shots(
+    store_dir: str,
+    columns: list = None,
+    filters: dict = None,
+    partition_cols: tuple = PARTITION_COLS
+)-> pd.DataFrame:
+    """
+    Function to read shots from the Parquet shot store
+
+    Filters on partition columns skip whole folders and filters on other
+    columns are checked against the Parquet row group statistics, so only
+    the files and columns needed are read.
+
+        Parameters:
+            store_dir (str): Root folder of the shot store
+            columns (list): Columns to read, every column if None
+            filters (dict): Values to keep for each column, a single value
+            or a list of values, e.g. {'team': 'Chelsea', 'season': [2020, 2021]}
+            partition_cols (tuple): Columns the store is partitioned by
+
+        Returns:
+            df (pd.DataFrame): Dataframe containing the shots matching the
+            filters
+    """
+    dataset = ds.dataset(
+        store_dir,
+        format='parquet',
+        partitioning=_partitioning(tuple(partition_cols)),
+        exclude_invalid_files=False,
+        ignore_prefixes=['.', '_'],
+    )
+
+    table = dataset.to_table(columns=columns, filter=filter_expression(filters))
+    df = table.to_pandas()
+
+    return df
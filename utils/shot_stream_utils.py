@@ -0,0 +1,440 @@
+# Importing the required packages:
+import os
+import time
+import numpy as np
+import pandas as pd
+from utils.coordinate_utils import transform_coordinates
+from utils.instrumentation_utils import stage
+from utils.shot_utils import zone_bounds, zone_indices, zone_frame
+
+# Rows read per chunk, small enough for a few chunks to fit in memory at once
+# and large enough to keep the per-chunk overhead low:
+CHUNK_SIZE = 100_000
+
+# File extensions of every supported format, a folder is read as Parquet:
+SOURCE_FORMATS = {
+    '.csv': 'csv',
+    '.tsv': 'csv',
+    '.jsonl': 'jsonl',
+    '.ndjson': 'jsonl',
+    '.json': 'jsonl',
+    '.parquet': 'parquet',
+    '.pq': 'parquet',
+}
+
+# Groups the per-group totals are kept for, by name and key columns:
+DEFAULT_GROUPS = {'player': ('player_id', 'player')}
+
+def source_format(path: str)-> str:
+    """
+    Function to get the format of a shot file from its extension, ignoring
+    any compression extension
+
+        Parameters:
+            path (str): Path of the file, a folder being a Parquet dataset
+
+        Returns:
+            fmt (str): 'csv', 'jsonl' or 'parquet'
+    """
+    if os.path.isdir(path):
+        return 'parquet'
+
+    root, ext = os.path.splitext(path.lower())
+
+    if ext in ('.gz', '.bz2', '.xz', '.zst', '.zip'):
+        ext = os.path.splitext(root)[1]
+
+    if ext not in SOURCE_FORMATS:
+        raise ValueError(
+            f'Unknown format of {path!r}, expected one of {sorted(SOURCE_FORMATS)} or a folder'
+        )
+
+    return SOURCE_FORMATS[ext]
+
+def _filter_frame(
+    chunk: pd.DataFrame,
+    filters: dict
+)-> pd.DataFrame:
+    """
+    Function to keep the rows of a chunk matching every filter
+
+        Parameters:
+            chunk (pd.DataFrame): Chunk of shots
+            filters (dict): Values to keep for each column, a single value
+            or a list of values
+
+        Returns:
+            chunk (pd.DataFrame): Rows matching the filters
+    """
+    mask = np.ones(len(chunk), dtype=bool)
+
+    for col, values in filters.items():
+        many = isinstance(values, (list, tuple, set, np.ndarray, pd.Series))
+        mask &= chunk[col].isin(list(values) if many else [values]).to_numpy()
+
+    return chunk if mask.all() else chunk[mask]
+
+def iter_shot_chunks(
+    source,
+    chunksize: int = CHUNK_SIZE,
+    columns: list = None,
+    filters: dict = None,
+    fmt: str = None
+):
+    """
+    Function to read shots in chunks, so only one chunk is in memory at a
+    time however large the input is
+
+    CSV and JSON lines files are read chunksize rows at a time. Parquet
+    files and folders, e.g. the shot store of shot_store_utils, are read
+    batch by batch, with the filters pushed down so whole partitions and row
+    groups are skipped.
+
+        Parameters:
+            source (str): Path of a CSV, JSON lines or Parquet file, a folder
+            of Parquet files, or a list of them
+            chunksize (int): Most rows per chunk
+            columns (list): Columns to read, every column if None
+            filters (dict): Values to keep for each column, a single value
+            or a list of values, e.g. {'season': [2020, 2021]}
+            fmt (str): 'csv', 'jsonl' or 'parquet', from the extension if None
+
+        Returns:
+            chunks (generator): Dataframes of at most chunksize shots
+    """
+    paths = [source] if isinstance(source, (str, os.PathLike)) else list(source)
+
+    for path in paths:
+        path = os.fspath(path)
+        path_fmt = fmt or source_format(path)
+
+        if path_fmt == 'parquet':
+            import pyarrow.dataset as ds
+            from utils.shot_store_utils import filter_expression
+
+            dataset = ds.dataset(
+                path,
+                format='parquet',
+                partitioning='hive',
+                ignore_prefixes=['.', '_'],
+            )
+            batches = dataset.to_batches(
+                columns=columns,
+                filter=filter_expression(filters),
+                batch_size=chunksize
+            )
+
+            for batch in batches:
+                if batch.num_rows:
+                    yield batch.to_pandas()
+
+            continue
+
+        if path_fmt == 'csv':
+            reader = pd.read_csv(
+                path,
+                chunksize=chunksize,
+                usecols=columns,
+                sep='\t' if '.tsv' in path.lower() else ','
+            )
+        elif path_fmt == 'jsonl':
+            reader = pd.read_json(path, lines=True, chunksize=chunksize)
+        else:
+            raise ValueError(f"Unknown format {path_fmt!r}, expected 'csv', 'jsonl' or 'parquet'")
+
+        with reader:
+            for chunk in reader:
+                if columns is not None and path_fmt == 'jsonl':
+                    chunk = chunk[list(columns)]
+
+                if filters:
+                    chunk = _filter_frame(chunk, filters)
+
+                if len(chunk):
+                    yield chunk
+
+def process_chunks(
+    chunks,
+    x_cords: str = 'X',
+    y_cords: str = 'Y',
+    coordinates: str = 'understat',
+    predicate=None
+):
+    """
+    Function to prepare every chunk of shots as it is read: filtering it,
+    converting its coordinates to Statsbomb and assigning the shot zones
+
+        Parameters:
+            chunks (iterable): Dataframes of shots, e.g. from iter_shot_chunks
+            x_cords (str): X coordinate column name
+            y_cords (str): Y coordinate column name
+            coordinates (str): Coordinate system of the shots, see
+            coordinate_utils, None if they are already Statsbomb coordinates
+            of a vertical pitch
+            predicate (callable): Function of a chunk returning the mask of
+            the shots to keep, e.g. lambda df: df['situation'] != 'Penalty'
+
+        Returns:
+            chunks (generator): The chunks with Statsbomb coordinates and a
+            categorical zone_area column
+    """
+    names, bounds = zone_bounds()
+    categories = names[:-1].astype(str)
+
+    for chunk in chunks:
+        if predicate is not None:
+            chunk = chunk[np.asarray(predicate(chunk), dtype=bool)]
+
+        if not len(chunk):
+            continue
+
+        # The chunk is a copy of the file, so it is converted in place:
+        if coordinates is not None:
+            transform_coordinates(
+                chunk,
+                x_cords,
+                y_cords,
+                source=coordinates,
+                target='statsbomb',
+                vertical=True,
+                inplace=True
+            )
+
+        codes = zone_indices(chunk[x_cords], chunk[y_cords])
+        codes[codes == len(bounds)] = -1
+
+        chunk['zone_area'] = pd.Categorical.from_codes(codes, categories=categories)
+
+        yield chunk
+
+class ShotAggregator:
+    """
+    Class summing the zone totals and per-group totals of shots chunk by
+    chunk. Its memory grows with the number of groups, e.g. players, and
+    not with the number of shots. Aggregators of separate inputs, e.g. one
+    per league in separate processes, are combined with merge
+
+        Parameters:
+            by (dict): Key columns of every group, by group name,
+            DEFAULT_GROUPS if None
+            x_pos (str): Column of the x-coordinate of the shots, for chunks
+            without a zone_area column
+            y_pos (str): Column of the y-coordinate of the shots
+    """
+    def __init__(
+        self,
+        by: dict = None,
+        x_pos: str = 'X',
+        y_pos: str = 'Y'
+    ):
+        self.by = {name: list(keys) for name, keys in (DEFAULT_GROUPS if by is None else by).items()}
+        self.x_pos = x_pos
+        self.y_pos = y_pos
+
+        names, _ = zone_bounds()
+        self.categories = names[:-1]
+        n_zones = len(self.categories)
+
+        self.num_shots = np.zeros(n_zones, dtype=np.int64)
+        self.xg = np.zeros(n_zones, dtype=float)
+        self.goals = np.zeros(n_zones, dtype=np.int64)
+        self.totals = {name: None for name in self.by}
+        self.shots = 0
+        self.chunks = 0
+
+    def _zone_codes(self, chunk: pd.DataFrame)-> np.ndarray:
+        n_zones = len(self.categories)
+
+        if 'zone_area' in chunk.columns:
+            codes = pd.Categorical(
+                chunk['zone_area'], categories=self.categories
+            ).codes.astype(np.intp)
+            codes[codes < 0] = n_zones
+        else:
+            codes = zone_indices(chunk[self.x_pos], chunk[self.y_pos])
+
+        return codes
+
+    def _combine(
+        self,
+        name: str,
+        part: pd.DataFrame
+    ):
+        current = self.totals[name]
+
+        if current is None:
+            self.totals[name] = part
+            return
+
+        # Concatenating the two partial totals and summing the groups they
+        # share, so only one row per group is ever kept:
+        levels = list(range(part.index.nlevels))
+        self.totals[name] = pd.concat([current, part]).groupby(
+            level=levels, sort=False
+        ).sum()
+
+    def update(self, chunk: pd.DataFrame):
+        """
+        Function to add a chunk of shots to the totals
+
+            Parameters:
+                chunk (pd.DataFrame): Shots with xG and result columns, and
+                a zone_area column or Statsbomb X-Y coordinates
+
+            Returns:
+                aggregator (ShotAggregator): The aggregator itself
+        """
+        n_zones = len(self.categories)
+
+        codes = self._zone_codes(chunk)
+        xg = chunk['xG'].to_numpy(dtype=float)
+        goal = (chunk['result'] == 'Goal').to_numpy()
+
+        self.num_shots += np.bincount(codes, minlength=n_zones + 1)[:n_zones]
+        self.xg += np.bincount(codes, weights=xg, minlength=n_zones + 1)[:n_zones]
+        self.goals += np.bincount(codes, weights=goal, minlength=n_zones + 1)[:n_zones].astype(np.int64)
+
+        for name, keys in self.by.items():
+            part = chunk[keys].assign(xG=xg, goals=goal.astype(np.int64)).groupby(
+                keys, observed=True, sort=False
+            ).agg(shots=('xG', 'size'), xG=('xG', 'sum'), goals=('goals', 'sum'))
+
+            self._combine(name, part)
+
+        self.shots += len(chunk)
+        self.chunks += 1
+
+        return self
+
+    def merge(self, other: 'ShotAggregator'):
+        """
+        Function to add the totals of another aggregator to this one
+
+            Parameters:
+                other (ShotAggregator): Aggregator with the same groups
+
+            Returns:
+                aggregator (ShotAggregator): The aggregator itself
+        """
+        if other.by != self.by:
+            raise ValueError(f'Cannot merge groups {other.by} into {self.by}')
+
+        self.num_shots += other.num_shots
+        self.xg += other.xg
+        self.goals += other.goals
+
+        for name, part in other.totals.items():
+            if part is not None:
+                self._combine(name, part)
+
+        self.shots += other.shots
+        self.chunks += other.chunks
+
+        return self
+
+    def zones(self)-> pd.DataFrame:
+        """
+        Function to get the zone totals
+
+            Returns:
+                data (pd.DataFrame): One row per zone, the same table as
+                zone_stats of all the shots
+        """
+        return zone_frame(self.num_shots, self.xg, self.goals)
+
+    def groups(self, name: str)-> pd.DataFrame:
+        """
+        Function to get the totals of every group
+
+            Parameters:
+                name (str): Name of the groups, a key of by
+
+            Returns:
+                data (pd.DataFrame): One row per group with its key columns,
+                shots, xG, goals, xG per shot and conversion rate, most xG
+                first
+        """
+        keys = self.by[name]
+        totals = self.totals[name]
+
+        if totals is None:
+            return pd.DataFrame(columns=keys + ['shots', 'xG', 'goals', 'xG_per_shot', 'conversion'])
+
+        data = totals.reset_index()
+        data['shots'] = data['shots'].astype(np.int64)
+        data['goals'] = data['goals'].astype(np.int64)
+        data['xG_per_shot'] = data['xG'] / data['shots']
+        data['conversion'] = data['goals'] / data['shots']
+
+        return data.sort_values('xG', ascending=False, kind='stable').reset_index(drop=True)
+
+def aggregate_shots(
+    source,
+    chunksize: int = CHUNK_SIZE,
+    filters: dict = None,
+    predicate=None,
+    by: dict = None,
+    columns: list = None,
+    x_cords: str = 'X',
+    y_cords: str = 'Y',
+    coordinates: str = 'understat',
+    fmt: str = None
+)-> dict:
+    """
+    Function to aggregate shots from files of any size, chunk by chunk: the
+    shots are read, filtered, converted to Statsbomb coordinates, assigned
+    their zones and added to the totals, so at most one chunk is in memory
+
+        Parameters:
+            source (str): Path of a CSV, JSON lines or Parquet file, a folder
+            of Parquet files, or a list of them
+            chunksize (int): Most rows per chunk
+            filters (dict): Values to keep for each column, e.g.
+            {'season': 2021}, pushed down to Parquet inputs
+            predicate (callable): Function of a chunk returning the mask of
+            the shots to keep
+            by (dict): Key columns of every group, DEFAULT_GROUPS if None
+            columns (list): Columns to read, only the ones the totals and
+            filters need if None and no predicate is given, every column
+            otherwise
+            x_cords (str): X coordinate column name
+            y_cords (str): Y coordinate column name
+            coordinates (str): Coordinate system of the shots, None if they
+            are already Statsbomb coordinates of a vertical pitch
+            fmt (str): 'csv', 'jsonl' or 'parquet', from the extension if None
+
+        Returns:
+            result (dict): Zone table, totals of every group by name, number
+            of shots and chunks, and the time taken
+    """
+    start = time.perf_counter()
+    aggregator = ShotAggregator(by=by, x_pos=x_cords, y_pos=y_cords)
+
+    if columns is None and predicate is None:
+        needed = [x_cords, y_cords, 'xG', 'result', *(filters or {})]
+        needed += [key for keys in aggregator.by.values() for key in keys]
+        columns = list(dict.fromkeys(needed))
+
+    with stage('aggregate_shots', source=str(source)) as record:
+        chunks = process_chunks(
+            iter_shot_chunks(source, chunksize, columns, filters, fmt),
+            x_cords=x_cords,
+            y_cords=y_cords,
+            coordinates=coordinates,
+            predicate=predicate
+        )
+
+        for chunk in chunks:
+            with stage('aggregate_chunk', rows=len(chunk)):
+                aggregator.update(chunk)
+
+        n_shots = aggregator.shots
+        record['rows'] = n_shots
+
+    return {
+        'zones': aggregator.zones(),
+        'groups': {name: aggregator.groups(name) for name in aggregator.by},
+        'shots': n_shots,
+        'chunks': aggregator.chunks,
+        'seconds': time.perf_counter() - start,
+    }
@@ -0,0 +1,313 @@
+# Importing the required packages:
+import numpy as np
+import pandas as pd
+from utils.coordinate_utils import transform_coordinates
+from utils.instrumentation_utils import timed
+
+@timed(rows='data')
+def convert_to_statsbomb(
+    data: pd.DataFrame,
+    x_cords: str,
+    y_cords: str,
+    inplace: bool = False
+)-> pd.DataFrame:
+    """
+    Function to convert understat X and Y coordinate data to Statsbomb coordinates
+
+    The X-Y values are swapped so they can be plotted straight on a vertical
+    Statsbomb pitch. Other providers can be converted with 
+    utils.coordinate_utils.transform_coordinates.
+
+        Parameters:
+            data (pd.DataFrame): Dataframe containing X-Y data 
+            x_cords (str): X coordinate column name
+            y_cords (str): Y coordinate column name
+            inplace (bool): Overwrite the coordinate columns of data instead
+            of working on a copy
+        
+        Returns:
+            df (pd.DataFrame): Updated Dataframe with Statsbomb X-Y 
+            coordinates
+    
+    """
+    df = data if inplace else data.copy()
+
+    # Rescaling the coordinates from 0-1 to the statsbomb scale and swapping
+    # X and Y in a single step:
+    transform_coordinates(
+        df,
+        x_cords,
+        y_cords,
+        source='understat',
+        target='statsbomb',
+        vertical=True,
+        inplace=True
+    )
+
+    return df
+
+# Defining zone areas for shot zone plot:
+zone_areas = {
+    'zone_1': {
+        'x_lower_bound': 0.0, 'x_upper_bound': 18.0,
+        'y_lower_bound': 102.0, 'y_upper_bound': 120.0,
+    },
+    'zone_2': {
+        'x_lower_bound': 62.0, 'x_upper_bound': 80.0,
+        'y_lower_bound': 102.0, 'y_upper_bound': 120.0,
+    },
+    'zone_3': {
+        'x_lower_bound': 0.0, 'x_upper_bound': 18.0,
+        'y_lower_bound': 55.0, 'y_upper_bound': 102.0,        
+    },
+    'zone_4': {
+        'x_lower_bound': 62.0, 'x_upper_bound': 80.0,
+        'y_lower_bound': 55.0, 'y_upper_bound': 102.0,
+    },
+    'zone_5': {
+        'x_lower_bound': 50.0, 'x_upper_bound': 62.0,
+        'y_lower_bound': 102.0, 'y_upper_bound': 120.0,
+    },
+    'zone_6': {
+        'x_lower_bound': 18.0, 'x_upper_bound': 30.0,
+        'y_lower_bound': 102.0, 'y_upper_bound': 120.0,
+    },
+    'zone_7': {
+        'x_lower_bound': 30.0, 'x_upper_bound': 50.0,
+        'y_lower_bound': 102.0, 'y_upper_bound': 114.0,
+    },
+    'zone_8': {
+        'x_lower_bound': 30.0, 'x_upper_bound': 50.0,
+        'y_lower_bound': 114.0, 'y_upper_bound': 120.0,
+    },
+    'zone_9': {
+        'x_lower_bound': 50.0, 'x_upper_bound': 62.0,
+        'y_lower_bound': 85.8, 'y_upper_bound': 102.0,
+    },
+    'zone_10': {
+        'x_lower_bound': 18.0, 'x_upper_bound': 30.0,
+        'y_lower_bound': 85.8, 'y_upper_bound': 102.0,
+    },
+    'zone_11': {
+        'x_lower_bound': 30.0, 'x_upper_bound': 50.0,
+        'y_lower_bound': 85.8, 'y_upper_bound': 102.0,
+    },
+    'zone_12': {
+        'x_lower_bound': 18.0, 'x_upper_bound': 62.0,
+        'y_lower_bound': 55.0, 'y_upper_bound': 85.8,
+    }
+}
+
+def assign_shot_zones(
+    x: float,
+    y: float
+)-> str:
+    """
+    Function to assign shot zones based on x and y coordinate values of the shot
+
+        Parameters:
+            x (float): x coordinate of the shot
+            y (float): y coordinate of the shot
+
+        Returns:
+            zone (str): Shot zone based on x and y coordinate values of the shot 
+    """
+    for zone in zone_areas:
+        if (
+            (x >= zone_areas[zone]['x_lower_bound']) 
+            & (x <= zone_areas[zone]['x_upper_bound'])
+        ):
+            if (
+                (y >= zone_areas[zone]['y_lower_bound']) 
+                & (y <= zone_areas[zone]['y_upper_bound'])
+            ):
+                return zone
+
+def _build_zone_bounds()-> tuple:
+    """
+    Function to collect the zone names and their bounds as arrays, in the
+    same order as the zone_areas dictionary
+
+        Returns:
+            names (np.ndarray): Zone names followed by None for unmatched shots
+            bounds (np.ndarray): Array of shape (n_zones, 4) holding the
+            x lower, x upper, y lower and y upper bound of every zone
+    """
+    names = np.array(list(zone_areas.keys()) + [None], dtype=object)
+
+    bounds = np.array(
+        [
+            [
+                zone_areas[zone]['x_lower_bound'],
+                zone_areas[zone]['x_upper_bound'],
+                zone_areas[zone]['y_lower_bound'],
+                zone_areas[zone]['y_upper_bound'],
+            ]
+            for zone in zone_areas
+        ],
+        dtype=float
+    ).reshape(-1, 4)
+
+    # Shared by every caller, so they are made read-only:
+    names.setflags(write=False)
+    bounds.setflags(write=False)
+
+    return names, bounds
+
+# Built once, the zones do not change:
+_zone_names, _zone_bounds = _build_zone_bounds()
+
+def zone_bounds()-> tuple:
+    """
+    Function to get the zone names and their bounds as read-only arrays, in
+    the same order as the zone_areas dictionary
+
+        Returns:
+            names (np.ndarray): Zone names followed by None for unmatched shots
+            bounds (np.ndarray): Array of shape (n_zones, 4) holding the
+            x lower, x upper, y lower and y upper bound of every zone
+    """
+    return _zone_names, _zone_bounds
+
+def zone_indices(
+    x: np.ndarray,
+    y: np.ndarray
+)-> np.ndarray:
+    """
+    Function to find the index of the shot zone of every shot, in the order
+    of the zone_areas dictionary
+
+        Parameters:
+            x (np.ndarray): x coordinates of the shots (array or Series)
+            y (np.ndarray): y coordinates of the shots (array or Series)
+
+        Returns:
+            zone_idx (np.ndarray): Zone index of every shot, the number of
+            zones for shots outside every zone
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+
+    _, bounds = zone_bounds()
+
+    # Index of the zone for every shot, len(bounds) meaning no zone:
+    zone_idx = np.full(x.shape, len(bounds), dtype=np.intp)
+
+    # Going through the zones in reverse so the first matching zone wins on
+    # shared boundaries, just like the loop in assign_shot_zones:
+    for i in range(len(bounds) - 1, -1, -1):
+        x_low, x_high, y_low, y_high = bounds[i]
+
+        in_zone = (
+            (x >= x_low) & (x <= x_high)
+            & (y >= y_low) & (y <= y_high)
+        )
+
+        zone_idx[in_zone] = i
+
+    return zone_idx
+
+@timed(rows='x')
+def assign_shot_zones_batch(
+    x: np.ndarray,
+    y: np.ndarray
+)-> np.ndarray:
+    """
+    Function to assign shot zones to every shot at once, giving the same
+    result as calling assign_shot_zones on each x-y pair
+
+        Parameters:
+            x (np.ndarray): x coordinates of the shots (array or Series)
+            y (np.ndarray): y coordinates of the shots (array or Series)
+
+        Returns:
+            zones (np.ndarray): Object array of shot zones, None for shots
+            outside every zone
+    """
+    names, _ = zone_bounds()
+
+    return names[zone_indices(x, y)]
+
+@timed(rows='shots')
+def zone_stats(
+    shots: pd.DataFrame,
+    x_pos: str = 'X',
+    y_pos: str = 'Y'
+)-> pd.DataFrame:
+    """
+    Function to aggregate the shots of every shot zone in one pass
+
+    The zone_area column is used if the shots have one, otherwise the zones
+    are assigned from the Statsbomb X-Y coordinates.
+
+        Parameters:
+            shots (pd.DataFrame): Dataframe containing the shot data
+            x_pos (str): Column of the x-coordinate of the shots
+            y_pos (str): Column of the y-coordinate of the shots
+
+        Returns:
+            data (pd.DataFrame): One row per zone with the number of shots,
+            share of shots (pct), summed xG, goals, conversion rate and xG 
+            per shot, ready for plot_shot_zones
+    """
+    names, bounds = zone_bounds()
+    n_zones = len(bounds)
+
+    if 'zone_area' in shots.columns:
+        zone_idx = pd.Categorical(
+            shots['zone_area'], categories=names[:-1]
+        ).codes.astype(np.intp)
+        zone_idx[zone_idx < 0] = n_zones
+    else:
+        zone_idx = zone_indices(shots[x_pos], shots[y_pos])
+
+    xg = shots['xG'].to_numpy(dtype=float)
+    goal = (shots['result'] == 'Goal').to_numpy(dtype=float)
+
+    # Counting and summing over every zone at once, dropping the last bin
+    # that holds the shots outside every zone:
+    num_shots = np.bincount(zone_idx, minlength=n_zones + 1)[:n_zones]
+    xg_sum = np.bincount(zone_idx, weights=xg, minlength=n_zones + 1)[:n_zones]
+    goals = np.bincount(zone_idx, weights=goal, minlength=n_zones + 1)[:n_zones]
+
+    return zone_frame(num_shots, xg_sum, goals)
+
+def zone_frame(
+    num_shots: np.ndarray,
+    xg_sum: np.ndarray,
+    goals: np.ndarray
+)-> pd.DataFrame:
+    """
+    Function to build the table of zone_stats from the totals of every zone,
+    so totals summed over several batches of shots give the same table
+
+        Parameters:
+            num_shots (np.ndarray): Number of shots of every zone, in the
+            order of the zone_areas dictionary
+            xg_sum (np.ndarray): Summed xG of every zone
+            goals (np.ndarray): Number of goals of every zone
+
+        Returns:
+            data (pd.DataFrame): One row per zone, see zone_stats
+    """
+    names, _ = zone_bounds()
+    n_zones = len(names) - 1
+
+    num_shots = np.asarray(num_shots)
+    xg_sum = np.asarray(xg_sum, dtype=float)
+    goals = np.asarray(goals)
+
+    total = num_shots.sum()
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        data = pd.DataFrame({
+            'zone_area': names[:-1].astype(str),
+            'num_shots': num_shots,
+            'pct': num_shots / total if total else np.zeros(n_zones),
+            'xG': xg_sum,
+            'goals': goals.astype(int),
+            'conversion': goals / num_shots,
+            'xG_per_shot': xg_sum / num_shots,
+        })
+
+    return data
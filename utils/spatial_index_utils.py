@@ -0,0 +1,374 @@
+# Importing the required packages:
+import numpy as np
+import pandas as pd
+
+# Named rectangles on the vertical Statsbomb pitch of convert_to_statsbomb,
+# as (x lower, x upper, y lower, y upper). The shot zones of shot_utils
+# are added to these by regions():
+PITCH_REGIONS = {
+    'six_yard_box': (30.0, 50.0, 114.0, 120.0),
+    'penalty_area': (18.0, 62.0, 102.0, 120.0),
+    'attacking_half': (0.0, 80.0, 60.0, 120.0),
+}
+
+# Penalty spot of the vertical Statsbomb pitch:
+PENALTY_SPOT = (40.0, 108.0)
+
+def regions()-> dict:
+    """
+    Function to get every named region, the pitch regions and the shot zones
+    of shot_utils.zone_areas
+
+        Returns:
+            regions (dict): (x lower, x upper, y lower, y upper) of every region
+    """
+    from utils.shot_utils import zone_areas
+
+    named = {
+        zone: (
+            bounds['x_lower_bound'], bounds['x_upper_bound'],
+            bounds['y_lower_bound'], bounds['y_upper_bound'],
+        )
+        for zone, bounds in zone_areas.items()
+    }
+    named.update(PITCH_REGIONS)
+
+    return named
+
+def register_region(
+    name: str,
+    x_lower: float,
+    x_upper: float,
+    y_lower: float,
+    y_upper: float
+):
+    """
+    Function to add a named rectangle that can be queried with
+    ShotIndex.region
+
+        Parameters:
+            name (str): Name of the region
+            x_lower (float): Lower x bound
+            x_upper (float): Upper x bound
+            y_lower (float): Lower y bound
+            y_upper (float): Upper y bound
+    """
+    PITCH_REGIONS[name] = (float(x_lower), float(x_upper), float(y_lower), float(y_upper))
+
+class ShotIndex:
+    """
+    Class indexing shot coordinates in a uniform grid of buckets. The points
+    are sorted by bucket, row after row, so the buckets of one grid row
+    covered by a query are a single slice of the sorted points. Only the
+    points of buckets on the edge of a rectangle are tested
+
+    All queries include their boundary and return the positions of the
+    matching shots, e.g. for shots.iloc[idx]. The positions come bucket by
+    bucket, sort=True orders them like the Dataframe at an extra cost.
+
+        Parameters:
+            x (np.ndarray): x coordinates of the shots (array or Series)
+            y (np.ndarray): y coordinates of the shots (array or Series)
+            cell_size (float): Width and height of a bucket
+    """
+    def __init__(
+        self,
+        x: np.ndarray,
+        y: np.ndarray,
+        cell_size: float = 2.0
+    ):
+        x = np.asarray(x, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+
+        valid = ~(np.isnan(x) | np.isnan(y))
+        rows = np.flatnonzero(valid)
+
+        self.n_points = len(x)
+        self.cell_size = float(cell_size)
+
+        if len(rows):
+            self.x0, self.y0 = x[rows].min(), y[rows].min()
+            x1, y1 = x[rows].max(), y[rows].max()
+        else:
+            self.x0 = self.y0 = x1 = y1 = 0.0
+
+        self.n_cols = int((x1 - self.x0) // self.cell_size) + 1
+        self.n_rows = int((y1 - self.y0) // self.cell_size) + 1
+
+        cells = self._cell_ids(x[rows], y[rows])
+        order = np.argsort(cells, kind='stable')
+
+        # Shots without coordinates are left out of every bucket:
+        self.order = rows[order]
+        self.xs = x[self.order]
+        self.ys = y[self.order]
+        self.starts = np.searchsorted(
+            cells[order], np.arange(self.n_rows * self.n_cols + 1)
+        )
+
+    @classmethod
+    def from_frame(
+        cls,
+        shots: pd.DataFrame,
+        x_pos: str = 'X',
+        y_pos: str = 'Y',
+        cell_size: float = 2.0
+    ):
+        """
+        Function to index the shots of a Dataframe
+
+            Parameters:
+                shots (pd.DataFrame): Dataframe containing Statsbomb X-Y data,
+                e.g. from convert_to_statsbomb
+                x_pos (str): X coordinate column name
+                y_pos (str): Y coordinate column name
+                cell_size (float): Width and height of a bucket
+
+            Returns:
+                index (ShotIndex): Index of the shots
+        """
+        return cls(shots[x_pos].to_numpy(), shots[y_pos].to_numpy(), cell_size)
+
+    def _cell_ids(self, x: np.ndarray, y: np.ndarray)-> np.ndarray:
+        col = ((x - self.x0) // self.cell_size).astype(np.intp)
+        row = ((y - self.y0) // self.cell_size).astype(np.intp)
+
+        return row * self.n_cols + col
+
+    def _span(
+        self,
+        lower: float,
+        upper: float,
+        origin: float,
+        n_cells: int
+    )-> tuple:
+        """
+        Function to get the buckets along one axis touching an interval, and
+        those lying fully inside it
+
+            Parameters:
+                lower (float): Lower bound of the interval
+                upper (float): Upper bound of the interval
+                origin (float): Start of the first bucket
+                n_cells (int): Number of buckets along the axis
+
+            Returns:
+                first, last (int): First and last bucket touching the interval,
+                first above last if the interval misses every bucket
+                inner_first, inner_last (int): First and last bucket inside it
+        """
+        first = int((lower - origin) // self.cell_size)
+        last = int((upper - origin) // self.cell_size)
+
+        # An interval past either end of the grid touches no bucket, and
+        # clamping it would turn it into a backward range:
+        if first > n_cells - 1 or last < 0:
+            return 0, -1, 0, -1
+
+        first, last = max(first, 0), min(last, n_cells - 1)
+
+        inner_first = max(int(np.ceil((lower - origin) / self.cell_size)), 0)
+        inner_last = min(int((upper - origin) // self.cell_size) - 1, n_cells - 1)
+
+        return first, last, inner_first, inner_last
+
+    def _result(
+        self,
+        pieces: list,
+        sort: bool
+    )-> np.ndarray:
+        """
+        Function to join the shot positions found in every grid row
+
+            Parameters:
+                pieces (list): Arrays of shot positions
+                sort (bool): Return the positions in increasing order
+
+            Returns:
+                idx (np.ndarray): Positions of the shots
+        """
+        idx = np.concatenate(pieces) if pieces else np.empty(0, dtype=np.intp)
+
+        if not sort:
+            return idx
+
+        # Large results are cheaper to order through a mask than a sort:
+        if len(idx) * 32 > self.n_points:
+            mask = np.zeros(self.n_points, dtype=bool)
+            mask[idx] = True
+            return np.flatnonzero(mask)
+
+        return np.sort(idx)
+
+    def rect(
+        self,
+        x_lower: float,
+        x_upper: float,
+        y_lower: float,
+        y_upper: float,
+        sort: bool = False
+    )-> np.ndarray:
+        """
+        Function to find the shots inside a rectangle
+
+            Parameters:
+                x_lower (float): Lower x bound
+                x_upper (float): Upper x bound
+                y_lower (float): Lower y bound
+                y_upper (float): Upper y bound
+                sort (bool): Return the positions in increasing order instead
+                of bucket order
+
+            Returns:
+                idx (np.ndarray): Positions of the shots
+        """
+        c0, c1, ci0, ci1 = self._span(x_lower, x_upper, self.x0, self.n_cols)
+        r0, r1, ri0, ri1 = self._span(y_lower, y_upper, self.y0, self.n_rows)
+
+        if c0 > c1 or r0 > r1:
+            return self._result([], sort)
+
+        starts, xs, ys, order = self.starts, self.xs, self.ys, self.order
+        pieces = []
+
+        def tested(begin, end):
+            x, y = xs[begin:end], ys[begin:end]
+            inside = (x >= x_lower) & (x <= x_upper) & (y >= y_lower) & (y <= y_upper)
+            return order[begin:end][inside]
+
+        for row in range(r0, r1 + 1):
+            first = row * self.n_cols
+            begin, end = starts[first + c0], starts[first + c1 + 1]
+
+            if begin == end:
+                continue
+
+            if not (ri0 <= row <= ri1 and ci0 <= ci1):
+                pieces.append(tested(begin, end))
+                continue
+
+            # Only the buckets on the left and right edge need a test:
+            inner_begin, inner_end = starts[first + ci0], starts[first + ci1 + 1]
+
+            pieces.append(tested(begin, inner_begin))
+            pieces.append(order[inner_begin:inner_end])
+            pieces.append(tested(inner_end, end))
+
+        return self._result(pieces, sort)
+
+    def radius(
+        self,
+        x: float,
+        y: float,
+        r: float,
+        sort: bool = False
+    )-> np.ndarray:
+        """
+        Function to find the shots within a distance of a point
+
+            Parameters:
+                x (float): x coordinate of the centre, e.g. PENALTY_SPOT[0]
+                y (float): y coordinate of the centre
+                r (float): Distance in pitch units
+                sort (bool): Return the positions in increasing order instead
+                of bucket order
+
+            Returns:
+                idx (np.ndarray): Positions of the shots
+        """
+        r0, r1, _, _ = self._span(y - r, y + r, self.y0, self.n_rows)
+
+        starts, xs, ys, order = self.starts, self.xs, self.ys, self.order
+        pieces = []
+
+        for row in range(r0, r1 + 1):
+            # Narrowing every grid row to the chord of the circle over it:
+            row_low = self.y0 + row * self.cell_size
+            dy = max(row_low - y, y - (row_low + self.cell_size), 0.0)
+            half = np.sqrt(max(r * r - dy * dy, 0.0))
+
+            c0, c1, _, _ = self._span(x - half, x + half, self.x0, self.n_cols)
+            if c0 > c1:
+                continue
+
+            first = row * self.n_cols
+            begin, end = starts[first + c0], starts[first + c1 + 1]
+
+            if begin == end:
+                continue
+
+            dx, dy = xs[begin:end] - x, ys[begin:end] - y
+            pieces.append(order[begin:end][dx * dx + dy * dy <= r * r])
+
+        return self._result(pieces, sort)
+
+    def polygon(
+        self,
+        vertices,
+        sort: bool = False
+    )-> np.ndarray:
+        """
+        Function to find the shots inside a polygon
+
+            Parameters:
+                vertices (list): (x, y) corners of the polygon, in order
+                sort (bool): Return the positions in increasing order instead
+                of bucket order
+
+            Returns:
+                idx (np.ndarray): Positions of the shots
+        """
+        from matplotlib.path import Path
+
+        vertices = np.asarray(vertices, dtype=np.float64)
+        (x_lower, y_lower), (x_upper, y_upper) = vertices.min(0), vertices.max(0)
+
+        c0, c1, _, _ = self._span(x_lower, x_upper, self.x0, self.n_cols)
+        r0, r1, _, _ = self._span(y_lower, y_upper, self.y0, self.n_rows)
+
+        if c0 > c1 or r0 > r1:
+            return self._result([], sort)
+
+        # A tiny radius keeps the points lying on the edges, like rect does:
+        paths = [Path(vertices), Path(vertices[::-1])]
+        pieces = []
+
+        for row in range(r0, r1 + 1):
+            first = row * self.n_cols
+            begin, end = self.starts[first + c0], self.starts[first + c1 + 1]
+
+            if begin == end:
+                continue
+
+            points = np.column_stack([self.xs[begin:end], self.ys[begin:end]])
+            inside = paths[0].contains_points(points, radius=1e-9)
+            inside |= paths[1].contains_points(points, radius=1e-9)
+
+            pieces.append(self.order[begin:end][inside])
+
+        return self._result(pieces, sort)
+
+    def region(
+        self,
+        name: str,
+        sort: bool = False
+    )-> np.ndarray:
+        """
+        Function to find the shots inside a named region, e.g. 'zone_7' or
+        'six_yard_box'. Shots on the line between two shot zones belong to
+        both, unlike in assign_shot_zones
+
+            Parameters:
+                name (str): Name of the region, see regions()
+                sort (bool): Return the positions in increasing order instead
+                of bucket order
+
+            Returns:
+                idx (np.ndarray): Positions of the shots
+        """
+        named = regions()
+
+        if name not in named:
+            raise KeyError(f'Unknown region {name!r}, expected one of {list(named)}')
+
+        return self.rect(*named[name], sort=sort)
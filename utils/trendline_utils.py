@@ -0,0 +1,741 @@
+# Importing the required packages:
+import os
+import re
+import time
+import numpy as np
+import pandas as pd
+from utils.instrumentation_utils import stage
+from utils.report_utils import run_jobs, save_figure
+
+# Default look of the trend figures, any key can be overridden per run:
+TREND_DEFAULTS = {
+    'bg': '#141414',
+    'for_col': '#2F2FFF',
+    'against_col': '#FF0000',
+    'text_col': 'white',
+    'title_font': 'Open Sans',
+    'body_font': 'Calibri',
+    'window': 10,
+    'league': 'English Premier League',
+    'source': 'Data: Fbref | Statsbomb',
+    'credit': 'By: Anish Nair\n(@AniNair14)',
+    'axis_width': 15,
+    'height': 20,
+    'dpi': 100,
+    'preset': None,
+    'context_col': '#5A5A5A',
+    'context_alpha': 0.5,
+    'panel_width': 6,
+    'panel_height': 4,
+}
+
+def match_number(rounds: pd.Series)-> pd.Series:
+    """
+    Function to get the match number of every round, e.g. 12 for 'Matchweek 12'
+
+        Parameters:
+            rounds (pd.Series): Round column, numbers or labels holding one
+
+        Returns:
+            rounds (pd.Series): Integer match numbers
+    """
+    if pd.api.types.is_numeric_dtype(rounds):
+        return rounds.astype(int)
+
+    return rounds.astype(str).str.extract(r'(\d+)', expand=False).astype(int)
+
+def season_label(season: str)-> str:
+    """
+    Function to write a season the way the figures show it, e.g. '19/20' as
+    '2019-20'
+
+        Parameters:
+            season (str): Season value of the data
+
+        Returns:
+            label (str): Season label
+    """
+    found = re.fullmatch(r'(\d{2})/(\d{2})', str(season))
+
+    if found is None:
+        return str(season)
+
+    return f'20{found.group(1)}-{found.group(2)}'
+
+def prepare_trends(
+    data: pd.DataFrame,
+    team_col: str = 'Team',
+    team: str = None,
+    window: int = 10
+)-> pd.DataFrame:
+    """
+    Function to add the rolling xG for and against of every team to a table
+    of matches
+
+        Parameters:
+            data (pd.DataFrame): One match per row with Round, xG, xGA and
+            Season columns
+            team_col (str): Column with the team names
+            team (str): Team of every row, if there is no team column
+            window (int): Number of games of the rolling average
+
+        Returns:
+            df (pd.DataFrame): Copy of the data sorted by team, season and
+            round, with the match number in Round and the roll_xGF and
+            roll_xGA columns
+    """
+    df = data.copy()
+
+    if team_col not in df:
+        df[team_col] = team
+
+    df['Round'] = match_number(df['Round'])
+
+    # Postponed games are listed out of order, the trend follows the rounds:
+    df = df.sort_values([team_col, 'Season', 'Round'], kind='stable')
+
+    # One groupby for every team, rolling over all their seasons in a row:
+    rolling = df.groupby(team_col, sort=False)[['xG', 'xGA']].rolling(
+        window=window,
+        center=True
+    ).mean().reset_index(level=0, drop=True)
+
+    df['roll_xGF'] = rolling['xG']
+    df['roll_xGA'] = rolling['xGA']
+
+    return df
+
+def trend_style(
+    data: pd.DataFrame,
+    **overrides
+)-> dict:
+    """
+    Function to build the axis styling shared by every trend figure of a run,
+    so all teams are drawn on the same scale
+
+        Parameters:
+            data (pd.DataFrame): Output of prepare_trends
+            **overrides: Any of the keys of TREND_DEFAULTS
+
+        Returns:
+            style (dict): Styling of the figures
+    """
+    style = {**TREND_DEFAULTS, **overrides}
+
+    last_round = int(data['Round'].max())
+    top = np.nanmax(data[['roll_xGF', 'roll_xGA']].to_numpy(dtype=float))
+    y_max = max(2.7, np.ceil((top + 0.2) * 2) / 2)
+
+    style['x_lim'] = (0, last_round + 1)
+    style['x_ticks'] = list(range(0, last_round + 1, 10))
+    style['y_lim'] = (0, y_max)
+    style['y_ticks'] = list(np.arange(0, y_max, 0.5))
+
+    style['tick_props'] = dict(color=style['text_col'], size=12, fontweight='bold')
+    style['grid_props'] = dict(
+        zorder=1,
+        color=style['text_col'],
+        alpha=0.5,
+        linestyle=(0, (5, 5))
+    )
+
+    return style
+
+def style_trend_axes(
+    axes: list,
+    style: dict
+):
+    """
+    Function to apply the shared styling to the season axes of a figure
+
+        Parameters:
+            axes (list): Axes of the figure, one per season
+            style (dict): Output of trend_style
+    """
+    x_ticks = style['x_ticks']
+    y_ticks = style['y_ticks']
+    y_labels = [f'{v:g}' for v in y_ticks]
+
+    for i, ax in enumerate(axes):
+        ax.patch.set_facecolor(style['bg'])
+
+        ax.spines['bottom'].set_color(style['text_col'])
+        ax.spines['right'].set_visible(False)
+        ax.spines['top'].set_visible(False)
+
+        # The first season keeps the y axis, the rest leave out the 0 tick
+        # so the labels of neighbouring axes do not touch:
+        ticks = x_ticks[1:] if i == 0 else x_ticks
+
+        ax.set_xticks(ticks)
+        ax.set_xticklabels([str(t) for t in ticks], **style['tick_props'])
+        ax.set_yticks(y_ticks)
+        ax.set_yticklabels(y_labels, **style['tick_props'])
+
+        if i == 0:
+            ax.spines['left'].set_color(style['text_col'])
+            ax.spines['left'].set_linestyle((0, (5, 5)))
+        else:
+            ax.spines['left'].set_visible(False)
+            ax.tick_params(left=False, labelleft=False)
+
+        ax.set_xlim(*style['x_lim'])
+        ax.set_ylim(*style['y_lim'])
+        ax.grid(**style['grid_props'])
+
+def plot_trend(
+    data: pd.DataFrame,
+    team: str,
+    style: dict
+):
+    """
+    Function to draw the xG trend figure of one team, with one axis per season
+
+        Parameters:
+            data (pd.DataFrame): Matches of the team, output of prepare_trends
+            team (str): Name of the team
+            style (dict): Output of trend_style
+
+        Returns:
+            fig (plt.Figure): Trend figure
+    """
+    import matplotlib.pyplot as plt
+    import matplotlib.patheffects as path_effects
+    from matplotlib import gridspec
+    from highlight_text import fig_text
+    from utils.helper_utils import line_plots
+
+    bg = style['bg']
+    seasons = list(data.groupby('Season', sort=False))
+    n_seasons = len(seasons)
+
+    fig = plt.figure(
+        figsize=(style['axis_width'] * max(n_seasons, 2), style['height'])
+    )
+    fig.set_facecolor(bg)
+
+    spec = gridspec.GridSpec(
+        ncols=n_seasons,
+        nrows=1,
+        figure=fig,
+        wspace=0.03
+    )
+    axes = [fig.add_subplot(spec[0, i]) for i in range(n_seasons)]
+
+    style_trend_axes(axes, style)
+
+    stroke = [path_effects.withStroke(linewidth=4, foreground=bg)]
+    x_mid = sum(style['x_lim']) / 2
+    y_top = style['y_lim'][1]
+
+    for ax, (season, season_df) in zip(axes, seasons):
+        line_plots(
+            axis=ax,
+            dataframe=season_df,
+            xG_for='roll_xGF',
+            xG_against='roll_xGA',
+            bg=bg,
+            for_col=style['for_col'],
+            against_col=style['against_col']
+        )
+
+        ax.text(
+            x_mid,
+            y_top + 0.05,
+            season_label(season),
+            ha='center',
+            color=style['text_col'],
+            fontfamily=style['body_font'],
+            size=17.5,
+            fontweight='bold',
+            zorder=2
+        ).set_path_effects(stroke)
+
+    # Axis Label text:
+    axes[0].text(
+        -0.15,
+        0.28,
+        'Expected Goals per Game',
+        rotation=90,
+        transform=axes[0].transAxes,
+        color=style['text_col'],
+        size=20,
+        fontfamily=style['body_font'],
+        zorder=2
+    ).set_path_effects(stroke)
+
+    axes[0].text(
+        (n_seasons + 0.03 * (n_seasons - 1)) / 2,
+        -0.074,
+        'Match Number',
+        ha='center',
+        transform=axes[0].transAxes,
+        color=style['text_col'],
+        size=20,
+        fontfamily=style['body_font'],
+        zorder=2
+    ).set_path_effects(stroke)
+
+    # Title:
+    fig_text(
+        s=f"How {team}'s expected goals <for> & <against> trend over time",
+        x=0.5,
+        y=0.99,
+        ha='center',
+        fig=fig,
+        color=style['text_col'],
+        fontfamily=style['title_font'],
+        fontsize=25,
+        highlight_textprops=[{'color': style['for_col']},
+                             {'color': style['against_col']}],
+        fontweight='bold'
+    )
+
+    first, last = season_label(seasons[0][0]), season_label(seasons[-1][0])
+    period = first if n_seasons == 1 else f'{first} - {last}'
+
+    fig.text(
+        0.5,
+        0.94,
+        f"{style['window']} game rolling average | {style['league']} | "
+        f"Season{'s' if n_seasons > 1 else ''} {period}",
+        ha='center',
+        color=style['text_col'],
+        size=20,
+        fontfamily=style['body_font'],
+        zorder=2
+    )
+
+    axes[0].text(
+        -0.09,
+        -0.093,
+        style['source'],
+        transform=axes[0].transAxes,
+        color=style['text_col'],
+        size=15,
+        fontfamily=style['body_font']
+    )
+
+    axes[-1].text(
+        0.77,
+        -0.093,
+        style['credit'],
+        ha='center',
+        transform=axes[-1].transAxes,
+        color=style['text_col'],
+        size=15,
+        fontfamily=style['body_font']
+    )
+
+    return fig
+
+def trend_series(
+    data: pd.DataFrame,
+    columns: list,
+    team_col: str = 'Team'
+)-> tuple:
+    """
+    Function to get the trend of every team as NumPy arrays, with the seasons
+    laid end to end on one running match number
+
+        Parameters:
+            data (pd.DataFrame): Output of prepare_trends
+            columns (list): Rolling columns to get, e.g. roll_xGF
+            team_col (str): Column with the team names
+
+        Returns:
+            x (dict): Running match numbers of every team
+            series (dict): Values of every column, keyed by column and team
+            seasons (list): Seasons in the order they are laid out
+    """
+    seasons = sorted(data['Season'].unique())
+    last_round = int(data['Round'].max())
+
+    season_idx = pd.Categorical(data['Season'], categories=seasons).codes
+    running = data['Round'].to_numpy(dtype=float) + season_idx * last_round
+    values = data[list(columns)].to_numpy(dtype=float)
+
+    x, series = {}, {col: {} for col in columns}
+
+    for team, idx in data.groupby(team_col, sort=False).indices.items():
+        x[team] = running[idx]
+
+        for j, col in enumerate(columns):
+            series[col][team] = values[idx, j]
+
+    return x, series, seasons
+
+def plot_trend_grid(
+    data: pd.DataFrame,
+    style: dict,
+    teams: list = None,
+    context: bool = True,
+    team_col: str = 'Team',
+    columns: list = ('roll_xGF', 'roll_xGA'),
+    colors: dict = None,
+    ncols: int = 5,
+    markers: bool = True
+):
+    """
+    Function to draw the xG trends of many teams as small multiples, one axis
+    per team with the rest of the league drawn in grey behind it. Every
+    colour of an axis is one LineCollection and one scatter, however many
+    teams and seasons it holds
+
+        Parameters:
+            data (pd.DataFrame): Output of prepare_trends, every team of the
+            league
+            style (dict): Output of trend_style
+            teams (list): Teams given an axis, every team if None. A single
+            team gives one axis highlighting it against the league
+            context (bool): Draw the rest of the league in grey
+            team_col (str): Column with the team names
+            columns (list): Rolling columns to draw, e.g. several windows
+            colors (dict): Color of every column, the for and against colors
+            of the style for the first two if None
+            ncols (int): Number of axes per row
+            markers (bool): Draw a marker at every match of the teams
+
+        Returns:
+            fig (plt.Figure): Trend figure
+    """
+    import matplotlib.pyplot as plt
+    from highlight_text import fig_text
+    from utils.helper_utils import multi_line_plot
+
+    columns = list(columns)
+    colors = {**dict(zip(columns[:2], [style['for_col'], style['against_col']])), **(colors or {})}
+
+    missing = [col for col in columns if col not in colors]
+    if missing:
+        raise ValueError(f'No color given for the columns {missing}')
+
+    x, series, seasons = trend_series(data, columns, team_col)
+    teams = list(x) if teams is None else [team for team in teams if team in x]
+
+    if not teams:
+        raise ValueError('None of the teams are in the data')
+
+    bg = style['bg']
+    last_round = int(data['Round'].max())
+    n_seasons = len(seasons)
+    ncols = min(ncols, len(teams))
+    nrows = -(-len(teams) // ncols)
+
+    # At least 12 inches wide so the title fits above a single team, with
+    # 1.5 inches on top for the title:
+    width = max(style['panel_width'] * ncols, 12)
+    height = style['panel_height'] * nrows + 1.5
+
+    fig, axes = plt.subplots(
+        nrows,
+        ncols,
+        figsize=(width, height),
+        squeeze=False,
+        gridspec_kw={'wspace': 0.05, 'hspace': 0.25}
+    )
+    fig.set_facecolor(bg)
+    fig.subplots_adjust(top=1 - 1.5 / height)
+
+    # Shared styling, the season boundaries on a running match number:
+    x_lim = (0, n_seasons * last_round + 1)
+    boundaries = [i * last_round + 0.5 for i in range(1, n_seasons)]
+    mids = [(i + 0.5) * last_round for i in range(n_seasons)]
+    y_ticks = style['y_ticks']
+    tick_props = {**style['tick_props'], 'size': 10}
+
+    for i, ax in enumerate(axes.flat):
+        if i >= len(teams):
+            ax.set_visible(False)
+            continue
+
+        col = i % ncols
+
+        ax.patch.set_facecolor(bg)
+        ax.spines['bottom'].set_color(style['text_col'])
+        ax.spines['right'].set_visible(False)
+        ax.spines['top'].set_visible(False)
+        ax.spines['left'].set_color(style['text_col'])
+        ax.spines['left'].set_linestyle((0, (5, 5)))
+
+        ax.set_xlim(*x_lim)
+        ax.set_ylim(*style['y_lim'])
+        ax.set_xticks(mids)
+        ax.set_yticks(y_ticks)
+        ax.tick_params(bottom=False)
+        ax.grid(axis='y', **style['grid_props'])
+
+        # Only the outer axes keep their labels:
+        if i + ncols >= len(teams):
+            ax.set_xticklabels([season_label(s) for s in seasons], **tick_props)
+        else:
+            ax.tick_params(labelbottom=False)
+
+        if col == 0:
+            ax.set_yticklabels([f'{v:g}' for v in y_ticks], **tick_props)
+        else:
+            ax.tick_params(left=False, labelleft=False)
+
+        for boundary in boundaries:
+            ax.axvline(boundary, **{**style['grid_props'], 'alpha': 0.25})
+
+        team = teams[i]
+
+        if context:
+            others = [other for other in x if other != team]
+
+            multi_line_plot(
+                ax,
+                [x[other] for other in others for _ in columns],
+                [series[c][other] for other in others for c in columns],
+                style['context_col'],
+                bg,
+                lw=1,
+                alpha=style['context_alpha'],
+                zorder=1.5,
+                markers=False
+            )
+
+        for c in columns:
+            multi_line_plot(
+                ax,
+                [x[team]],
+                [series[c][team]],
+                colors[c],
+                bg,
+                lw=2,
+                size=15,
+                zorder=2,
+                markers=markers
+            )
+
+        ax.set_title(
+            team,
+            color=style['text_col'],
+            fontfamily=style['body_font'],
+            size=14,
+            fontweight='bold'
+        )
+
+    # Title:
+    names = ['for', 'against'] if len(columns) == 2 else columns
+    title = 'Rolling expected goals ' + ' & '.join(f'<{name}>' for name in names)
+
+    if context:
+        title += ' with the league in grey'
+
+    fig_text(
+        s=title,
+        x=0.5,
+        y=1 - 0.2 / height,
+        ha='center',
+        fig=fig,
+        color=style['text_col'],
+        fontfamily=style['title_font'],
+        fontsize=20,
+        highlight_textprops=[{'color': colors[c]} for c in columns],
+        fontweight='bold'
+    )
+
+    fig.text(
+        0.5,
+        1 - 0.75 / height,
+        f"{style['window']} game rolling average | {style['league']} | "
+        f"{style['source']}",
+        ha='center',
+        color=style['text_col'],
+        size=14,
+        fontfamily=style['body_font']
+    )
+
+    return fig
+
+def render_trend_grid(
+    data: pd.DataFrame,
+    output: str,
+    teams: list = None,
+    seasons: list = None,
+    context: bool = True,
+    team_col: str = 'Team',
+    team: str = None,
+    ncols: int = 5,
+    **style
+)-> dict:
+    """
+    Function to draw and save the small multiples of the xG trends of a
+    league table, see plot_trend_grid
+
+        Parameters:
+            data (pd.DataFrame): One match per row with Round, xG, xGA and
+            Season columns
+            output (str): Path of the image
+            teams (list): Teams given an axis, every team if None
+            seasons (list): Seasons to draw, every season if None
+            context (bool): Draw the rest of the league in grey
+            team_col (str): Column with the team names
+            team (str): Team of every row, if there is no team column
+            ncols (int): Number of axes per row
+            **style: Any of the keys of TREND_DEFAULTS
+
+        Returns:
+            result (dict): Output path, number of teams and matches, and
+            render time
+    """
+    import matplotlib.pyplot as plt
+
+    start = time.perf_counter()
+
+    window = style.get('window', TREND_DEFAULTS['window'])
+    df = prepare_trends(data, team_col=team_col, team=team, window=window)
+
+    if seasons is not None:
+        df = df[df['Season'].isin(seasons)]
+
+    # The whole league sets the scale, so it stays the same when only a few
+    # teams are given an axis:
+    shared_style = trend_style(df, **style)
+
+    with stage('plot_trend_grid', rows=len(df)):
+        fig = plot_trend_grid(
+            df, shared_style, teams=teams, context=context, team_col=team_col, ncols=ncols
+        )
+
+    try:
+        drawn = time.perf_counter()
+
+        output = save_figure(fig, output, shared_style)
+    finally:
+        plt.close(fig)
+
+    end = time.perf_counter()
+
+    return {
+        'output': output,
+        'n_teams': df[team_col].nunique() if teams is None else len(teams),
+        'n_matches': len(df),
+        'draw_s': drawn - start,
+        'save_s': end - drawn,
+        'total_s': end - start,
+    }
+
+def trend_path(
+    output_dir: str,
+    team: str
+)-> str:
+    """
+    Function to get the image file of a team's trend figure
+
+        Parameters:
+            output_dir (str): Folder of the figures
+            team (str): Name of the team
+
+        Returns:
+            path (str): Path of the image file
+    """
+    name = re.sub(r'[^\w]+', '_', team).strip('_')
+
+    return os.path.join(output_dir, f'{name}_Trend.jpg')
+
+def render_trend(job: dict)-> dict:
+    """
+    Function to draw and save the trend figure of one team
+
+        Parameters:
+            job (dict): 'team', its matches in 'data', the 'style' and the
+            'output' path
+
+        Returns:
+            result (dict): Output path, number of matches and render time
+    """
+    import matplotlib.pyplot as plt
+
+    start = time.perf_counter()
+    style = job['style']
+
+    fig = plot_trend(job['data'], job['team'], style)
+
+    try:
+        drawn = time.perf_counter()
+
+        output = save_figure(fig, job['output'], style)
+    finally:
+        plt.close(fig)
+
+    end = time.perf_counter()
+
+    return {
+        'team': job['team'],
+        'output': output,
+        'n_matches': len(job['data']),
+        'draw_s': drawn - start,
+        'save_s': end - drawn,
+        'total_s': end - start,
+    }
+
+def render_trends(
+    data: pd.DataFrame,
+    output_dir: str = 'Plots',
+    teams: list = None,
+    seasons: list = None,
+    team_col: str = 'Team',
+    team: str = None,
+    workers: int = None,
+    start_method: str = 'spawn',
+    **style
+)-> pd.DataFrame:
+    """
+    Function to render the xG trend figure of every team of a league table,
+    across all of its seasons, in a pool of worker processes
+
+        Parameters:
+            data (pd.DataFrame): One match per row with Round, xG, xGA and
+            Season columns
+            output_dir (str): Folder of the figures
+            teams (list): Teams to draw, every team if None
+            seasons (list): Seasons to draw, every season if None
+            team_col (str): Column with the team names
+            team (str): Team of every row, if there is no team column
+            workers (int): Number of worker processes, the number of CPUs if
+            None and everything in this process if 0
+            start_method (str): Multiprocessing start method of the workers
+            **style: Any of the keys of TREND_DEFAULTS
+
+        Returns:
+            results (pd.DataFrame): One row per team with the output path,
+            status, timings and error of every figure
+    """
+    window = style.get('window', TREND_DEFAULTS['window'])
+    df = prepare_trends(data, team_col=team_col, team=team, window=window)
+
+    if seasons is not None:
+        df = df[df['Season'].isin(seasons)]
+    if teams is not None:
+        df = df[df[team_col].isin(teams)]
+
+    # Built once and shared by every figure:
+    shared_style = trend_style(df, **style)
+
+    jobs = [
+        {
+            'team': name,
+            'data': team_df,
+            'style': shared_style,
+            'output': trend_path(output_dir, name),
+        }
+        for name, team_df in df.groupby(team_col, sort=False)
+    ]
+
+    results = run_jobs(
+        render_trend, jobs, workers=workers, start_method=start_method,
+        keys=('team', 'output')
+    )
+
+    columns = [
+        'team', 'output', 'status', 'n_matches', 'draw_s', 'save_s',
+        'total_s', 'pid', 'error'
+    ]
+    results = pd.DataFrame(results)
+
+    return results.reindex(columns=columns + [
+        col for col in results.columns if col not in columns
+    ])
@@ -1,34 +1,246 @@
 # Importing the required packages:
+import os
+import re
+import codecs
 import requests
-from bs4 import BeautifulSoup
 import json
+import time
+import tempfile
+import threading
 import numpy as np
 import pandas as pd
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from utils.cache_utils import (
+    CACHE_DIR,
+    CACHE_TTL,
+    CACHE_MAX_SIZE,
+    cache_path,
+    read_cache,
+    write_cache
+)
+from utils.instrumentation_utils import stage
 
-def scrape_shots(
-        player_id: str
-) -> pd.DataFrame:
+UNDERSTAT_URL = 'https://understat.com/'
+BASE_URL = UNDERSTAT_URL + 'player/'
+
+# Paths of the understat pages, filled with the parts given to page_url:
+PAGE_PATHS = {
+    'player': 'player/{}',
+    'team': 'team/{}/{}',
+    'league': 'league/{}/{}',
+    'match': 'match/{}',
+}
+
+# Datasets split into one Dataframe per top level key, e.g.
+# groupsData.season and groupsData.position:
+SPLIT_DATASETS = ('groupsData', 'statisticsData')
+
+# Names of the key columns of datasets nested in dicts, from the outermost
+# dict in. Keys past the names given here go in level_<n> columns:
+DATASET_KEYS = {
+    'shotsData': ['h_a'],
+    'rostersData': ['h_a', 'roster_id'],
+    'teamsData': ['team_id'],
+    'groupsData.position': ['season', 'position'],
+    'groupsData.situation': ['season', 'situation'],
+    'groupsData.shotZones': ['season', 'shot_zone'],
+    'groupsData.shotTypes': ['season', 'shot_type'],
+    'statisticsData.situation': ['situation'],
+    'statisticsData.formation': ['formation'],
+    'statisticsData.gameState': ['game_state'],
+    'statisticsData.timing': ['timing'],
+    'statisticsData.shotZone': ['shot_zone'],
+    'statisticsData.attackSpeed': ['attack_speed'],
+    'statisticsData.result': ['result'],
+}
+
+# Start of every embedded dataset, and the variable name just before it:
+_JSON_PARSE = re.compile(rb"JSON\.parse\(\s*'([^']*)'\s*\)")
+_NAME_BEFORE = re.compile(rb"([A-Za-z_$][\w$]*)\s*=\s*$")
+
+# Folder holding the incremental refresh state of every player, kept next to
+# the page cache but never evicted with it:
+STATE_DIR = os.environ.get('UNDERSTAT_STATE_DIR', os.path.join(CACHE_DIR, 'state'))
+
+# Compiled regexes of the embedded datasets, keyed by variable name:
+_dataset_patterns = {}
+
+# Compact types of the understat shot fields:
+SHOT_DTYPES = {
+    'id': 'int64',
+    'minute': 'int16',
+    'X': 'float32',
+    'Y': 'float32',
+    'xG': 'float32',
+    'player_id': 'int32',
+    'season': 'int16',
+    'match_id': 'int32',
+    'h_goals': 'int8',
+    'a_goals': 'int8',
+    'date': 'datetime64[ns]',
+    'result': 'category',
+    'player': 'category',
+    'h_a': 'category',
+    'situation': 'category',
+    'shotType': 'category',
+    'h_team': 'category',
+    'a_team': 'category',
+    'player_assisted': 'category',
+    'lastAction': 'category',
+}
+
+def _dataset_pattern(name: str) -> re.Pattern:
     """
-    Function to Scrape Shot x-y data from understat.com
+    Function to build the regex finding a named JSON.parse('...') literal
+    in the raw bytes of an understat page
 
         Parameters:
-            player_id (str): Player ID as specified by understat
+            name (str): Name of the javascript variable, e.g. shotsData
+
+        Returns:
+            pattern (re.Pattern): Compiled pattern capturing the escaped JSON
+    """
+    if name not in _dataset_patterns:
+        _dataset_patterns[name] = re.compile(
+            re.escape(name.encode('ascii')) 
+            + rb"\s*=\s*JSON\.parse\(\s*'([^']*)'\s*\)"
+        )
+
+    return _dataset_patterns[name]
+
+def extract_dataset(
+        content: bytes,
+        name: str = 'shotsData'
+):
+    """
+    Function to read a dataset embedded as JSON.parse('...') in an understat
+    page without building a DOM
+
+        Parameters:
+            content (bytes): Raw HTML of the page
+            name (str): Name of the javascript variable holding the dataset
         
         Returns:
-            df (pd.DataFrame): Dataframe containing the shot data of 
-            specified player
+            data (list or dict): Decoded JSON data, None if the page has no 
+            dataset with that name
 
     """
-    base_url = 'https://understat.com/player/'
-    player = player_id
+    if isinstance(content, str):
+        content = content.encode('utf8')
 
-    # Generating the url: 
-    url = base_url + player
+    pattern = _dataset_pattern(name)
+    key = name.encode('ascii')
+
+    with stage('find_dataset', dataset=name, bytes=len(content)):
+        # Jumping straight to each mention of the name with bytes.find, which
+        # is much quicker than letting the regex scan the whole page:
+        match = None
+        ind = content.find(key)
+
+        while ind != -1:
+            # Skipping names that are only the end of a longer variable name:
+            prev = content[ind-1:ind]
+
+            if not (prev.isalnum() or prev == b'_'):
+                match = pattern.match(content, ind)
+
+                if match is not None:
+                    break
+
+            ind = content.find(key, ind + 1)
+
+    if match is None:
+        return None
+
+    with stage('decode_escapes', dataset=name, bytes=len(match.group(1))):
+        # Decoding the \xNN escapes back to bytes in one pass, then the bytes
+        # as UTF-8 text:
+        json_data = codecs.escape_decode(match.group(1))[0].decode('utf8')
+
+    with stage('json_loads', dataset=name, bytes=len(json_data)) as record:
+        data = json.loads(json_data)
+        record['rows'] = len(data)
+
+    return data
+
+def extract_datasets(
+        content: bytes,
+        names: list = None
+) -> dict:
+    """
+    Function to read every dataset embedded as JSON.parse('...') in an
+    understat page in one pass, e.g. shotsData, matchesData and groupsData
+    on a player page or datesData, teamsData and playersData on a league page
+
+        Parameters:
+            content (bytes): Raw HTML of the page
+            names (list): Names of the datasets to decode, every dataset on
+            the page if None
+
+        Returns:
+            data (dict): Decoded JSON data of every dataset, keyed by name
+
+    """
+    if isinstance(content, str):
+        content = content.encode('utf8')
 
-    # Using requests to get the webpage and BeautifulSoup to parse the page
-    res = requests.get(url)
-    soup = BeautifulSoup(res.content, 'lxml')
-    scripts = soup.find_all('script')
+    wanted = set(names) if names is not None else None
+    found = {}
+
+    with stage('find_datasets', bytes=len(content)) as record:
+        ind = content.find(b'JSON.parse(')
+
+        while ind != -1:
+            match = _JSON_PARSE.match(content, ind)
+
+            if match is not None:
+                # The variable name sits right before the call:
+                name = _NAME_BEFORE.search(content, max(ind - 128, 0), ind)
+
+                if name is not None:
+                    key = name.group(1).decode('ascii')
+
+                    if (wanted is None or key in wanted) and key not in found:
+                        found[key] = match.group(1)
+
+                ind = match.end()
+
+            ind = content.find(b'JSON.parse(', ind + 1)
+
+        record['rows'] = len(found)
+
+    data = {}
+
+    for key, literal in found.items():
+        with stage('decode_escapes', dataset=key, bytes=len(literal)):
+            json_data = codecs.escape_decode(literal)[0].decode('utf8')
+
+        with stage('json_loads', dataset=key, bytes=len(json_data)) as record:
+            data[key] = json.loads(json_data)
+            record['rows'] = len(data[key])
+
+    return data
+
+def _parse_shots_bs4(
+        content: bytes
+) -> list:
+    """
+    Function to extract the Shot data from an understat player page by 
+    parsing the whole page with BeautifulSoup
+
+        Parameters:
+            content (bytes): Raw HTML of the player page
+        
+        Returns:
+            data (list): Shot data on the page
+
+    """
+    from bs4 import BeautifulSoup
+
+    with stage('bs4_parse', bytes=len(content)):
+        soup = BeautifulSoup(content, 'lxml')
+        scripts = soup.find_all('script')
 
     # Getting the Shot data:
     strings = scripts[3].string
@@ -37,13 +249,905 @@ def scrape_shots(
     ind_start = strings.index("('")+2 
     ind_end = strings.index("')") 
     json_data = strings[ind_start:ind_end] 
-    json_data = json_data.encode('utf8').decode('unicode_escape')
+    with stage('decode_escapes', dataset='shotsData', bytes=len(json_data)):
+        json_data = json_data.encode('utf8').decode('unicode_escape')
 
     # Converting the Strings to JSON:
-    data = json.loads(json_data)
+    with stage('json_loads', dataset='shotsData', bytes=len(json_data)):
+        data = json.loads(json_data)
+
+    return data
+
+def parse_shots(
+        content: bytes,
+        parser: str = 'fast'
+) -> pd.DataFrame:
+    """
+    Function to extract the Shot x-y data from an understat player page
+
+        Parameters:
+            content (bytes): Raw HTML of the player page
+            parser (str): 'fast' to find the shotsData literal by name with a
+            regex, falling back to BeautifulSoup if it is missing, or 'bs4'
+            to always parse the page with BeautifulSoup
+        
+        Returns:
+            df (pd.DataFrame): Dataframe containing the shot data on the page
+
+    """
+    if parser not in ('fast', 'bs4'):
+        raise ValueError(f"parser must be 'fast' or 'bs4', got {parser!r}")
+
+    data = None
+
+    if parser == 'fast':
+        data = extract_dataset(content, 'shotsData')
+
+    if data is None:
+        data = _parse_shots_bs4(content)
 
     # Converting the JSON data to a Pandas Dataframe:
-    df = pd.DataFrame(data)
+    with stage('build_dataframe', rows=len(data)):
+        df = pd.DataFrame(data)
 
     return df
 
+def normalize_shots(
+        data: pd.DataFrame,
+        verbose: bool = False
+) -> pd.DataFrame:
+    """
+    Function to cast the all-string shot data from understat to compact 
+    types, float32 and small ints for the numbers and category for the 
+    repeated strings
+
+    The memory used before and after is kept in df.attrs['memory'].
+
+        Parameters:
+            data (pd.DataFrame): Dataframe containing the shot data
+            verbose (bool): Print the memory used before and after
+        
+        Returns:
+            df (pd.DataFrame): Dataframe with the compact types
+
+    """
+    with stage('normalize_shots', rows=len(data)) as record:
+        before = int(data.memory_usage(deep=True).sum())
+
+        columns = {}
+
+        for col, dtype in SHOT_DTYPES.items():
+            if col not in data.columns or data[col].dtype == dtype:
+                continue
+
+            if dtype == 'category':
+                columns[col] = data[col].astype('category')
+            elif dtype.startswith('datetime'):
+                # pandas picks the resolution from the strings otherwise:
+                columns[col] = pd.to_datetime(data[col]).astype(dtype)
+            else:
+                columns[col] = pd.to_numeric(data[col]).astype(dtype)
+
+        df = data.assign(**columns)
+
+        after = int(df.memory_usage(deep=True).sum())
+        df.attrs['memory'] = {'before': before, 'after': after}
+        record['bytes'] = after
+
+    if verbose:
+        print(
+            f'Shot data memory: {before / 1024**2:.2f} MB -> '
+            f'{after / 1024**2:.2f} MB ({before / max(after, 1):.1f}x smaller)'
+        )
+
+    return df
+
+def fetch_page(
+        url: str,
+        session: requests.Session = None,
+        timeout: float = None,
+        cache_dir: str = CACHE_DIR,
+        ttl: float = CACHE_TTL,
+        refresh: bool = False,
+        max_cache_size: int = CACHE_MAX_SIZE
+) -> bytes:
+    """
+    Function to get the raw content of a page, from the on-disk cache if 
+    it holds a fresh copy and from the web otherwise
+
+        Parameters:
+            url (str): Url of the page
+            session (requests.Session): Session to reuse connections from, 
+            a plain request is made if not given
+            timeout (float): Seconds to wait for the server, no limit if None
+            cache_dir (str): Folder holding the cache, no caching if None
+            ttl (float): Seconds a cached page stays valid, never expires if None
+            refresh (bool): Skip the cached copy and fetch the page again
+            max_cache_size (int): Maximum total size of the cache in bytes
+        
+        Returns:
+            content (bytes): Raw content of the page
+
+    """
+    if cache_dir is not None and not refresh:
+        with stage('read_cache', url=url) as record:
+            content = read_cache(url, cache_dir=cache_dir, ttl=ttl)
+            record['hit'] = content is not None
+            record['bytes'] = len(content) if content is not None else 0
+
+        if content is not None:
+            return content
+
+    with stage('download', url=url) as record:
+        getter = session if session is not None else requests
+        res = getter.get(url, timeout=timeout)
+        res.raise_for_status()
+        record['status'] = res.status_code
+        record['bytes'] = len(res.content)
+
+    if cache_dir is not None:
+        with stage('write_cache', url=url, bytes=len(res.content)):
+            write_cache(
+                url, 
+                res.content, 
+                cache_dir=cache_dir, 
+                max_size=max_cache_size
+            )
+
+    return res.content
+
+def scrape_shots(
+        player_id: str,
+        session: requests.Session = None,
+        timeout: float = None,
+        base_url: str = BASE_URL,
+        cache_dir: str = CACHE_DIR,
+        ttl: float = CACHE_TTL,
+        refresh: bool = False,
+        normalize: bool = True
+) -> pd.DataFrame:
+    """
+    Function to Scrape Shot x-y data from understat.com
+
+        Parameters:
+            player_id (str): Player ID as specified by understat
+            session (requests.Session): Session to reuse connections from, 
+            a plain request is made if not given
+            timeout (float): Seconds to wait for the server, no limit if None
+            base_url (str): Url of the understat player pages
+            cache_dir (str): Folder holding the page cache, no caching if None
+            ttl (float): Seconds a cached page stays valid, never expires if None
+            refresh (bool): Skip the cached copy and fetch the page again
+            normalize (bool): Cast the shot data to compact types with
+            normalize_shots, every value is left as a string if False
+        
+        Returns:
+            df (pd.DataFrame): Dataframe containing the shot data of 
+            specified player
+
+    """
+    player = str(player_id)
+
+    # Generating the url: 
+    url = base_url + player
+
+    with stage('scrape_shots', player_id=player) as record:
+        # Using requests (or the cache) to get the webpage and BeautifulSoup
+        # to parse the page
+        content = fetch_page(
+            url, 
+            session=session, 
+            timeout=timeout, 
+            cache_dir=cache_dir, 
+            ttl=ttl, 
+            refresh=refresh
+        )
+
+        df = parse_shots(content)
+
+        if normalize:
+            df = normalize_shots(df)
+
+        record['bytes'] = len(content)
+        record['rows'] = len(df)
+
+    return df
+
+def _is_record(value: dict) -> bool:
+    """
+    Function to tell a record, a dict holding at least one plain value,
+    from a dict of records keyed by e.g. season or team
+    """
+    return any(not isinstance(item, (dict, list)) for item in value.values())
+
+def _records_frame(records: list) -> pd.DataFrame:
+    """
+    Function to build a Dataframe from a list of records, flattening nested
+    dicts such as goals: {h, a} into goals_h and goals_a columns
+
+        Parameters:
+            records (list): Records of a dataset
+
+        Returns:
+            df (pd.DataFrame): One row per record
+    """
+    if records and not isinstance(records[0], dict):
+        return pd.DataFrame({'value': records})
+
+    if records and any(isinstance(item, dict) for item in records[0].values()):
+        return pd.json_normalize(records, sep='_')
+
+    return pd.DataFrame(records)
+
+def _record_frame(record: dict) -> pd.DataFrame:
+    """
+    Function to build a Dataframe from a single record. A record holding one
+    list of records, like a team and its match history, gets one row per
+    item of the list with the plain values of the record repeated
+
+        Parameters:
+            record (dict): Record of a dataset
+
+        Returns:
+            df (pd.DataFrame): Rows of the record
+    """
+    lists = [
+        key for key, item in record.items()
+        if isinstance(item, list) and item and isinstance(item[0], dict)
+    ]
+
+    if len(lists) != 1:
+        return pd.json_normalize(record, sep='_')
+
+    df = _records_frame(record[lists[0]])
+    fields = [
+        key for key, item in record.items()
+        if not isinstance(item, (dict, list)) and key not in df.columns
+    ]
+
+    for i, key in enumerate(fields):
+        df.insert(i, key, record[key])
+
+    return df
+
+def _flatten(
+        value,
+        key_names: list,
+        keys: tuple = ()
+) -> list:
+    """
+    Function to turn a decoded dataset into Dataframes, adding the keys of
+    the dicts it is nested in as columns
+
+        Parameters:
+            value (list or dict): Decoded JSON data
+            key_names (list): Names of the key columns
+            keys (tuple): Keys of the dicts holding the value
+
+        Returns:
+            frames (list): Dataframes of every part of the dataset
+    """
+    if isinstance(value, dict) and not _is_record(value):
+        frames = []
+        for key, item in value.items():
+            frames += _flatten(item, key_names, keys + (key,))
+        return frames
+
+    if isinstance(value, list):
+        df = _records_frame(value)
+    elif isinstance(value, dict):
+        df = _record_frame(value)
+    else:
+        df = pd.DataFrame({'value': [value]})
+
+    for i, key in enumerate(keys):
+        name = key_names[i] if i < len(key_names) else f'level_{i}'
+
+        # Records already holding the key keep their own value:
+        if name not in df.columns:
+            df.insert(i, name, key)
+
+    return [df]
+
+def _typed_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Function to cast the string columns of a dataset to numbers, datetimes
+    for date columns and categories for repeated strings
+
+        Parameters:
+            df (pd.DataFrame): Dataframe of a dataset
+
+        Returns:
+            df (pd.DataFrame): Dataframe with typed columns
+    """
+    columns = {}
+
+    for col in df.columns:
+        values = df[col]
+
+        if not (pd.api.types.is_object_dtype(values) or pd.api.types.is_string_dtype(values)):
+            continue
+
+        if col in ('date', 'datetime') or str(col).endswith('_date'):
+            try:
+                columns[col] = pd.to_datetime(values)
+                continue
+            except (ValueError, TypeError):
+                pass
+
+        try:
+            numbers = pd.to_numeric(values)
+        except (ValueError, TypeError):
+            numbers = None
+
+        if numbers is not None:
+            columns[col] = numbers
+            continue
+
+        if all(isinstance(item, str) for item in values.dropna()):
+            if values.nunique() <= len(values) / 2:
+                columns[col] = values.astype('category')
+
+    return df.assign(**columns)
+
+def dataset_frames(
+        data: dict,
+        typed: bool = True
+) -> dict:
+    """
+    Function to turn the decoded datasets of a page into Dataframes
+
+        Parameters:
+            data (dict): Decoded datasets, from extract_datasets
+            typed (bool): Cast the columns to numbers, datetimes and
+            categories, the shots with normalize_shots. Every value is left
+            as understat gives it if False
+
+        Returns:
+            frames (dict): Dataframe of every dataset, keyed by name. The
+            datasets of SPLIT_DATASETS give one Dataframe per top level key,
+            keyed as e.g. 'groupsData.season'
+
+    """
+    parts = []
+
+    for name, value in data.items():
+        if name in SPLIT_DATASETS and isinstance(value, dict):
+            parts += [(f'{name}.{key}', item) for key, item in value.items()]
+        else:
+            parts.append((name, value))
+
+    frames = {}
+
+    for name, value in parts:
+        with stage('build_dataframe', dataset=name) as record:
+            pieces = _flatten(value, DATASET_KEYS.get(name, []))
+            df = pd.concat(pieces, ignore_index=True) if pieces else pd.DataFrame()
+            record['rows'] = len(df)
+
+        if typed and len(df):
+            df = normalize_shots(df) if name == 'shotsData' else _typed_frame(df)
+
+        frames[name] = df
+
+    return frames
+
+def page_url(
+        kind: str,
+        *parts,
+        base_url: str = UNDERSTAT_URL
+) -> str:
+    """
+    Function to build the url of an understat page
+
+        page_url('player', 5220)
+        page_url('team', 'Manchester City', 2021)
+        page_url('league', 'EPL', 2021)
+
+        Parameters:
+            kind (str): 'player', 'team', 'league' or 'match'
+            *parts: Player or match id, team or league name and season
+            base_url (str): Url of understat
+
+        Returns:
+            url (str): Url of the page
+
+    """
+    if kind not in PAGE_PATHS:
+        raise ValueError(f'kind must be one of {list(PAGE_PATHS)}, got {kind!r}')
+
+    parts = [str(part).replace(' ', '_') for part in parts]
+
+    return base_url + PAGE_PATHS[kind].format(*parts)
+
+def scrape_page(
+        kind: str,
+        *parts,
+        names: list = None,
+        typed: bool = True,
+        session: requests.Session = None,
+        timeout: float = None,
+        base_url: str = UNDERSTAT_URL,
+        cache_dir: str = CACHE_DIR,
+        ttl: float = CACHE_TTL,
+        refresh: bool = False
+) -> dict:
+    """
+    Function to get every dataset of an understat player, team, league or
+    match page with a single request
+
+        frames = scrape_page('player', 5220)
+        shots, matches = frames['shotsData'], frames['matchesData']
+
+        Parameters:
+            kind (str): 'player', 'team', 'league' or 'match'
+            *parts: Player or match id, team or league name and season
+            names (list): Names of the datasets to keep, every dataset on the
+            page if None
+            typed (bool): Cast the columns to compact types, see
+            dataset_frames
+            session (requests.Session): Session to reuse connections from,
+            a plain request is made if not given
+            timeout (float): Seconds to wait for the server, no limit if None
+            base_url (str): Url of understat
+            cache_dir (str): Folder holding the page cache, no caching if None
+            ttl (float): Seconds a cached page stays valid, never expires if None
+            refresh (bool): Skip the cached copy and fetch the page again
+
+        Returns:
+            frames (dict): Dataframe of every dataset, keyed by name
+
+    """
+    url = page_url(kind, *parts, base_url=base_url)
+
+    with stage('scrape_page', url=url, kind=kind) as record:
+        content = fetch_page(
+            url,
+            session=session,
+            timeout=timeout,
+            cache_dir=cache_dir,
+            ttl=ttl,
+            refresh=refresh
+        )
+
+        frames = dataset_frames(extract_datasets(content, names), typed=typed)
+
+        record['bytes'] = len(content)
+        record['rows'] = sum(len(df) for df in frames.values())
+
+    return frames
+
+def _state_path(
+        player_id: str,
+        state_dir: str = STATE_DIR
+) -> str:
+    return os.path.join(state_dir, f'{player_id}.json')
+
+def read_refresh_state(
+        player_id: str,
+        state_dir: str = STATE_DIR
+) -> dict:
+    """
+    Function to read the incremental refresh state of a player
+
+        Parameters:
+            player_id (str): Player ID as specified by understat
+            state_dir (str): Folder holding the state files
+
+        Returns:
+            state (dict): Ids of the shots seen so far, the last seen shot
+            id and date, the ETag and Last-Modified headers of the page and
+            the number of shots, None if the player was never refreshed
+
+    """
+    try:
+        with open(_state_path(str(player_id), state_dir)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def write_refresh_state(
+        player_id: str,
+        state: dict,
+        state_dir: str = STATE_DIR
+) -> str:
+    """
+    Function to write the incremental refresh state of a player
+
+        Parameters:
+            player_id (str): Player ID as specified by understat
+            state (dict): State to write, see read_refresh_state
+            state_dir (str): Folder holding the state files
+
+        Returns:
+            path (str): Path of the state file
+
+    """
+    os.makedirs(state_dir, exist_ok=True)
+    path = _state_path(str(player_id), state_dir)
+
+    # Writing to a temporary file first so readers never see half a file:
+    fd, tmp_path = tempfile.mkstemp(dir=state_dir, suffix='.tmp')
+
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(state, f, indent=2)
+
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    return path
+
+def _conditional_get(
+        url: str,
+        state: dict,
+        session: requests.Session = None,
+        timeout: float = None
+) -> requests.Response:
+    """
+    Function to request a page only if it changed since the last refresh,
+    with the ETag and Last-Modified headers the server sent then
+
+        Parameters:
+            url (str): Url of the page
+            state (dict): Refresh state of the player, a plain request is
+            made if None
+            session (requests.Session): Session to reuse connections from
+            timeout (float): Seconds to wait for the server, no limit if None
+
+        Returns:
+            res (requests.Response): Response, with status 304 and no content
+            if the page did not change
+
+    """
+    headers = {}
+
+    if state is not None:
+        if state.get('etag'):
+            headers['If-None-Match'] = state['etag']
+        if state.get('last_modified'):
+            headers['If-Modified-Since'] = state['last_modified']
+
+    with stage('download', url=url, conditional=bool(headers)) as record:
+        getter = session if session is not None else requests
+        res = getter.get(url, timeout=timeout, headers=headers)
+
+        if res.status_code != 304:
+            res.raise_for_status()
+
+        record['status'] = res.status_code
+        record['bytes'] = len(res.content)
+
+    return res
+
+def _shot_ids(data: pd.DataFrame) -> np.ndarray:
+    # A page without shots gives a frame without columns:
+    if 'id' not in data:
+        return np.empty(0, dtype=np.int64)
+
+    return pd.to_numeric(data['id']).to_numpy(dtype=np.int64)
+
+def refresh_shots(
+        player_id: str,
+        known: pd.DataFrame = None,
+        session: requests.Session = None,
+        timeout: float = None,
+        base_url: str = BASE_URL,
+        cache_dir: str = CACHE_DIR,
+        ttl: float = CACHE_TTL,
+        state_dir: str = STATE_DIR,
+        normalize: bool = True
+) -> tuple:
+    """
+    Function to get only the shots of a player that are new since the last
+    refresh, keeping the ids of the shots seen so far in a small state file.
+    Shots are new when their id was not seen, whatever its value, so shots
+    added to the page late with a lower id are not missed
+
+    The page is requested with If-None-Match and If-Modified-Since when the
+    server sent an ETag or Last-Modified header last time, so an unchanged
+    page is neither downloaded nor parsed. This needs either known shots as
+    recent as the state or an expired copy of the page in the cache, the
+    page is downloaded in full otherwise.
+
+        Parameters:
+            player_id (str): Player ID as specified by understat
+            known (pd.DataFrame): Shots of the player already held, the new
+            shots are the ones missing from it. Without it the new shots are
+            the ones whose id is not in the state
+            session (requests.Session): Session to reuse connections from,
+            a plain request is made if not given
+            timeout (float): Seconds to wait for the server, no limit if None
+            base_url (str): Url of the understat player pages
+            cache_dir (str): Folder holding the page cache, no caching if None
+            ttl (float): Seconds a cached page stays valid, never expires if None
+            state_dir (str): Folder holding the state files
+            normalize (bool): Cast the shot data to compact types with
+            normalize_shots
+
+        Returns:
+            new (pd.DataFrame): Shots that are new since the last refresh
+            merged (pd.DataFrame): The known shots and the new ones, without
+            duplicated shot ids, or every shot of the player if known is None
+
+    """
+    player = str(player_id)
+    url = base_url + player
+    state = read_refresh_state(player, state_dir)
+
+    with stage('refresh_shots', player_id=player) as record:
+        content = None
+        headers = {}
+
+        if cache_dir is not None:
+            content = read_cache(url, cache_dir=cache_dir, ttl=ttl)
+
+        if content is None:
+            # An unchanged page is only worth a conditional request if its
+            # shots can be rebuilt without it, from known shots holding every
+            # shot of the state or from an expired copy in the cache:
+            if known is None:
+                rebuildable = cache_dir is not None and os.path.exists(cache_path(url, cache_dir))
+            else:
+                rebuildable = (
+                    state is not None and 'ids' in state
+                    and np.isin(state['ids'], _shot_ids(known)).all()
+                )
+
+            res = _conditional_get(
+                url, state if rebuildable else None, session=session, timeout=timeout
+            )
+
+            if res.status_code == 304:
+                record['not_modified'] = True
+
+                if known is None:
+                    content = read_cache(url, cache_dir=cache_dir, ttl=None)
+
+                    # The cached copy was evicted in the meantime:
+                    if content is None:
+                        res = _conditional_get(url, None, session=session, timeout=timeout)
+
+            if res.status_code != 304:
+                content = res.content
+                headers = res.headers
+
+                if cache_dir is not None:
+                    write_cache(url, content, cache_dir=cache_dir)
+
+        if content is None:
+            shots = known.iloc[:0]
+        else:
+            shots = parse_shots(content)
+
+        ids = _shot_ids(shots)
+
+        # A state written before the seen ids were kept has no set to check
+        # against, so every shot counts as new once:
+        if known is not None:
+            is_new = ~np.isin(ids, _shot_ids(known))
+        elif state is not None and 'ids' in state:
+            is_new = ~np.isin(ids, state['ids'])
+        else:
+            is_new = np.ones(len(ids), dtype=bool)
+
+        new = shots[is_new].reset_index(drop=True)
+
+        if normalize:
+            new = normalize_shots(new)
+
+        if known is None:
+            merged = normalize_shots(shots) if normalize else shots
+        else:
+            merged = pd.concat([known, new], ignore_index=True)
+            merged = merged.drop_duplicates('id', keep='last', ignore_index=True)
+
+            # Casting again so the categories cover the known and new shots:
+            if normalize:
+                merged = normalize_shots(merged)
+
+        if len(merged):
+            all_ids = _shot_ids(merged)
+            last = int(np.argmax(all_ids))
+
+            state = {
+                **(state or {}),
+                'player_id': player,
+                'last_id': int(all_ids[last]),
+                'last_date': str(merged['date'].iloc[last]),
+                'n_shots': len(merged),
+                'ids': np.unique(all_ids).tolist(),
+            }
+
+        if state is not None:
+            # Keeping the validators of the last full download:
+            if headers:
+                state['etag'] = headers.get('ETag')
+                state['last_modified'] = headers.get('Last-Modified')
+
+            state['refreshed'] = time.strftime('%Y-%m-%dT%H:%M:%S%z')
+            write_refresh_state(player, state, state_dir)
+
+        record['bytes'] = len(content) if content is not None else 0
+        record['rows'] = len(new)
+
+    return new, merged
+
+class _RateLimiter:
+    """
+    Class to space out requests shared by several threads so that no more 
+    than `rate` requests are started per second
+    """
+    def __init__(self, rate: float = None):
+        self.interval = 1.0 / rate if rate else 0.0
+        self.next_slot = 0.0
+        self.lock = threading.Lock()
+
+    def wait(self):
+        if not self.interval:
+            return
+
+        with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_slot)
+            self.next_slot = slot + self.interval
+
+        if slot > now:
+            time.sleep(slot - now)
+
+class _RateLimitedSession(requests.Session):
+    """
+    Class to take a slot from a rate limiter right before every request sent
+    through the session, so pages read from the cache never wait for one
+    """
+    def __init__(self, limiter: _RateLimiter):
+        super().__init__()
+        self.limiter = limiter
+
+    def request(self, *args, **kwargs) -> requests.Response:
+        self.limiter.wait()
+        return super().request(*args, **kwargs)
+
+def _is_retryable(error: Exception) -> bool:
+    """
+    Function to decide whether a failed request is worth trying again
+
+        Parameters:
+            error (Exception): Error raised by the request
+
+        Returns:
+            retry (bool): True for network errors, timeouts, 429 and 5xx
+    """
+    if isinstance(error, requests.HTTPError):
+        status = error.response.status_code if error.response is not None else 0
+        return status == 429 or status >= 500
+
+    return isinstance(error, requests.RequestException)
+
+def scrape_shots_many(
+        player_ids: list,
+        max_workers: int = 8,
+        rate_limit: float = None,
+        timeout: float = 10.0,
+        retries: int = 3,
+        backoff: float = 0.5,
+        base_url: str = BASE_URL,
+        cache_dir: str = CACHE_DIR,
+        ttl: float = CACHE_TTL,
+        refresh: bool = False,
+        normalize: bool = True
+) -> tuple:
+    """
+    Function to Scrape the Shot x-y data of several players at once, using
+    a pooled session and a bounded thread pool
+
+        Parameters:
+            player_ids (list): Player IDs as specified by understat
+            max_workers (int): Number of pages fetched at the same time
+            rate_limit (float): Maximum number of requests started per second,
+            no limit if None. Pages read from the cache do not count
+            timeout (float): Seconds to wait for the server on each request
+            retries (int): Number of extra attempts after a failed request
+            backoff (float): Base wait in seconds between attempts, doubled
+            after every failure
+            base_url (str): Url of the understat player pages, can point to a
+            local server holding saved pages
+            cache_dir (str): Folder holding the page cache, no caching if None
+            ttl (float): Seconds a cached page stays valid, never expires if None
+            refresh (bool): Skip the cached copies and fetch every page again
+            normalize (bool): Cast the combined shot data to compact types 
+            with normalize_shots
+        
+        Returns:
+            df (pd.DataFrame): Dataframe containing the shot data of every
+            player that was scraped, with a player_id column
+            errors (pd.DataFrame): Dataframe with the player_id, number of 
+            attempts and error of every player that failed
+
+    """
+    session = _RateLimitedSession(_RateLimiter(rate_limit))
+    adapter = HTTPAdapter(
+        pool_connections=max_workers, 
+        pool_maxsize=max_workers
+    )
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+
+    def fetch(player_id):
+        attempt = 0
+
+        while True:
+            attempt += 1
+
+            try:
+                df = scrape_shots(
+                    player_id, 
+                    session=session, 
+                    timeout=timeout, 
+                    base_url=base_url,
+                    cache_dir=cache_dir,
+                    ttl=ttl,
+                    refresh=refresh,
+                    normalize=False
+                )
+                return df
+            except Exception as error:
+                if attempt > retries or not _is_retryable(error):
+                    error.attempts = attempt
+                    raise
+
+            time.sleep(backoff * 2 ** (attempt - 1))
+
+    # Dropping repeated ids while keeping the order they were given in:
+    player_ids = list(dict.fromkeys(str(player_id) for player_id in player_ids))
+
+    results = {}
+    errors = []
+
+    with session, ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(fetch, player_id): player_id
+            for player_id in player_ids
+        }
+
+        for future in as_completed(futures):
+            player_id = futures[future]
+
+            try:
+                df = future.result()
+            except Exception as error:
+                errors.append({
+                    'player_id': player_id,
+                    'attempts': getattr(error, 'attempts', 1),
+                    'error': f'{type(error).__name__}: {error}',
+                })
+                continue
+
+            # understat already lists the player_id with every shot:
+            if 'player_id' not in df.columns:
+                df.insert(0, 'player_id', player_id)
+
+            results[player_id] = df
+
+    # Keeping the output in the same order as the player ids given:
+    frames = [
+        results[player_id] for player_id in player_ids 
+        if player_id in results
+    ]
+
+    with stage('concat_players', players=len(frames)) as record:
+        df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(
+            columns=['player_id']
+        )
+        record['rows'] = len(df)
+
+    # Normalizing after the concat so the categories are shared by every 
+    # player:
+    if normalize and frames:
+        df = normalize_shots(df)
+    errors = pd.DataFrame(errors, columns=['player_id', 'attempts', 'error'])
+
+    return df, errors
@@ -0,0 +1,417 @@
+# Importing the required packages:
+import os
+import numpy as np
+import pandas as pd
+from typing import TYPE_CHECKING
+from utils.coordinate_utils import CoordinateTransform
+
+# scikit-learn is only imported by the functions that fit or load a model:
+if TYPE_CHECKING:
+    from sklearn.linear_model import LogisticRegression
+
+# Default location of the trained model:
+MODEL_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), '..', 'models', 'xg_model.joblib'
+)
+
+# Levels of the categorical features, anything else falls in 'Other':
+CATEGORY_LEVELS = {
+    'situation': ['OpenPlay', 'FromCorner', 'SetPiece', 'DirectFreekick', 'Penalty'],
+    'shotType': ['RightFoot', 'LeftFoot', 'Head', 'OtherBodyPart'],
+    'lastAction': [
+        'Pass', 'Cross', 'TakeOn', 'Rebound', 'None', 'Standard', 'Aerial',
+        'Chipped', 'Throughball', 'HeadPass', 'BallRecovery', 'LayOff'
+    ],
+}
+
+NUMERIC_FEATURES = ['distance', 'angle', 'log_distance']
+
+# Statsbomb goal centre and half the width of the goal mouth:
+GOAL_X, GOAL_Y, GOAL_HALF_WIDTH = 120.0, 40.0, 4.0
+
+def feature_names()-> list:
+    """
+    Function to get the name of every column of the feature matrix
+
+        Returns:
+            names (list): Feature names, numeric features first
+    """
+    names = list(NUMERIC_FEATURES)
+
+    for col, levels in CATEGORY_LEVELS.items():
+        names += [f'{col}={level}' for level in levels + ['Other']]
+
+    return names
+
+def _category_codes(
+    values: pd.Series,
+    levels: list
+)-> np.ndarray:
+    """
+    Function to get the position of every value in the list of levels, with
+    len(levels) for values outside of it
+
+        Parameters:
+            values (pd.Series): Categorical or string column
+            levels (list): Known levels of the column
+
+        Returns:
+            codes (np.ndarray): Level position of every value
+    """
+    if not isinstance(values.dtype, pd.CategoricalDtype):
+        values = values.astype('category')
+
+    # Mapping the few categories once, then every row through its code:
+    lookup = np.array(
+        [levels.index(c) if c in levels else len(levels) for c in values.cat.categories]
+        + [len(levels)],
+        dtype=np.intp
+    )
+
+    return lookup[values.cat.codes.to_numpy()]
+
+def shot_features(
+    shots: pd.DataFrame,
+    x_pos: str = 'X',
+    y_pos: str = 'Y',
+    source: str = 'understat'
+)-> np.ndarray:
+    """
+    Function to build the feature matrix of the xG model
+
+        Parameters:
+            shots (pd.DataFrame): Dataframe containing the shot data, e.g.
+            from scrape_shots
+            x_pos (str): X coordinate column name
+            y_pos (str): Y coordinate column name
+            source (str): Coordinate system of the shots, see coordinate_utils
+
+        Returns:
+            features (np.ndarray): float32 matrix with one row per shot, in the
+            column order of feature_names()
+    """
+    n_shots = len(shots)
+    n_numeric = len(NUMERIC_FEATURES)
+    n_features = n_numeric + sum(len(v) + 1 for v in CATEGORY_LEVELS.values())
+
+    features = np.zeros((n_shots, n_features), dtype=np.float32)
+
+    x, y = CoordinateTransform.between(source, 'statsbomb').apply(
+        shots[x_pos], shots[y_pos]
+    )
+
+    dx = GOAL_X - x
+    dy = y - GOAL_Y
+    distance = np.hypot(dx, dy)
+
+    # Angle the goal mouth covers seen from the shot:
+    angle = np.arctan2(
+        2 * GOAL_HALF_WIDTH * dx,
+        dx * dx + dy * dy - GOAL_HALF_WIDTH ** 2
+    )
+
+    features[:, 0] = distance
+    features[:, 1] = angle
+    features[:, 2] = np.log1p(distance)
+
+    offset = n_numeric
+    rows = np.arange(n_shots)
+
+    for col, levels in CATEGORY_LEVELS.items():
+        codes = _category_codes(shots[col], levels)
+        features[rows, offset + codes] = 1
+        offset += len(levels) + 1
+
+    return features
+
+class XGModel:
+    """
+    Class holding a logistic xG model with an isotonic calibration of its
+    scores. Scoring is one matrix product and one interpolation, so the
+    fitted values are kept as plain arrays
+
+        Parameters:
+            C (float): Inverse regularization strength of the logistic model
+            folds (int): Number of folds of the out-of-fold scores used to fit
+            the calibration
+    """
+    def __init__(self, C: float = 1.0, folds: int = 5):
+        self.C = C
+        self.folds = folds
+        self.features = feature_names()
+
+    def _logistic(self)-> 'LogisticRegression':
+        from sklearn.linear_model import LogisticRegression
+
+        return LogisticRegression(C=self.C, max_iter=1000)
+
+    def fit(
+        self,
+        features: np.ndarray,
+        goals: np.ndarray,
+        seed: int = 14
+    ):
+        """
+        Function to train the model and its calibration
+
+            Parameters:
+                features (np.ndarray): Output of shot_features
+                goals (np.ndarray): Whether every shot was a goal
+                seed (int): Seed of the folds
+
+            Returns:
+                self (XGModel): The trained model
+        """
+        # scikit-learn is only needed for training, scoring uses numpy alone:
+        from sklearn.isotonic import IsotonicRegression
+        from sklearn.model_selection import StratifiedKFold
+
+        features = np.asarray(features, dtype=np.float64)
+        goals = np.asarray(goals, dtype=bool)
+
+        n_numeric = len(NUMERIC_FEATURES)
+        self.mean = np.zeros(features.shape[1])
+        self.scale = np.ones(features.shape[1])
+        self.mean[:n_numeric] = features[:, :n_numeric].mean(axis=0)
+        self.scale[:n_numeric] = features[:, :n_numeric].std(axis=0) + 1e-9
+
+        scaled = (features - self.mean) / self.scale
+
+        # Out-of-fold scores, so the calibration is not fitted on seen shots:
+        scores = np.empty(len(goals))
+        folds = StratifiedKFold(self.folds, shuffle=True, random_state=seed)
+
+        for train, test in folds.split(scaled, goals):
+            model = self._logistic().fit(scaled[train], goals[train])
+            scores[test] = model.decision_function(scaled[test])
+
+        calibration = IsotonicRegression(
+            y_min=0.0,
+            y_max=1.0,
+            out_of_bounds='clip'
+        ).fit(scores, goals)
+
+        model = self._logistic().fit(scaled, goals)
+
+        # Folding the scaling into the weights of the final model:
+        coef = model.coef_[0] / self.scale
+        self.coef = coef.astype(np.float32)
+        self.intercept = np.float32(model.intercept_[0] - (self.mean * coef).sum())
+        self.thresholds_x = calibration.X_thresholds_.astype(np.float32)
+        self.thresholds_y = calibration.y_thresholds_.astype(np.float32)
+        self.n_train = len(goals)
+
+        return self
+
+    def score(self, features: np.ndarray)-> np.ndarray:
+        """
+        Function to get the calibrated xG of a feature matrix
+
+            Parameters:
+                features (np.ndarray): Output of shot_features
+
+            Returns:
+                xg (np.ndarray): float32 xG of every shot
+        """
+        scores = features @ self.coef
+        scores += self.intercept
+
+        return np.interp(scores, self.thresholds_x, self.thresholds_y).astype(
+            np.float32, copy=False
+        )
+
+    def save(self, path: str = MODEL_PATH)-> str:
+        """
+        Function to save the model with joblib
+
+            Parameters:
+                path (str): Path of the model file
+
+            Returns:
+                path (str): Path of the model file
+        """
+        import joblib
+
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+
+        joblib.dump(self, path)
+
+        return path
+
+    @classmethod
+    def load(cls, path: str = MODEL_PATH):
+        """
+        Function to load a model saved with save
+
+            Parameters:
+                path (str): Path of the model file
+
+            Returns:
+                model (XGModel): The trained model
+        """
+        if not os.path.exists(path):
+            raise FileNotFoundError(
+                f'No xG model at {path}, train one with train_xg_model first'
+            )
+
+        import joblib
+
+        model = joblib.load(path)
+
+        if model.features != feature_names():
+            raise ValueError(
+                f'The model at {path} was trained on other features, train it again'
+            )
+
+        return model
+
+def _is_goal(shots: pd.DataFrame)-> np.ndarray:
+    return (shots['result'].astype(str) == 'Goal').to_numpy()
+
+def _training_shots(shots: pd.DataFrame)-> pd.DataFrame:
+    # Own goals are not shots of the player they are listed under:
+    return shots[(shots['result'].astype(str) != 'OwnGoal').to_numpy()]
+
+def train_xg_model(
+    shots: pd.DataFrame,
+    path: str = MODEL_PATH,
+    C: float = 1.0,
+    folds: int = 5,
+    seed: int = 14
+)-> XGModel:
+    """
+    Function to train the xG model on understat shots and save it
+
+        Parameters:
+            shots (pd.DataFrame): Dataframe containing the shot data, with
+            understat coordinates and a result column
+            path (str): Path of the model file, nothing is saved if None
+            C (float): Inverse regularization strength of the logistic model
+            folds (int): Number of folds of the calibration
+            seed (int): Seed of the folds
+
+        Returns:
+            model (XGModel): The trained model
+    """
+    shots = _training_shots(shots)
+
+    model = XGModel(C=C, folds=folds).fit(
+        shot_features(shots),
+        _is_goal(shots),
+        seed=seed
+    )
+
+    if path is not None:
+        model.save(path)
+
+    return model
+
+_loaded_models = {}
+
+def predict_xg(
+    shots: pd.DataFrame,
+    model: XGModel = None,
+    chunk_size: int = 1_000_000,
+    x_pos: str = 'X',
+    y_pos: str = 'Y',
+    source: str = 'understat'
+)-> np.ndarray:
+    """
+    Function to score the xG of a batch of shots, chunk by chunk so the
+    feature matrix never holds more than chunk_size rows
+
+        Parameters:
+            shots (pd.DataFrame): Dataframe containing the shot data
+            model (XGModel or str): Trained model or path of one, the model
+            at MODEL_PATH if None
+            chunk_size (int): Number of shots featurized at once
+            x_pos (str): X coordinate column name
+            y_pos (str): Y coordinate column name
+            source (str): Coordinate system of the shots
+
+        Returns:
+            xg (np.ndarray): float32 xG of every shot, in the order of shots
+    """
+    if model is None or isinstance(model, str):
+        path = model or MODEL_PATH
+
+        if path not in _loaded_models:
+            _loaded_models[path] = XGModel.load(path)
+
+        model = _loaded_models[path]
+
+    xg = np.empty(len(shots), dtype=np.float32)
+
+    for start in range(0, len(shots), chunk_size):
+        chunk = shots.iloc[start:start + chunk_size]
+        xg[start:start + len(chunk)] = model.score(
+            shot_features(chunk, x_pos=x_pos, y_pos=y_pos, source=source)
+        )
+
+    return xg
+
+def calibration_report(
+    shots: pd.DataFrame,
+    model: XGModel = None,
+    bins: int = 10,
+    xg_col: str = 'xG'
+)-> tuple:
+    """
+    Function to compare the calibration of the model with understat's own xG
+
+        Parameters:
+            shots (pd.DataFrame): Dataframe containing the shot data, with a
+            result column and understat's xG
+            model (XGModel or str): Trained model or path of one, the model
+            at MODEL_PATH if None
+            bins (int): Number of equal width xG bins
+            xg_col (str): Column with understat's xG
+
+        Returns:
+            table (pd.DataFrame): Shots, goal rate and mean xG of both models
+            in every bin of predicted xG
+            summary (pd.DataFrame): Brier score, log loss and total xG of both
+            models against the goals scored
+    """
+    shots = _training_shots(shots)
+
+    goals = _is_goal(shots).astype(np.float64)
+    predictions = {
+        'model': predict_xg(shots, model).astype(np.float64),
+        'understat': shots[xg_col].to_numpy(dtype=np.float64),
+    }
+
+    edges = np.linspace(0, 1, bins + 1)
+    tables = []
+
+    for name, xg in predictions.items():
+        idx = np.clip(np.searchsorted(edges, xg, side='right') - 1, 0, bins - 1)
+        n = np.bincount(idx, minlength=bins)
+        shown = n > 0
+
+        tables.append(pd.DataFrame({
+            'source': name,
+            'bin': [f'{a:.1f}-{b:.1f}' for a, b in zip(edges[:-1], edges[1:])],
+            'shots': n,
+            'goal_rate': np.bincount(idx, goals, bins) / np.maximum(n, 1),
+            'mean_xG': np.bincount(idx, xg, bins) / np.maximum(n, 1),
+        })[shown])
+
+    table = pd.concat(tables, ignore_index=True)
+
+    summary = []
+
+    for name, xg in predictions.items():
+        p = np.clip(xg, 1e-6, 1 - 1e-6)
+
+        summary.append({
+            'source': name,
+            'brier': np.mean((xg - goals) ** 2),
+            'log_loss': -np.mean(goals * np.log(p) + (1 - goals) * np.log(1 - p)),
+            'total_xG': xg.sum(),
+            'goals': goals.sum(),
+        })
+
+    return table, pd.DataFrame(summary)
@@ -0,0 +1,375 @@
+# Importing the required packages:
+import os
+import json
+import numpy as np
+import pandas as pd
+from utils.coordinate_utils import transform_coordinates
+
+# Extent of the Statsbomb half pitch drawn by statsbomb_pitch_vert, in the
+# swapped coordinates of convert_to_statsbomb (x across, y up the pitch):
+HALF_PITCH = (0.0, 80.0, 60.0, 120.0)
+
+# Values of the other categorical features when a surface is built from a
+# model, one grid being made for every level of the chosen feature:
+SURFACE_BASE_SHOT = {
+    'situation': 'OpenPlay',
+    'shotType': 'RightFoot',
+    'lastAction': 'Pass',
+}
+
+class XGSurface:
+    """
+    Class holding precomputed xG grids over the vertical half pitch, one grid
+    per shot type or situation, so the xG of any point is a bilinear lookup
+
+        Parameters:
+            grids (np.ndarray): Array of shape (n_keys, n_y, n_x), grids[k, i, j]
+            being the xG at x = x0 + j * resolution and y = y0 + i * resolution
+            keys (list): Name of every grid, e.g. the shot types
+            by (str): Column the grids are split by
+            resolution (float): Spacing of the grid points
+            extent (tuple): (x0, x1, y0, y1) covered by the grids
+    """
+    def __init__(
+        self,
+        grids: np.ndarray,
+        keys: list,
+        by: str,
+        resolution: float,
+        extent: tuple = HALF_PITCH
+    ):
+        self.grids = grids
+        self.keys = list(keys)
+        self.by = by
+        self.resolution = float(resolution)
+        self.extent = tuple(float(v) for v in extent)
+
+    def _key_index(self, key)-> np.ndarray:
+        """
+        Function to get the grid index of one key or of an array of keys
+
+            Parameters:
+                key (str or array): Key of every point
+
+            Returns:
+                idx (np.ndarray): Grid index of every point, or an int
+        """
+        if np.ndim(key) == 0:
+            if key not in self.keys:
+                raise KeyError(f'No {self.by} grid {key!r}, expected one of {self.keys}')
+            return self.keys.index(key)
+
+        codes = pd.Index(self.keys).get_indexer(np.asarray(key, dtype=object))
+
+        if (codes < 0).any():
+            unknown = set(np.asarray(key, dtype=object)[codes < 0])
+            raise KeyError(f'No {self.by} grid for {sorted(map(str, unknown))}')
+
+        return codes
+
+    def lookup(
+        self,
+        x: np.ndarray,
+        y: np.ndarray,
+        key
+    )-> np.ndarray:
+        """
+        Function to get the xG of points by bilinear interpolation of the grid
+
+            Parameters:
+                x (np.ndarray): x coordinates across the vertical pitch (0-80)
+                y (np.ndarray): y coordinates up the vertical pitch (60-120)
+                key (str or array): Grid of all points, or the grid of every
+                point, e.g. a shotType column
+
+            Returns:
+                xg (np.ndarray): float32 xG of every point, NaN outside the
+                grid
+        """
+        x = np.asarray(x, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        k = self._key_index(key)
+
+        x0, x1, y0, y1 = self.extent
+        n_y, n_x = self.grids.shape[1:]
+
+        fx = (x - x0) / self.resolution
+        fy = (y - y0) / self.resolution
+        outside = (x < x0) | (x > x1) | (y < y0) | (y > y1) | np.isnan(x) | np.isnan(y)
+
+        fx = np.clip(np.nan_to_num(fx), 0, n_x - 1)
+        fy = np.clip(np.nan_to_num(fy), 0, n_y - 1)
+
+        # The upper corner is clamped so points on the far edges stay inside:
+        j = np.minimum(fx.astype(np.intp), n_x - 2)
+        i = np.minimum(fy.astype(np.intp), n_y - 2)
+        tx = (fx - j).astype(np.float32)
+        ty = (fy - i).astype(np.float32)
+
+        grids = self.grids
+        g00 = grids[k, i, j]
+        g01 = grids[k, i, j + 1]
+        g10 = grids[k, i + 1, j]
+        g11 = grids[k, i + 1, j + 1]
+
+        top = g00 + (g01 - g00) * tx
+        bottom = g10 + (g11 - g10) * tx
+        xg = top + (bottom - top) * ty
+
+        if np.ndim(xg) == 0:
+            return np.float32(np.nan) if outside else np.float32(xg)
+
+        xg[outside] = np.nan
+
+        return xg
+
+    def grid(self, key: str)-> np.ndarray:
+        """
+        Function to get the grid of one key
+
+            Parameters:
+                key (str): Name of the grid
+
+            Returns:
+                grid (np.ndarray): Array of shape (n_y, n_x)
+        """
+        return self.grids[self._key_index(key)]
+
+    def save(self, path: str)-> str:
+        """
+        Function to save the grids as an .npy file, with the keys and extent
+        in a .json file next to it
+
+            Parameters:
+                path (str): Path of the .npy file
+
+            Returns:
+                path (str): Path of the .npy file
+        """
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+
+        np.save(path, np.ascontiguousarray(self.grids, dtype=np.float32))
+
+        with open(path + '.json', 'w') as f:
+            json.dump({
+                'keys': self.keys,
+                'by': self.by,
+                'resolution': self.resolution,
+                'extent': self.extent,
+            }, f, indent=2)
+
+        return path
+
+    @classmethod
+    def load(
+        cls,
+        path: str,
+        memory_map: bool = True
+    ):
+        """
+        Function to load a surface saved with save
+
+            Parameters:
+                path (str): Path of the .npy file
+                memory_map (bool): Memory-map the grids instead of reading them,
+                so only the pages that are looked up are read from disk
+
+            Returns:
+                surface (XGSurface): The surface
+        """
+        with open(path + '.json') as f:
+            meta = json.load(f)
+
+        grids = np.load(path, mmap_mode='r' if memory_map else None)
+
+        return cls(grids, meta['keys'], meta['by'], meta['resolution'], meta['extent'])
+
+def _grid_points(
+    resolution: float,
+    extent: tuple = HALF_PITCH
+)-> tuple:
+    """
+    Function to get the coordinates of the grid points
+
+        Parameters:
+            resolution (float): Spacing of the grid points
+            extent (tuple): (x0, x1, y0, y1) covered by the grid
+
+        Returns:
+            xs (np.ndarray): x of every grid column
+            ys (np.ndarray): y of every grid row
+    """
+    x0, x1, y0, y1 = extent
+
+    xs = x0 + resolution * np.arange(int(round((x1 - x0) / resolution)) + 1)
+    ys = y0 + resolution * np.arange(int(round((y1 - y0) / resolution)) + 1)
+
+    return xs, ys
+
+def surface_from_model(
+    model=None,
+    by: str = 'shotType',
+    keys: list = None,
+    resolution: float = 0.5,
+    base_shot: dict = None
+)-> XGSurface:
+    """
+    Function to build an xG surface by scoring every grid point with the xG
+    model of xg_model_utils
+
+        Parameters:
+            model (XGModel or str): Trained model or path of one, the default
+            model if None
+            by (str): Categorical feature with one grid per level, e.g.
+            'shotType' or 'situation'
+            keys (list): Levels to build grids for, every known level if None
+            resolution (float): Spacing of the grid points
+            base_shot (dict): Values of the other categorical features,
+            SURFACE_BASE_SHOT if None
+
+        Returns:
+            surface (XGSurface): The surface
+    """
+    from utils.xg_model_utils import CATEGORY_LEVELS, predict_xg
+
+    keys = list(keys or CATEGORY_LEVELS[by])
+    base_shot = {**SURFACE_BASE_SHOT, **(base_shot or {})}
+
+    xs, ys = _grid_points(resolution)
+    gx, gy = np.meshgrid(xs, ys)
+    n_points = gx.size
+
+    grids = np.empty((len(keys), len(ys), len(xs)), dtype=np.float32)
+
+    for k, key in enumerate(keys):
+        # Swapping back from the vertical pitch to Statsbomb x along the pitch:
+        points = pd.DataFrame({
+            'X': gy.ravel(),
+            'Y': gx.ravel(),
+            **{col: np.repeat(value, n_points) for col, value in base_shot.items()},
+        })
+        points[by] = key
+
+        grids[k] = predict_xg(points, model, source='statsbomb').reshape(gx.shape)
+
+    return XGSurface(grids, keys, by, resolution)
+
+def surface_from_shots(
+    shots: pd.DataFrame,
+    by: str = 'shotType',
+    keys: list = None,
+    resolution: float = 1.0,
+    sigma: float = 2.0,
+    min_shots: float = 0.5,
+    x_pos: str = 'X',
+    y_pos: str = 'Y',
+    xg_col: str = 'xG'
+)-> XGSurface:
+    """
+    Function to build an xG surface from the smoothed average understat xG of
+    the shots around every grid point
+
+        Parameters:
+            shots (pd.DataFrame): Dataframe containing the understat shot data
+            by (str): Column with one grid per value, e.g. 'shotType'
+            keys (list): Values to build grids for, every value if None
+            resolution (float): Spacing of the grid points
+            sigma (float): Width of the gaussian smoothing, in pitch units
+            min_shots (float): Smoothed number of shots below which a point
+            takes the average xG of all the shots of its grid
+            x_pos (str): X coordinate column name
+            y_pos (str): Y coordinate column name
+            xg_col (str): Column with understat's xG
+
+        Returns:
+            surface (XGSurface): The surface
+    """
+    from scipy.ndimage import gaussian_filter
+
+    x, y = transform_coordinates(
+        shots, x_pos, y_pos, source='understat', target='statsbomb', vertical=True
+    )
+    xg = shots[xg_col].to_numpy(dtype=np.float64)
+    values = shots[by].astype(str).to_numpy()
+
+    keys = list(keys or pd.unique(values))
+    xs, ys = _grid_points(resolution)
+    x0, _, y0, _ = HALF_PITCH
+
+    # Nearest grid point of every shot, shots off the half pitch are dropped:
+    j = np.rint((x - x0) / resolution).astype(np.intp)
+    i = np.rint((y - y0) / resolution).astype(np.intp)
+    inside = (j >= 0) & (j < len(xs)) & (i >= 0) & (i < len(ys)) & ~np.isnan(xg)
+    cell = i * len(xs) + j
+
+    grids = np.empty((len(keys), len(ys), len(xs)), dtype=np.float32)
+
+    for k, key in enumerate(keys):
+        mask = inside & (values == key)
+        size = len(xs) * len(ys)
+
+        counts = np.bincount(cell[mask], minlength=size).reshape(len(ys), len(xs))
+        totals = np.bincount(cell[mask], xg[mask], minlength=size).reshape(len(ys), len(xs))
+
+        counts = gaussian_filter(counts.astype(np.float64), sigma / resolution)
+        totals = gaussian_filter(totals, sigma / resolution)
+
+        prior = xg[mask].mean() if mask.any() else 0.0
+        grids[k] = np.where(
+            counts >= min_shots,
+            totals / np.maximum(counts, 1e-12),
+            prior
+        )
+
+    return XGSurface(grids, keys, by, resolution)
+
+def plot_xg_surface(
+    axis,
+    surface: XGSurface,
+    key: str,
+    bg: str,
+    cmap: str = 'magma',
+    alpha: float = 0.85,
+    vmax: float = None,
+    grid: bool = False
+):
+    """
+    Function to draw one grid of an xG surface as a heatmap on the vertical
+    Statsbomb pitch
+
+        Parameters:
+            axis (plt.Axes): Axes to plot the heatmap on
+            surface (XGSurface): The surface
+            key (str): Grid to draw, e.g. 'RightFoot'
+            bg (str): Background color of the pitch
+            cmap (str): Colormap of the heatmap
+            alpha (float): Opacity of the heatmap
+            vmax (float): xG of the top of the colormap, the grid's maximum if
+            None
+            grid (bool): Whether the grid of statsbomb_pitch_vert is drawn
+
+        Returns:
+            image (AxesImage): The heatmap, e.g. to add a colorbar
+    """
+    from utils.helper_utils import pitch_template, draw_pitch_template
+
+    draw_pitch_template(ax=axis, template=pitch_template(bg=bg, grid=grid))
+
+    x0, x1, y0, y1 = surface.extent
+    half = surface.resolution / 2
+
+    # Pitch markings sit at zorder 1 and above, the heatmap goes under them:
+    return axis.imshow(
+        np.asarray(surface.grid(key)),
+        origin='lower',
+        extent=(x0 - half, x1 + half, y0 - half, y1 + half),
+        cmap=cmap,
+        alpha=alpha,
+        vmin=0,
+        vmax=vmax,
+        interpolation='bilinear',
+        aspect=axis.get_aspect(),
+        zorder=0.5
+    )